@@ -0,0 +1 @@
+# Benchmark pipeline IR: jalankan dari root repo, mis. `python -m benchmarks.backends`
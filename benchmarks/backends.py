@@ -0,0 +1,123 @@
+# Benchmark backend pencarian: Lucene (Pyserini) vs engine BM25 NumPy.
+# Setiap backend dijalankan di subprocess terpisah agar startup & memori terukur bersih.
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+DEFAULT_QUERIES = [
+    "politik",
+    "prabowo tetapkan ikn jadi ibukota politik 2028",
+    "korupsi anggaran",
+    "ekonomi indonesia",
+    "pemilu presiden",
+]
+
+def rss_mb():
+    """Resident memory proses saat ini (MB)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def sample_queries(n_titles):
+    """Query default + judul n_titles artikel pertama."""
+    from records import iter_records
+    from retriever import clean_records_file
+    queries = list(DEFAULT_QUERIES)
+    for i, art in enumerate(iter_records(clean_records_file())):
+        if i >= n_titles:
+            break
+        if art.get("title"):
+            queries.append(art["title"])
+    return queries
+
+def run_backend(name, queries, k, repeat):
+    """Ukur satu backend di proses ini; return dict hasil (JSON-able)."""
+    from retriever import BACKENDS, INDEX_DIR, preprocess_query
+    from generations import current_index_dir
+
+    texts = [preprocess_query(q) for q in queries]
+    rss_before = rss_mb()
+    t0 = perf_counter()
+    backend = BACKENDS[name](current_index_dir(INDEX_DIR))
+    startup = perf_counter() - t0
+
+    rankings = {}
+    latencies = []
+    for _ in range(repeat):
+        for q, text in zip(queries, texts):
+            t0 = perf_counter()
+            rankings[q] = backend.search(text, k) if text.strip() else []
+            latencies.append((perf_counter() - t0) * 1000)
+    rss_after = rss_mb()
+    backend.close()
+
+    latencies.sort()
+    return {
+        "backend": name,
+        "startup_s": startup,
+        "rss_mb": rss_after - rss_before,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "rankings": rankings,
+    }
+
+def compare(reference, other, k, tol):
+    """Jumlah query dengan top-k identik (docid & skor dalam toleransi) dan overlap rata-rata."""
+    identical, overlaps = 0, []
+    for q, ref in reference["rankings"].items():
+        got = other["rankings"].get(q, [])
+        ref_ids = [d for d, _ in ref]
+        got_ids = [d for d, _ in got]
+        same_scores = len(ref) == len(got) and all(abs(a[1] - b[1]) <= tol for a, b in zip(ref, got))
+        identical += ref_ids == got_ids and same_scores
+        overlaps.append(len(set(ref_ids) & set(got_ids)) / max(1, min(k, len(ref_ids))))
+    return identical, statistics.mean(overlaps) if overlaps else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark backend BM25: latensi, memori, startup, kesamaan ranking")
+    parser.add_argument("--backends", nargs="+", default=["lucene", "numpy"])
+    parser.add_argument("-k", type=int, default=10, help="Jumlah hasil per query (default: 10)")
+    parser.add_argument("--titles", type=int, default=100, help="Tambahan query dari judul artikel (default: 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="Ulangi setiap query N kali (default: 5)")
+    parser.add_argument("--tol", type=float, default=1e-4, help="Toleransi selisih skor (default: 1e-4)")
+    parser.add_argument("--child", metavar="BACKEND", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_backend(args.child, sample_queries(args.titles), args.k, args.repeat)
+        print(json.dumps(result))
+        sys.exit(0)
+
+    results = []
+    for name in args.backends:
+        print(f"⏱️  Mengukur backend {name}...")
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.backends", "--child", name,
+             "-k", str(args.k), "--titles", str(args.titles), "--repeat", str(args.repeat)],
+            capture_output=True, text=True, env=dict(os.environ),
+        )
+        if proc.returncode != 0:
+            print(f"❌ Backend {name} gagal:\n{proc.stderr.strip()}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if not results:
+        sys.exit(1)
+    n_queries = len(results[0]["rankings"])
+    print(f"\n{'backend':<8} {'startup':>10} {'RSS':>10} {'p50':>10} {'p95':>10}   ({n_queries} query × {args.repeat}, k={args.k})")
+    for r in results:
+        print(f"{r['backend']:<8} {r['startup_s']:>9.2f}s {r['rss_mb']:>8.1f}MB {r['p50_ms']:>8.2f}ms {r['p95_ms']:>8.2f}ms")
+    for other in results[1:]:
+        identical, overlap = compare(results[0], other, args.k, args.tol)
+        print(f"\n{other['backend']} vs {results[0]['backend']}: top-{args.k} identik untuk {identical}/{n_queries} query "
+              f"(toleransi skor {args.tol}), overlap rata-rata {overlap:.1%}")
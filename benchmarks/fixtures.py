@@ -0,0 +1,143 @@
+# Fixture HTML untuk benchmark scraper.
+# Fixture asli disimpan oleh `python scraper.py --save-html DIR` (list-*.html & article-*.html).
+# Bila belum ada, halaman bergaya Kompas dirender dari artikel hasil scraping:
+# head dengan meta & script besar, navigasi, isi di div.read__content (dengan <strong>, link
+# "Baca juga", entity, komentar, iklan), paging, tag, dan sidebar trending.
+import html
+import random
+from pathlib import Path
+
+_NAV = ["Nasional", "Regional", "Megapolitan", "Global", "Tren", "Money", "Bola", "Tekno", "Sains", "Otomotif",
+        "Lifestyle", "Health", "Properti", "Travel", "Edukasi", "Food", "Kolom", "JEO", "Kompasiana", "Video"]
+
+def _script(rnd, n):
+    # Skrip inline panjang seperti tag manager / data layer di halaman asli
+    lines = [f'  window.dataLayer.push({{"event":"page{i}","id":"{rnd.getrandbits(64):016x}","x":"<div>&amp;</div>"}});'
+             for i in range(n)]
+    return "<script>\nwindow.dataLayer = window.dataLayer || [];\n" + "\n".join(lines) + "\n</script>"
+
+def _nav():
+    items = "".join(f'<li class="nav__item"><a class="nav__link" href="https://{n.lower()}.kompas.com/">{n}</a></li>'
+                    for n in _NAV)
+    return f'<header class="header"><nav class="nav"><ul class="nav__wrap">{items}</ul></nav></header>'
+
+def _trending(related):
+    items = "".join(
+        f'<div class="most__item"><h4 class="most__title"><a class="most__link" href="{html.escape(a["url"])}">'
+        f'{html.escape(a.get("title") or "")}</a></h4></div>' for a in related)
+    return f'<aside class="col-offset-fluid"><div class="most__wrap"><h3 class="title">Terpopuler</h3>{items}</div></aside>'
+
+def render_article(art, related=(), seed=0, pages=0):
+    """HTML satu halaman artikel (pages > 0 menambahkan paging ke halaman lanjutan)."""
+    rnd = random.Random(seed)
+    title = html.escape(art.get("title") or "")
+    paragraphs = [p for p in (art.get("content") or "").split("\n\n") if p.strip()]
+    body = []
+    for i, p in enumerate(paragraphs):
+        text = html.escape(p)
+        if i == 0 and ", KOMPAS.com" in text:
+            head, rest = text.split(", KOMPAS.com", 1)
+            text = f"<strong>{head}</strong>, KOMPAS.com{rest}"
+        body.append(f"<p>{text}</p>")
+        if i == 1 and related:
+            link = related[0]
+            body.append(f'<p><strong>Baca juga: </strong><a href="{html.escape(link["url"])}" class="inner-link-baca-juga">'
+                        f'{html.escape(link.get("title") or "")}</a></p>')
+        if i % 4 == 3:
+            body.append(f'<!-- ads slot {i} --><div class="ads-on-body"><div id="div-gpt-ad-{i}"></div>'
+                        f'{_script(rnd, 2)}</div>')
+    paging = ""
+    if pages:
+        links = "".join(f'<div class="paging__item"><a class="paging__link" href="?page={n}">{n}</a></div>'
+                        for n in range(2, pages + 2))
+        paging = f'<div class="paging__wrap clearfix"><div class="paging__item"><a class="paging__link paging__link--active" href="?page=1">1</a></div>{links}</div>'
+    tags = "".join(f'<li class="tag__article__item"><a class="tag__article__link" href="https://www.kompas.com/tag/{html.escape(t)}">{html.escape(t)}</a></li>'
+                   for t in art.get("tags") or [])
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>{title} - Kompas.com</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<meta property="og:title" content="{title}">
+<meta property="og:url" content="{html.escape(art.get("url") or "")}">
+<meta name="author" content="{html.escape(art.get("author") or "")}">
+<meta property="article:published_time" content="{html.escape(art.get("date") or "")}">
+<meta name="content_PublishedDate" content="{html.escape(art.get("date") or "")}">
+<link rel="stylesheet" href="https://asset.kompas.com/css/main.css">
+<style>.read__content p{{margin:0 0 1em}} .ads-on-body{{min-height:250px}}</style>
+{_script(rnd, 120)}
+<script type="application/ld+json">{{"@context":"https://schema.org","@type":"NewsArticle","headline":"{title}"}}</script>
+</head>
+<body>
+{_nav()}
+<div class="container clearfix">
+  <div class="row col-offset-fluid clearfix">
+    <div class="col-bs10-7">
+      <h1 class="read__title">{title}</h1>
+      <div class="read__time">Kompas.com - {html.escape(art.get("date") or "")}</div>
+      <div class="read__credit"><div class="credit-title-name"><h6>Penulis</h6><a href="#">{html.escape(art.get("author") or "")}</a></div></div>
+      <div class="photo"><img src="https://asset.kompas.com/crops/{seed}.jpg" alt="{title}"><br></div>
+      <div class="read__content">
+        <div class="clearfix">
+{chr(10).join(body)}
+        </div>
+      </div>
+      {paging}
+      <div class="tag__article"><ul class="tag__article__wrap">{tags}</ul></div>
+    </div>
+    {_trending(related)}
+  </div>
+</div>
+<footer class="footer"><p>Copyright 2008 - 2025 PT. Kompas Cyber Media (Kompas Gramedia Digital Group). All Rights Reserved.</p></footer>
+{_script(rnd, 40)}
+</body>
+</html>
+"""
+
+def render_listpage(articles, seed=0):
+    """HTML satu halaman indeks berisi link ke articles."""
+    rnd = random.Random(seed)
+    items = "".join(
+        f'<div class="article__list clearfix"><div class="article__list__asset"><img src="x.jpg"></div>'
+        f'<div class="article__list__title"><h3 class="article__title article__title--medium">'
+        f'<a class="article__link" href="{html.escape(a["url"])}">{html.escape(a.get("title") or "")}</a></h3></div>'
+        f'<div class="article__list__info"><div class="article__subtitle">NASIONAL</div>'
+        f'<div class="article__date">{html.escape(a.get("date") or "")}</div></div></div>'
+        for a in articles)
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>Indeks Berita Nasional - Kompas.com</title>
+{_script(rnd, 80)}
+</head><body>
+{_nav()}
+<div class="container"><div class="latest--indeks mt2 clearfix">{items}</div>
+<div class="paging clearfix"><a class="paging__link" href="?page=2">Next</a></div></div>
+{_trending(articles[:5])}
+</body></html>
+"""
+
+def render_fixtures(articles, per_list=15, paged_every=10):
+    """(nama, kind, html) untuk semua artikel + halaman indeks (setiap per_list artikel)."""
+    articles = list(articles)
+    pages = []
+    for i, art in enumerate(articles):
+        related = [articles[(i + j) % len(articles)] for j in (1, 2, 3, 4, 5)]
+        pages.append((f"article-{i:05d}.html", "article",
+                      render_article(art, related, seed=i, pages=2 if i % paged_every == 0 else 0)))
+    for start in range(0, len(articles), per_list):
+        pages.append((f"list-{start // per_list:05d}.html", "list",
+                      render_listpage(articles[start:start + per_list], seed=start)))
+    return pages
+
+def load_fixtures(directory):
+    """(nama, kind, html) dari file <kind>-*.html di directory."""
+    pages = []
+    for path in sorted(Path(directory).glob("*.html")):
+        kind = path.name.split("-", 1)[0]
+        pages.append((path.name, kind, path.read_text(encoding="utf-8")))
+    return pages
+
+def write_fixtures(directory, pages):
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    for name, _, text in pages:
+        (Path(directory) / name).write_text(text, encoding="utf-8")
@@ -0,0 +1,57 @@
+# Benchmark backend parser HTML scraper (html_parsers.PARSERS) atas korpus fixture:
+# halaman/detik & MB/detik per backend, dan berapa halaman yang hasilnya identik dengan bs4.
+# Fixture: direktori hasil `python scraper.py --save-html DIR`, atau (default) halaman bergaya Kompas
+# yang dirender dari data/kompas_nasional_articles.jsonl (lihat benchmarks/fixtures.py).
+import argparse
+from time import perf_counter
+
+from benchmarks.fixtures import load_fixtures, render_fixtures, write_fixtures
+
+def parse_page(parser, kind, text):
+    """Hasil parsing satu fixture: link kandidat untuk halaman indeks, field + paragraf untuk artikel."""
+    if kind == "list":
+        return parser.listpage_hrefs(text)
+    return parser.article(text), parser.paragraphs(text)
+
+def bench(parser, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = perf_counter()
+        results = [parse_page(parser, kind, text) for _, kind, text in pages]
+        best = min(best, perf_counter() - t0)
+    return best, results
+
+if __name__ == "__main__":
+    from html_parsers import PARSERS, get_parser
+    from records import ARTICLES_FILE, LEGACY_ARTICLES_FILE, iter_records, resolve_input
+
+    parser = argparse.ArgumentParser(description="Benchmark backend parser HTML (halaman/detik per backend)")
+    parser.add_argument("--fixtures", help="Direktori fixture HTML (default: render dari artikel hasil scraping)")
+    parser.add_argument("--limit", type=int, default=400, help="Jumlah artikel yang dirender (default: 400)")
+    parser.add_argument("--write", metavar="DIR", help="Simpan fixture yang dirender ke DIR")
+    parser.add_argument("--backends", nargs="+", default=list(PARSERS), choices=list(PARSERS))
+    parser.add_argument("--repeat", type=int, default=3, help="Ulangi, ambil waktu terbaik (default: 3)")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages = load_fixtures(args.fixtures)
+    else:
+        source = resolve_input(ARTICLES_FILE, LEGACY_ARTICLES_FILE)
+        articles = [a for _, a in zip(range(args.limit), iter_records(source))]
+        pages = render_fixtures(articles)
+        if args.write:
+            write_fixtures(args.write, pages)
+    size_mb = sum(len(text.encode("utf-8")) for _, _, text in pages) / 1e6
+    print(f"📄 {len(pages)} halaman ({sum(k == 'list' for _, k, _ in pages)} indeks), {size_mb:.1f} MB")
+
+    _, expected = bench(get_parser("bs4"), pages, 1)
+    print(f"{'backend':>8} {'detik':>8} {'hal/detik':>10} {'MB/detik':>9} {'identik':>9}")
+    for name in args.backends:
+        seconds, results = bench(get_parser(name), pages, args.repeat)
+        identical = sum(r == e for r, e in zip(results, expected))
+        print(f"{name:>8} {seconds:>8.2f} {len(pages) / seconds:>10.1f} {size_mb / seconds:>9.1f} "
+              f"{identical:>5}/{len(pages)}")
+        for (page, _, _), r, e in zip(pages, results, expected):
+            if r != e:
+                print(f"   ≠ {page}")
+                break
@@ -0,0 +1,108 @@
+# Benchmark pruning top-k (MaxScore) vs scoring exhaustive pada engine BM25 NumPy,
+# untuk korpus yang diperbesar: postings yang dievaluasi & latensi per query.
+# Korpus N× dibuat dari hasil preprocessing: salinan ke-i setiap artikel diberi docid baru
+# dan kehilangan ~30% token secara acak (seed tetap), agar panjang & tf bervariasi.
+# Di akhir, waktu per query dari semua skala dikelompokkan per panjang postings untuk mencari
+# titik potong (crossover) di mana MaxScore mulai lebih cepat daripada exhaustive; angka ini
+# yang menjadi dasar bm25_engine.PRUNE_MIN_POSTINGS.
+import argparse
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.backends import DEFAULT_QUERIES
+
+def scaled_records(records, scale, seed=0):
+    rnd = random.Random(seed)
+    for copy in range(scale):
+        for art in records:
+            tokens = art.get("tokens", [])
+            if copy:
+                tokens = [t for t in tokens if rnd.random() > 0.3]
+            yield {"url": f"{art.get('url', '')}#{copy}", "title": art.get("title", ""), "tokens": tokens}
+
+def crossover(samples, buckets=8):
+    """
+    samples = [(n_postings, exhaustive ms, pruned ms)] → (baris per kelompok postings, threshold).
+    Threshold = batas bawah kelompok pertama yang, bersama semua kelompok di atasnya, lebih cepat
+    dengan MaxScore (median); None bila tidak ada.
+    """
+    samples = sorted(samples)
+    size = max(1, -(-len(samples) // buckets))
+    rows = []
+    for i in range(0, len(samples), size):
+        chunk = samples[i:i + size]
+        rows.append((chunk[0][0], chunk[-1][0], statistics.median(s[1] for s in chunk),
+                     statistics.median(s[2] for s in chunk)))
+    threshold = None
+    for lo, _, exh, pr in reversed(rows):
+        if pr >= exh:
+            break
+        threshold = lo
+    return rows, threshold
+
+def time_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = perf_counter()
+        result = fn()
+        best = min(best, (perf_counter() - t0) * 1000)
+    return best, result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MaxScore vs exhaustive BM25 (engine NumPy)")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16], help="Faktor ukuran korpus (default: 1 4 16)")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--titles", type=int, default=50, help="Tambahan query dari judul artikel (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ulangi setiap query, ambil waktu terbaik (default: 3)")
+    args = parser.parse_args()
+
+    from bm25_engine import BM25Engine, build_engine
+    from records import iter_records, write_records
+    from retriever import clean_records_file, preprocess_query
+
+    records = [{"url": a.get("url", str(i)), "title": a.get("title", ""), "tokens": a.get("tokens", [])}
+               for i, a in enumerate(iter_records(clean_records_file()))]
+    queries = list(DEFAULT_QUERIES) + [a["title"] for a in records[:args.titles] if a["title"]]
+    texts = [preprocess_query(q) for q in queries]
+
+    print(f"{'docs':>8} {'postings':>12} {'evaluated':>12} {'exh p50':>10} {'prune p50':>10} {'identik':>9}")
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            records_file = Path(tmp) / f"records_x{scale}.jsonl"
+            engine_file = Path(tmp) / f"engine_x{scale}.npz"
+            write_records(records_file, scaled_records(records, scale))
+            n_docs = build_engine(records_file, engine_file)
+            engine = BM25Engine(engine_file)
+
+            total = evaluated = identical = 0
+            exhaustive_ms, pruned_ms, rows = [], [], []
+            for q, text in zip(queries, texts):
+                t_exh, expected = time_ms(lambda: engine.search_exhaustive(text, args.k), args.repeat)
+                t_pr, (got, n_eval) = time_ms(lambda: engine.search_pruned(text, args.k), args.repeat)
+                n_postings = sum(int(engine.offsets[t + 1] - engine.offsets[t]) for t, _ in engine.query_terms(text))
+                total += n_postings
+                evaluated += n_eval
+                identical += got == expected
+                exhaustive_ms.append(t_exh)
+                pruned_ms.append(t_pr)
+                samples.append((n_postings, t_exh, t_pr))
+                if q in DEFAULT_QUERIES:
+                    rows.append((q, n_postings, n_eval, t_exh, t_pr))
+
+            print(f"{n_docs:>8} {total:>12} {evaluated:>12} {statistics.median(exhaustive_ms):>8.2f}ms "
+                  f"{statistics.median(pruned_ms):>8.2f}ms {identical:>4}/{len(queries)}")
+            for q, n_postings, n_eval, t_exh, t_pr in rows:
+                print(f"{'':>8}   {q[:40]:<40} postings {n_postings:>8} → {n_eval:>8}   {t_exh:.2f}ms → {t_pr:.2f}ms")
+
+    rows, threshold = crossover(samples)
+    print(f"\n{'postings/query':>22} {'exh p50':>10} {'prune p50':>10}")
+    for lo, hi, exh, pr in rows:
+        print(f"{lo:>10} – {hi:<9} {exh:>8.2f}ms {pr:>8.2f}ms")
+    if threshold is None:
+        print("📉 Tidak ada crossover: exhaustive lebih cepat (atau sama) di semua panjang postings → PRUNE_MIN_POSTINGS = None")
+    else:
+        print(f"📈 MaxScore lebih cepat mulai ±{threshold} postings per query → kandidat PRUNE_MIN_POSTINGS")
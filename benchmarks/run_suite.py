@@ -0,0 +1,448 @@
+# Suite benchmark seluruh pipeline pada korpus tetap, di beberapa skala sintetis (default 1×, 10×, 100×
+# dari korpus artikel hasil scraping):
+#   scrape      scraper (fetcher + parser) terhadap fixture HTML yang dirender ke disk & dilayani server lokal
+#   preprocess  preprocessor.py (subprocess, sama seperti dijalankan manual)
+#   jsonl       indexer.create_jsonl_for_pyserini
+#   index       indexer.index_documents (Lucene; dilewati bila Pyserini/JVM tidak tersedia)
+#   engine      build_engine (BM25 NumPy) dan build_docstore
+#   query       latensi satu query lewat InformationRetriever.search_page (cache dikosongkan per query)
+#   batch       throughput InformationRetriever.batch_rank
+#   coldstart   proses baru → app.py selesai dirender + query pertama (streamlit AppTest)
+# Setiap skala punya direktori kerja sendiri (data/, index_bm25/) dan setiap tahap berjalan di proses baru.
+# Korpus N×: salinan ke-0 = artikel asli, salinan berikutnya kehilangan ~30% kata per paragraf (seed tetap)
+# dan mendapat URL baru, sehingga panjang & tf bervariasi tetapi kosakata tetap realistis.
+# Hasil ditulis sebagai JSON (data/bench/), dibandingkan dengan baseline untuk menandai regresi,
+# dan biaya per item tiap skala dibandingkan dengan 1× untuk melihat di mana skala mulai "patah".
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.backends import DEFAULT_QUERIES, rss_mb
+from benchmarks.fixtures import render_article, render_listpage
+from fixture_site import PAGES_PER_DAY, START_DATE, FixtureSite
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("scrape", "preprocess", "jsonl", "index", "engine", "query", "batch", "coldstart")
+DEFAULT_SCALES = (1, 10, 100)
+RESULTS_DIR = "data/bench"
+BASELINE_FILE = "data/bench/baseline.json"
+
+# Regresi: metrik lebih buruk dari baseline lebih dari toleransi (relatif)
+DEFAULT_TOLERANCE = 0.25
+# Arah metrik (True = makin kecil makin baik) & selisih absolut yang masih dianggap noise
+LOWER_IS_BETTER = {"seconds": True, "p50_ms": True, "p95_ms": True, "p99_ms": True, "first_render_s": True,
+                   "rss_mb": True, "per_sec": False, "qps": False}
+NOISE_FLOOR = {"seconds": 0.1, "p50_ms": 1.0, "p95_ms": 1.0, "p99_ms": 1.0, "first_render_s": 0.1, "rss_mb": 5.0}
+# Skala "patah": biaya per item di N× lebih dari SCALING_LIMIT × biaya yang diharapkan dari 1×
+SCALING_LIMIT = 2.0
+
+# Struktur situs fixture: PER_LIST link per halaman indeks, PAGES_PER_DAY halaman per tanggal (fixture_site.py)
+PER_LIST = 15
+
+# ====== Korpus & fixture ======
+def scaled_articles(articles, scale, seed=0):
+    """Korpus scale× (lihat keterangan di atas); urutan & isi deterministik untuk seed yang sama."""
+    rnd = random.Random(seed)
+    for copy in range(scale):
+        for art in articles:
+            if copy == 0:
+                yield art
+                continue
+            paragraphs = (" ".join(w for w in p.split() if rnd.random() > 0.3)
+                          for p in (art.get("content") or "").split("\n\n"))
+            yield dict(art, url=f"{art.get('url', '')}#{copy}", content="\n\n".join(p for p in paragraphs if p))
+
+def render_site(directory, articles, base_url):
+    """Render halaman artikel (read/<i>.html) & indeks (list/<n>.html) dengan link ke base_url."""
+    directory = Path(directory)
+    (directory / "read").mkdir(parents=True, exist_ok=True)
+    (directory / "list").mkdir(parents=True, exist_ok=True)
+    local = [dict(art, url=f"{base_url}/read/{i}") for i, art in enumerate(articles)]
+    for i, art in enumerate(local):
+        related = [local[(i + j) % len(local)] for j in (1, 2, 3, 4, 5)]
+        html = render_article(art, related, seed=i, pages=2 if i % 10 == 0 else 0)
+        (directory / "read" / f"{i}.html").write_text(html, encoding="utf-8")
+    for n, start in enumerate(range(0, len(local), PER_LIST)):
+        html = render_listpage(local[start:start + PER_LIST], seed=start)
+        (directory / "list" / f"{n}.html").write_text(html, encoding="utf-8")
+    return len(local)
+
+# ====== Tahap (dijalankan di proses anak, cwd = direktori kerja skala) ======
+def child_scrape(n_articles, base_url, workers):
+    from fetcher import Fetcher
+    from scraper import HEADERS, iter_scrape_articles
+    # Tanpa rate limit: yang diukur fetcher + parser, bukan kesopanan terhadap server
+    fetcher = Fetcher(headers=HEADERS, workers=workers, per_host=workers, rate=1e9, burst=1e9)
+    max_days = math.ceil(n_articles / (PER_LIST * PAGES_PER_DAY)) + 1
+    t0 = perf_counter()
+    n = sum(1 for _ in iter_scrape_articles(base_url, "nasional", max_articles=n_articles,
+                                            max_pages_per_day=PAGES_PER_DAY, max_days=max_days,
+                                            start_date=START_DATE, fetcher=fetcher, workers=workers))
+    seconds = perf_counter() - t0
+    requests_made = fetcher.stats.get("requests", 0)
+    fetcher.close()
+    return [{"stage": "scrape", "n": n, "seconds": seconds, "per_sec": n / seconds, "requests": requests_made}]
+
+def child_jsonl():
+    from indexer import COLLECTION_DIR, create_jsonl_for_pyserini
+    from records import CLEAN_FILE
+    t0 = perf_counter()
+    n = create_jsonl_for_pyserini(CLEAN_FILE, COLLECTION_DIR, num_shards=os.cpu_count() or 1)
+    seconds = perf_counter() - t0
+    size = sum(p.stat().st_size for p in Path(COLLECTION_DIR).glob("*.jsonl"))
+    return [{"stage": "jsonl", "n": n, "seconds": seconds, "per_sec": n / seconds, "mb": size / 1e6}]
+
+def child_index(threads):
+    import indexer
+    from generations import current_generation
+    from records import CLEAN_FILE, count_records
+    t0 = perf_counter()
+    indexer.index_documents(indexer.COLLECTION_DIR, indexer.INDEX_DIR, CLEAN_FILE, threads=threads)
+    seconds = perf_counter() - t0
+    if current_generation(indexer.INDEX_DIR) is None:
+        raise RuntimeError("Indexing Lucene gagal (lihat output indexer)")
+    n = count_records(CLEAN_FILE)
+    return [{"stage": "index", "n": n, "seconds": seconds, "per_sec": n / seconds}]
+
+def child_engine():
+    from bm25_engine import ENGINE_NAME, build_engine
+    from docstore import DOCSTORE_NAME, build_docstore
+    from generations import INDEX_ROOT, current_index_dir
+    from records import CLEAN_FILE
+    index_dir = current_index_dir(INDEX_ROOT)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for stage, build, name in (("engine", build_engine, ENGINE_NAME), ("docstore", build_docstore, DOCSTORE_NAME)):
+        t0 = perf_counter()
+        n = build(CLEAN_FILE, index_dir / name)
+        seconds = perf_counter() - t0
+        n = n if isinstance(n, int) else None
+        results.append({"stage": stage, "n": n, "seconds": seconds, "per_sec": n / seconds if n else None,
+                        "mb": (index_dir / name).stat().st_size / 1e6})
+    return results
+
+def child_search(n_titles, k, repeat):
+    """Latensi per query (search_page, cache dikosongkan) + throughput batch_rank."""
+    import metrics
+    from benchmarks.backends import sample_queries
+    from retriever import InformationRetriever
+    queries = sample_queries(n_titles)
+    retriever = InformationRetriever()
+    if not retriever.searcher:
+        raise RuntimeError("Retriever tidak siap")
+    for q in queries:  # pemanasan: kamus stem & page cache, tidak diukur
+        retriever.search_page(q)
+    metrics.REGISTRY.clear()
+
+    latencies = []
+    for _ in range(repeat):
+        for q in queries:
+            retriever.cache.clear()
+            t0 = perf_counter()
+            retriever.search_page(q)
+            latencies.append((perf_counter() - t0) * 1000)
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+    query = {"stage": "query", "n": len(latencies), "p50_ms": statistics.median(latencies),
+             "p95_ms": pick(0.95), "p99_ms": pick(0.99), "rss_mb": rss_mb(),
+             "stages_p50_ms": {stage: row.get("p50") for stage, row in metrics.stage_summary().items()}}
+
+    retriever.cache.clear()
+    t0 = perf_counter()
+    retriever.batch_rank(queries, depth=k)
+    seconds = perf_counter() - t0
+    batch = {"stage": "batch", "n": len(queries), "seconds": seconds, "qps": len(queries) / seconds}
+    return [query, batch]
+
+def child_coldstart():
+    """Dari awal proses: import Streamlit + app.py dirender pertama kali (retriever dimuat), lalu satu query."""
+    t0 = perf_counter()
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(str(REPO_ROOT / "app.py"), default_timeout=600)
+    app.run()
+    first_render = perf_counter() - t0
+    if app.exception:
+        raise RuntimeError(f"app.py gagal: {app.exception}")
+    t1 = perf_counter()
+    app.text_input[0].input(DEFAULT_QUERIES[0])
+    app.button[0].click()
+    app.run()
+    return [{"stage": "coldstart", "first_render_s": first_render,
+             "first_query_ms": (perf_counter() - t1) * 1000, "rss_mb": rss_mb()}]
+
+CHILDREN = {"scrape": child_scrape, "jsonl": child_jsonl, "index": child_index, "engine": child_engine,
+            "search": child_search, "coldstart": child_coldstart}
+
+# ====== Orkestrasi (proses induk) ======
+def run_child(workdir, child, *args, env=None):
+    """Jalankan satu tahap di proses baru; return (list hasil, detik wall) atau raise RuntimeError."""
+    cmd = [sys.executable, "-m", "benchmarks.run_suite", "--child", child, *map(str, args)]
+    t0 = perf_counter()
+    proc = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True, env=env)
+    wall = perf_counter() - t0
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError((proc.stderr.strip() or proc.stdout.strip()).splitlines()[-1] if (proc.stderr or proc.stdout) else "gagal")
+    return json.loads(lines[-1]), wall
+
+def run_preprocess(workdir, workers, env):
+    from records import CLEAN_FILE, count_records
+    t0 = perf_counter()
+    proc = subprocess.run([sys.executable, str(REPO_ROOT / "preprocessor.py"), "--workers", str(workers)],
+                          cwd=workdir, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+    seconds = perf_counter() - t0
+    out = Path(workdir) / CLEAN_FILE
+    if proc.returncode != 0 or not out.exists():
+        raise RuntimeError((proc.stderr.strip() or "preprocessor.py gagal").splitlines()[-1])
+    n = count_records(out)
+    return [{"stage": "preprocess", "n": n, "seconds": seconds, "per_sec": n / seconds}]
+
+def run_scale(scale, articles, args, env):
+    """Semua tahap untuk satu skala; tahap yang gagal dicatat dengan status & error, tahap lain tetap jalan."""
+    from records import ARTICLES_FILE, write_records
+    from stemming import STEM_DICT_FILE
+    workdir = Path(args.workdir) / f"x{scale}"
+    shutil.rmtree(workdir, ignore_errors=True)
+    (workdir / "data").mkdir(parents=True)
+    n_articles = write_records(workdir / ARTICLES_FILE, scaled_articles(articles, scale))
+    if args.stem_dict and Path(args.stem_dict).exists():
+        shutil.copy(args.stem_dict, workdir / STEM_DICT_FILE)
+    print(f"\n📦 Skala {scale}×: {n_articles} artikel → {workdir}")
+
+    results = []
+
+    def record(stage, fn):
+        if stage not in args.stages:
+            return
+        print(f"   ⏱️  {stage}...", end=" ", flush=True)
+        try:
+            rows = fn()
+        except (RuntimeError, OSError, ValueError) as e:
+            print(f"⏭️  dilewati ({e})")
+            results.append({"stage": stage, "scale": scale, "status": "skipped", "error": str(e)})
+            return
+        for row in rows:
+            row.update(scale=scale, status="ok")
+            results.append(row)
+        print(", ".join(_headline(row) for row in rows))
+
+    def scrape():
+        site_dir = workdir / "site"
+        site = FixtureSite(site_dir)
+        try:
+            render_site(site_dir, list(scaled_articles(articles, scale)), site.base_url)
+            rows, _ = run_child(workdir, "scrape", n_articles, site.base_url, args.workers, env=env)
+            return rows
+        finally:
+            site.close()
+            shutil.rmtree(site_dir, ignore_errors=True)
+
+    def coldstart():
+        rows, wall = run_child(workdir, "coldstart", env=env)
+        rows[0]["seconds"] = wall  # termasuk startup interpreter
+        return rows
+
+    search_rows = {}
+
+    def search(stage):
+        if not search_rows:
+            rows, _ = run_child(workdir, "search", args.titles, args.k, args.repeat, env=env)
+            search_rows.update((row["stage"], row) for row in rows)
+        return [search_rows[stage]]
+
+    record("scrape", scrape)
+    record("preprocess", lambda: run_preprocess(workdir, args.workers, env))
+    record("jsonl", lambda: run_child(workdir, "jsonl", env=env)[0])
+    record("index", lambda: run_child(workdir, "index", args.workers, env=env)[0])
+    record("engine", lambda: run_child(workdir, "engine", env=env)[0])
+    record("query", lambda: search("query"))
+    record("batch", lambda: search("batch"))
+    record("coldstart", coldstart)
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def _headline(row):
+    if "p50_ms" in row:
+        return f"{row['stage']} p50 {row['p50_ms']:.2f} ms / p95 {row['p95_ms']:.2f} ms"
+    if "qps" in row:
+        return f"{row['stage']} {row['qps']:.1f} query/detik"
+    if "first_render_s" in row:
+        return f"{row['stage']} render pertama {row['first_render_s']:.2f}s (wall {row['seconds']:.2f}s)"
+    rate = f", {row['per_sec']:.1f}/detik" if row.get("per_sec") else ""
+    return f"{row['stage']} {row['seconds']:.2f}s{rate}"
+
+# ====== Analisis ======
+def _key(row):
+    return row["stage"], row["scale"]
+
+def compare_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Daftar regresi: (stage, scale, metrik, baseline, sekarang, perubahan relatif)."""
+    previous = {_key(row): row for row in baseline.get("results", []) if row.get("status") == "ok"}
+    regressions = []
+    for row in results:
+        old = previous.get(_key(row)) if row.get("status") == "ok" else None
+        if old is None:
+            continue
+        for metric, lower_better in LOWER_IS_BETTER.items():
+            before, now = old.get(metric), row.get(metric)
+            if not isinstance(before, (int, float)) or not isinstance(now, (int, float)) or before <= 0:
+                continue
+            if abs(now - before) < NOISE_FLOOR.get(metric, 0):
+                continue
+            change = (now - before) / before if lower_better else (before - now) / before
+            if change > tolerance:
+                regressions.append((row["stage"], row["scale"], metric, before, now, change))
+    return regressions
+
+def _cost(row):
+    """Biaya per dokumen (detik) untuk tahap pipeline, per query untuk query/batch, atau latensi cold start."""
+    if row["stage"] == "query":
+        return row.get("p50_ms")
+    if row["stage"] == "coldstart":
+        return row.get("first_render_s")
+    if row["stage"] == "batch":
+        return 1 / row["qps"] if row.get("qps") else None
+    return row["seconds"] / row["n"] if row.get("n") and row.get("seconds") else None
+
+def scaling_report(results):
+    """
+    {stage: {scale: rasio biaya terhadap 1×}} + daftar (stage, scale, rasio, harapan) yang melewati batas.
+    Harapan: biaya per dokumen tetap untuk tahap pipeline; biaya per query (query, batch) dan cold start
+    paling buruk linear terhadap ukuran korpus.
+    """
+    by_stage = {}
+    for row in results:
+        if row.get("status") == "ok" and _cost(row):
+            by_stage.setdefault(row["stage"], {})[row["scale"]] = _cost(row)
+    ratios, broken = {}, []
+    for stage, costs in by_stage.items():
+        base_scale = min(costs)
+        ratios[stage] = {}
+        for scale, cost in sorted(costs.items()):
+            ratio = cost / costs[base_scale]
+            relative = scale / base_scale
+            expected = relative if stage in ("query", "batch", "coldstart") else 1.0
+            ratios[stage][scale] = ratio
+            if ratio > SCALING_LIMIT * expected:
+                broken.append((stage, scale, ratio, expected))
+    return ratios, broken
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark seluruh pipeline (scrape → preprocess → index → query → app) di beberapa skala")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--input", help="File artikel dasar (default: hasil scraping di data/)")
+    parser.add_argument("--limit", type=int, default=400, help="Jumlah artikel dasar (1×) (default: 400)")
+    parser.add_argument("--backend", default=None, help="Backend pencarian untuk query/batch/coldstart (default: IR_BACKEND)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker scraper/preprocessor/indexer")
+    parser.add_argument("--titles", type=int, default=100, help="Query tambahan dari judul artikel (default: 100)")
+    parser.add_argument("-k", type=int, default=100, help="Kedalaman ranking batch (default: 100)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ulangi setiap query N kali (default: 3)")
+    parser.add_argument("--stem-dict", default=str(REPO_ROOT / "data" / "stem_dict.json"),
+                        help="Kamus stem awal untuk preprocessing (default: data/stem_dict.json bila ada)")
+    parser.add_argument("--workdir", help="Direktori kerja (default: direktori sementara)")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus direktori kerja")
+    parser.add_argument("--output", help=f"File hasil JSON (default: {RESULTS_DIR}/suite-<waktu>.json)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help=f"Baseline pembanding (default: {BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil run ini sebagai baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Batas regresi relatif (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args, rest = parser.parse_known_args()
+
+    if args.child:
+        # Proses anak: argumen posisi sesuai signature child_<tahap>, hasil = baris JSON terakhir di stdout
+        fn = CHILDREN[args.child]
+        params = [int(v) if v.isdigit() else v for v in rest]
+        print(json.dumps(fn(*params)))
+        sys.exit(0)
+
+    from records import ARTICLES_FILE, LEGACY_ARTICLES_FILE, iter_records, resolve_input
+    source = args.input or resolve_input(str(REPO_ROOT / ARTICLES_FILE), str(REPO_ROOT / LEGACY_ARTICLES_FILE))
+    articles = [art for _, art in zip(range(args.limit), iter_records(source))]
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+    if args.backend:
+        env["IR_BACKEND"] = args.backend
+    backend = env.get("IR_BACKEND", "lucene")
+
+    temp_dir = None
+    if not args.workdir:
+        temp_dir = args.workdir = tempfile.mkdtemp(prefix="ir-bench-")
+    t0 = perf_counter()
+    try:
+        results = []
+        for scale in args.scales:
+            results.extend(run_scale(scale, articles, args, env))
+    finally:
+        if temp_dir and not args.keep:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    ratios, broken = scaling_report(results)
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": backend,
+            "workers": args.workers,
+            "base_articles": len(articles),
+            "scales": args.scales,
+            "stem_dict": bool(args.stem_dict and Path(args.stem_dict).exists()),
+            "seconds": perf_counter() - t0,
+        },
+        "results": results,
+        "scaling": {stage: {str(scale): ratio for scale, ratio in per_scale.items()} for stage, per_scale in ratios.items()},
+    }
+    output = Path(args.output or f"{RESULTS_DIR}/suite-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n💾 Hasil: {output} ({report['meta']['seconds']:.1f}s)")
+
+    print("\n📈 Biaya relatif terhadap skala terkecil (per dokumen; per query untuk query/batch; cold start):")
+    print(f"{'tahap':>10} " + " ".join(f"{f'{s}×':>8}" for s in args.scales))
+    for stage, per_scale in ratios.items():
+        print(f"{stage:>10} " + " ".join(f"{per_scale[s]:>8.2f}" if s in per_scale else f"{'-':>8}" for s in args.scales))
+    for stage, scale, ratio, expected in broken:
+        print(f"⚠️  Skala patah: {stage} di {scale}× biayanya {ratio:.1f}× (harapan ≤ {expected:.0f}×)")
+
+    exit_code = 0
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline.get("meta", {}).get("backend") != backend:
+            print(f"⚠️  Baseline memakai backend {baseline.get('meta', {}).get('backend')}, run ini {backend}")
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            exit_code = 1
+            print(f"\n❌ {len(regressions)} regresi terhadap {baseline_path} (toleransi {args.tolerance:.0%}):")
+            for stage, scale, metric, before, now, change in regressions:
+                print(f"   {stage} {scale}× {metric}: {before:.4g} → {now:.4g} ({change:+.0%} lebih buruk)")
+        else:
+            print(f"\n✅ Tidak ada regresi terhadap {baseline_path} (toleransi {args.tolerance:.0%})")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(output, baseline_path)
+        print(f"📌 Baseline disimpan: {baseline_path}")
+    sys.exit(exit_code)
@@ -0,0 +1,378 @@
+import os
+import re
+from collections import Counter
+from pathlib import Path
+import numpy as np
+from records import index_contents, iter_records
+
+# Engine BM25 in-process (tanpa JVM) sebagai alternatif LuceneSearcher.
+# Dibangun dari token yang sama dengan index Lucene (records.index_contents),
+# dan meniru Lucene 9 / Anserini supaya ranking-nya sama:
+#   - analyzer: tokenisasi ala StandardTokenizer, possessive 's dibuang, lowercase,
+#     33 stopword bahasa Inggris Lucene, Porter stemmer (DefaultEnglishAnalyzer Anserini)
+#   - panjang dokumen dikuantisasi ke 1 byte seperti norms Lucene (SmallFloat.intToByte4)
+#   - skor = boost · idf · tf / (tf + k1 · (1 − b + b · dl / avgdl)), idf = ln(1 + (N − df + 0.5) / (df + 0.5))
+#   - skor sama → urut berdasarkan docid (seperti Anserini)
+ENGINE_NAME = "bm25_engine.npz"
+
+# Ukuran blok postings untuk block-max MaxScore (skip per blok + batas atas skor per blok)
+BLOCK_SIZE = 128
+# Margin relatif untuk perbandingan batas atas vs threshold (selisih pembulatan float32)
+_PRUNE_EPS = 1e-5
+# search() otomatis memakai MaxScore jika total postings term query ≥ nilai ini (hasil keduanya identik).
+# None = selalu exhaustive: `python -m benchmarks.pruning --scales 1 4 16 64` (hingga 25.600 dokumen,
+# ±100 ribu postings per query) tidak menemukan crossover; exhaustive ±2× lebih cepat di semua panjang
+# postings. Isi dengan threshold yang dilaporkan benchmark itu bila korpus jauh lebih besar.
+PRUNE_MIN_POSTINGS = None
+
+LUCENE_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "if", "in", "into", "is", "it",
+    "no", "not", "of", "on", "or", "such", "that", "the", "their", "then", "there", "these", "they",
+    "this", "to", "was", "will", "with",
+))
+
+# Kata = huruf/angka, boleh disambung titik/apostrof (mis. "u.s", "don't") atau koma di antara angka ("1,5")
+_TOKEN_RE = re.compile(r"\w+(?:(?:[.'’]|(?<=\d),(?=\d))\w+)*")
+_MAX_TOKEN_LENGTH = 255
+
+_porter = None
+_stem_cache = {}
+
+def _porter_stem(token):
+    # Impor nltk cukup berat → Porter stemmer baru dibuat untuk term pertama yang belum di-cache
+    global _porter
+    if _porter is None:
+        from nltk.stem.porter import PorterStemmer
+        _porter = PorterStemmer(mode=PorterStemmer.MARTIN_EXTENSIONS)
+    return _porter.stem(token, to_lowercase=False)
+
+def analyze(text):
+    """Term hasil analyzer (urutan sesuai teks), setara DefaultEnglishAnalyzer Anserini."""
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > _MAX_TOKEN_LENGTH:
+            continue
+        if token.endswith(("'s", "’s")):
+            token = token[:-2]
+        if not token or token in LUCENE_STOPWORDS:
+            continue
+        stem = _stem_cache.get(token)
+        if stem is None:
+            stem = _stem_cache[token] = _porter_stem(token)
+        terms.append(stem)
+    return terms
+
+# ====== Norms panjang dokumen (org.apache.lucene.util.SmallFloat) ======
+_NUM_FREE_VALUES = 24
+
+def _long_to_int4(i):
+    num_bits = i.bit_length()
+    if num_bits < 4:
+        return i
+    shift = num_bits - 4
+    return ((i >> shift) & 0x07) | ((shift + 1) << 3)
+
+def _int4_to_long(i):
+    bits = i & 0x07
+    shift = (i >> 3) - 1
+    return bits if shift == -1 else (bits | 0x08) << shift
+
+def int_to_byte4(i):
+    """Panjang dokumen → norm 1 byte."""
+    if i < _NUM_FREE_VALUES:
+        return i
+    return _NUM_FREE_VALUES + _long_to_int4(i - _NUM_FREE_VALUES)
+
+def byte4_to_int(b):
+    """Norm 1 byte → panjang dokumen (dibulatkan ke bawah)."""
+    if b < _NUM_FREE_VALUES:
+        return b
+    return _NUM_FREE_VALUES + _int4_to_long(b - _NUM_FREE_VALUES)
+
+LENGTH_TABLE = np.array([byte4_to_int(i) for i in range(256)], dtype=np.float32)
+
+def _smallest_uint(max_value):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+def build_engine(records_file, path):
+    """
+    Bangun inverted index dari record hasil preprocessing lalu simpan (.npz).
+    Postings per term: selisih docidx (delta) dan tf, masing-masing dengan dtype unsigned terkecil.
+    Return jumlah dokumen.
+    """
+    docids, norms, postings = [], [], {}
+    sum_length = 0
+    for idx, art in enumerate(iter_records(records_file)):
+        docid = art.get("url", str(idx))
+        terms = analyze(index_contents(art))
+        doc_index = len(docids)
+        docids.append(docid)
+        norms.append(int_to_byte4(len(terms)))
+        sum_length += len(terms)
+        for term, tf in Counter(terms).items():
+            postings.setdefault(term, []).append((doc_index, tf))
+
+    vocab = sorted(postings)
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    doc_deltas, tfs = [], []
+    for i, term in enumerate(vocab):
+        plist = postings[term]
+        prev = 0
+        for doc_index, tf in plist:
+            doc_deltas.append(doc_index - prev)
+            tfs.append(tf)
+            prev = doc_index
+        offsets[i + 1] = offsets[i] + len(plist)
+
+    doc_deltas = np.array(doc_deltas, dtype=np.int64)
+    tfs = np.array(tfs, dtype=np.int64)
+    docid_order = np.argsort(np.array(docids, dtype=object), kind="stable")
+    docid_rank = np.empty(len(docids), dtype=np.int64)
+    docid_rank[docid_order] = np.arange(len(docids))
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")
+    np.savez(
+        tmp_path,
+        vocab=np.array(vocab, dtype=str),
+        offsets=offsets,
+        doc_deltas=doc_deltas.astype(_smallest_uint(int(doc_deltas.max(initial=0)))),
+        tfs=tfs.astype(_smallest_uint(int(tfs.max(initial=0)))),
+        norms=np.array(norms, dtype=np.uint8),
+        docids=np.array(docids, dtype=str),
+        docid_rank=docid_rank.astype(_smallest_uint(max(len(docids) - 1, 0))),
+        sum_length=np.int64(sum_length),
+    )
+    os.replace(tmp_path, path)
+    return len(docids)
+
+class BM25Engine:
+    """Inverted index BM25 di memori (NumPy); search(query, k) → list (docid, skor)."""
+
+    def __init__(self, path, k1=0.9, b=0.4):
+        with np.load(path) as data:
+            self.vocab = data["vocab"]
+            self.offsets = data["offsets"]
+            self.doc_deltas = data["doc_deltas"]
+            self.tfs = data["tfs"]
+            self.norms = data["norms"]
+            self.docids = data["docids"]
+            self.docid_rank = data["docid_rank"]
+            sum_length = int(data["sum_length"])
+        self.n_docs = len(self.docids)
+        self.avgdl = np.float32(sum_length / self.n_docs) if self.n_docs else np.float32(1.0)
+        self._build_blocks()
+        self.set_bm25(k1, b)
+
+    def _build_blocks(self):
+        """
+        Metadata blok (BLOCK_SIZE postings per blok, tidak melintasi term), dihitung saat load:
+        posisi awal/akhir di array postings, docidx pertama & terakhir, tf maksimum dan
+        norm minimum (dokumen terpendek) per blok. Postings sendiri tetap terkompresi delta.
+        """
+        lengths = np.diff(self.offsets)
+        n_blocks = (lengths + BLOCK_SIZE - 1) // BLOCK_SIZE
+        self.block_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        self.block_offsets[1:] = np.cumsum(n_blocks)
+        term_of_block = np.repeat(np.arange(len(lengths)), n_blocks)
+        in_term = np.arange(int(self.block_offsets[-1])) - self.block_offsets[term_of_block]
+        self.block_starts = self.offsets[term_of_block] + in_term * BLOCK_SIZE
+        self.block_ends = np.minimum(self.block_starts + BLOCK_SIZE, self.offsets[term_of_block + 1])
+
+        if len(self.block_starts) == 0:
+            self.block_first_docs = self.block_last_docs = np.zeros(0, dtype=np.int64)
+            self.block_max_tf = np.zeros(0, dtype=np.float32)
+            self.block_min_norm = np.zeros(0, dtype=np.uint8)
+            return
+        # docidx absolut semua postings: cumsum global dikurangi cumsum sebelum awal term
+        cumulative = np.cumsum(self.doc_deltas, dtype=np.int64)
+        term_base = np.concatenate(([0], cumulative))[self.offsets[:-1]]
+        docs = cumulative - np.repeat(term_base, lengths)
+        self.block_first_docs = docs[self.block_starts]
+        self.block_last_docs = docs[self.block_ends - 1]
+        self.block_max_tf = np.maximum.reduceat(self.tfs, self.block_starts).astype(np.float32)
+        self.block_min_norm = np.minimum.reduceat(self.norms[docs], self.block_starts)
+
+    def set_bm25(self, k1, b):
+        self.k1 = np.float32(k1)
+        self.b = np.float32(b)
+        # 1 / (k1 · (1 − b + b · dl / avgdl)) untuk ke-256 nilai norm (cache BM25Similarity)
+        self._norm_inverse = (np.float32(1) / (self.k1 * ((np.float32(1) - self.b) + self.b * LENGTH_TABLE / self.avgdl))).astype(np.float32)
+        self._doc_norm_inverse = self._norm_inverse[self.norms]
+        # Batas atas kontribusi per blok / per term (tanpa bobot idf·boost): tf maks & dokumen terpendek
+        max_tf = self.block_max_tf.astype(np.float64)
+        max_norm_inverse = self._norm_inverse[self.block_min_norm].astype(np.float64)
+        self.block_max_impact = max_tf * max_norm_inverse / (1 + max_tf * max_norm_inverse)
+        self.term_max_impact = np.zeros(len(self.vocab), dtype=np.float64)
+        if len(self.block_max_impact):
+            self.term_max_impact = np.maximum.reduceat(self.block_max_impact, self.block_offsets[:-1])
+
+    def term_id(self, term):
+        i = int(np.searchsorted(self.vocab, term))
+        if i < len(self.vocab) and self.vocab[i] == term:
+            return i
+        return None
+
+    def postings(self, term_id):
+        """(docidx, tf) untuk satu term, hasil decode delta."""
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        docs = np.cumsum(self.doc_deltas[start:end], dtype=np.int64)
+        return docs, self.tfs[start:end].astype(np.float32)
+
+    def _decode_blocks(self, blocks):
+        """(docidx, tf) dari sejumlah blok saja (urut), tanpa decode seluruh postings term."""
+        starts, ends = self.block_starts[blocks], self.block_ends[blocks]
+        lens = ends - starts
+        seg_start = np.cumsum(lens) - lens
+        idx = np.arange(int(lens.sum())) - np.repeat(seg_start, lens) + np.repeat(starts, lens)
+        deltas = self.doc_deltas[idx].astype(np.int64)
+        cumulative = np.cumsum(deltas)
+        # docidx = doc pertama blok + jumlah delta setelah posting pertama blok
+        base = self.block_first_docs[blocks] - cumulative[seg_start]
+        docs = cumulative + np.repeat(base, lens)
+        return docs, self.tfs[idx].astype(np.float32)
+
+    def _contribution(self, weight, docs, tf):
+        # = weight · tf / (tf + k1 · (1 − b + b · dl / avgdl)), bentuk yang dipakai BM25Scorer Lucene
+        return weight - weight / (np.float32(1) + tf * self._doc_norm_inverse[docs])
+
+    def idf(self, df):
+        return np.float32(np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5)))
+
+    def query_terms(self, query):
+        """(term_id, bobot) per term unik; term berulang → bobot (boost) = jumlah kemunculan."""
+        weights = []
+        for term, count in Counter(analyze(query)).items():
+            term_id = self.term_id(term)
+            if term_id is not None:
+                df = int(self.offsets[term_id + 1] - self.offsets[term_id])
+                weights.append((term_id, np.float32(count) * self.idf(df)))
+        return weights
+
+    def score(self, query):
+        """Skor semua dokumen (float32, 0 untuk dokumen tanpa term query) dan mask dokumen yang cocok."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        matched = np.zeros(self.n_docs, dtype=bool)
+        for term_id, weight in self.query_terms(query):
+            docs, tf = self.postings(term_id)
+            scores[docs] += self._contribution(weight, docs, tf)
+            matched[docs] = True
+        return scores, matched
+
+    def search_pruned(self, query, k=10):
+        """
+        Top-k dengan MaxScore + batas atas per blok; hasil identik dengan search_exhaustive().
+        Return (ranking, jumlah postings yang di-decode/dievaluasi).
+
+        Term diurutkan dari batas atas skor terbesar. Selama dokumen baru masih bisa masuk
+        top-k (jumlah batas atas term yang belum diproses ≥ skor ke-k sementara), postings
+        term dibaca penuh ("essential"). Setelah itu hanya kandidat yang ada yang diteruskan:
+        kandidat dengan skor parsial + batas atas blok term ini + batas atas term sisa
+        < skor ke-k dibuang, dan hanya blok postings yang memuat kandidat yang di-decode.
+        Skor akhir dijumlahkan per term dalam urutan term query (float32), sama seperti
+        jalur exhaustive, sehingga skor & tie-break identik.
+        """
+        terms = self.query_terms(query)
+        if not terms or self.n_docs == 0 or k <= 0:
+            return [], 0
+        bounds = [float(weight) * self.term_max_impact[term_id] for term_id, weight in terms]
+        order = sorted(range(len(terms)), key=lambda i: -bounds[i])
+        remaining = sum(bounds)
+
+        partial = np.zeros(self.n_docs, dtype=np.float64)
+        matched = np.zeros(self.n_docs, dtype=bool)
+        contributions = [None] * len(terms)
+        evaluated = 0
+        threshold = 0.0
+        candidates = None
+
+        for i in order:
+            term_id, weight = terms[i]
+            remaining -= bounds[i]
+            if candidates is None:
+                # Term essential: baca seluruh postings
+                docs, tf = self.postings(term_id)
+                evaluated += len(docs)
+                contrib = self._contribution(weight, docs, tf)
+                partial[docs] += contrib
+                matched[docs] = True
+                contributions[i] = (docs, contrib)
+                n_matched = int(np.count_nonzero(matched))
+                if n_matched >= k and remaining > 0:
+                    threshold = float(np.partition(partial[matched], n_matched - k)[n_matched - k])
+                    if remaining * (1 + _PRUNE_EPS) < threshold:
+                        candidates = np.flatnonzero(matched)
+                continue
+
+            # Term non-essential: hanya kandidat, dan hanya blok yang memuat kandidat
+            first, last = self.block_offsets[term_id], self.block_offsets[term_id + 1]
+            block = np.searchsorted(self.block_first_docs[first:last], candidates, side="right") - 1 + first
+            block = np.maximum(block, first)
+            inside = (candidates >= self.block_first_docs[block]) & (candidates <= self.block_last_docs[block])
+            block_bound = np.where(inside, float(weight) * self.block_max_impact[block], 0.0)
+            keep = (partial[candidates] + block_bound + remaining) * (1 + _PRUNE_EPS) >= threshold
+            candidates, block, inside = candidates[keep], block[keep], inside[keep]
+            blocks = np.unique(block[inside])
+            if len(blocks):
+                docs, tf = self._decode_blocks(blocks)
+                evaluated += len(docs)
+                pos = np.minimum(np.searchsorted(candidates, docs), len(candidates) - 1)
+                hit = candidates[pos] == docs
+                docs, tf = docs[hit], tf[hit]
+                contrib = self._contribution(weight, docs, tf)
+                partial[docs] += contrib
+                contributions[i] = (docs, contrib)
+            if len(candidates) >= k:
+                threshold = max(threshold, float(np.partition(partial[candidates], len(candidates) - k)[len(candidates) - k]))
+
+        if candidates is None:
+            candidates = np.flatnonzero(matched)
+        final = np.zeros(self.n_docs, dtype=bool)
+        final[candidates] = True
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for entry in contributions:
+            if entry is not None:
+                docs, contrib = entry
+                keep = final[docs]
+                scores[docs[keep]] += contrib[keep]
+        return self.top_k(scores, final, k), evaluated
+
+    def top_k(self, scores, matched, k):
+        candidates = np.flatnonzero(matched)
+        if len(candidates) > k:
+            # argpartition untuk k teratas; semua dokumen yang skornya sama dengan batas ikut,
+            # agar tie-break berdasarkan docid tetap benar
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            threshold = scores[candidates[part]].min()
+            candidates = candidates[scores[candidates] >= threshold]
+        order = np.lexsort((self.docid_rank[candidates], -scores[candidates]))[:k]
+        top = candidates[order]
+        return [(str(self.docids[i]), float(scores[i])) for i in top]
+
+    def search_exhaustive(self, query, k=10):
+        """Top-k dengan menilai semua postings setiap term query."""
+        if self.n_docs == 0 or k <= 0:
+            return []
+        scores, matched = self.score(query)
+        return self.top_k(scores, matched, k)
+
+    def search(self, query, k=10, prune=None):
+        """
+        Top-k (docid, skor). prune=None memilih otomatis berdasarkan panjang postings query
+        (PRUNE_MIN_POSTINGS; None = exhaustive); True/False memaksa MaxScore/exhaustive.
+        """
+        if prune is None and PRUNE_MIN_POSTINGS is None:
+            prune = False
+        elif prune is None:
+            n_postings = sum(int(self.offsets[t + 1] - self.offsets[t]) for t, _ in self.query_terms(query))
+            prune = n_postings >= PRUNE_MIN_POSTINGS
+        if prune:
+            return self.search_pruned(query, k)[0]
+        return self.search_exhaustive(query, k)
+
+    def memory_bytes(self):
+        return sum(a.nbytes for a in (self.vocab, self.offsets, self.doc_deltas, self.tfs,
+                                      self.norms, self.docids, self.docid_rank, self._doc_norm_inverse))
@@ -0,0 +1,141 @@
+import json
+import sqlite3
+import time
+
+# State crawl persisten (SQLite, satu file di data/):
+#   - urls : setiap URL artikel yang pernah ditemukan (= seen set) beserta status fetch,
+#            ETag / Last-Modified untuk conditional request, dan hash konten terakhir.
+#            URL berstatus pending (atau failed yang masih boleh diulang) = frontier.
+#   - meta : posisi penemuan link (tanggal & halaman indeks) agar crawl bisa dilanjutkan.
+# Semua perubahan langsung di-commit, sehingga crash / Ctrl-C hanya kehilangan URL yang sedang diambil.
+CRAWL_STATE_FILE = "data/crawl_state.sqlite"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# URL gagal dicoba ulang pada run berikutnya sampai batas ini
+MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    http_status INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    fetched_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS urls_status ON urls (status, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class CrawlState:
+    """
+    Frontier, seen set, dan log fetch per URL.
+    Dipakai dari satu thread (generator scraper); path ":memory:" untuk crawl tanpa state di disk.
+    """
+
+    def __init__(self, path=CRAWL_STATE_FILE):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _next_seq(self):
+        return self._conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM urls").fetchone()[0]
+
+    def add_links(self, urls):
+        """Tambahkan URL ke frontier; return URL yang benar-benar baru (urutan dipertahankan)."""
+        new = []
+        with self._conn:
+            seq = self._next_seq()
+            for url in urls:
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO urls (url, seq) VALUES (?, ?)", (url, seq))
+                if cur.rowcount:
+                    new.append(url)
+                    seq += 1
+        return new
+
+    def mark_fetched(self, urls, status=DONE):
+        """Tandai URL yang sudah ada di output (mis. dari hasil scraping lama tanpa state)."""
+        with self._conn:
+            seq = self._next_seq()
+            for url in urls:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO urls (url, seq, status) VALUES (?, ?, ?)", (url, seq, status))
+                seq += 1
+
+    def is_seen(self, url):
+        return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def frontier(self):
+        """URL yang belum berhasil diambil (pending, atau failed di bawah MAX_ATTEMPTS), urut penemuan."""
+        rows = self._conn.execute(
+            "SELECT url FROM urls WHERE status = ? OR (status = ? AND attempts < ?) ORDER BY seq",
+            (PENDING, FAILED, MAX_ATTEMPTS))
+        return [url for (url,) in rows]
+
+    def fetched(self):
+        """(url, etag, last_modified) untuk URL yang sudah berhasil diambil, urut penemuan."""
+        rows = self._conn.execute(
+            "SELECT url, etag, last_modified FROM urls WHERE status = ? ORDER BY seq", (DONE,))
+        return rows.fetchall()
+
+    def validators(self, url):
+        """(etag, last_modified) terakhir untuk url (None bila belum ada)."""
+        row = self._conn.execute("SELECT etag, last_modified FROM urls WHERE url = ?", (url,)).fetchone()
+        return row if row else (None, None)
+
+    def content_hash(self, url):
+        row = self._conn.execute("SELECT content_hash FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def record_fetch(self, url, response=None, content_hash=None):
+        """
+        Catat hasil fetch: response 200/304 -> done (validator & hash diperbarui bila ada),
+        None -> failed (attempts bertambah).
+        """
+        now = time.time()
+        with self._conn:
+            if response is None:
+                self._conn.execute(
+                    "UPDATE urls SET status = ?, attempts = attempts + 1, fetched_at = ? WHERE url = ?",
+                    (FAILED, now, url))
+                return
+            self._conn.execute(
+                """UPDATE urls SET status = ?, http_status = ?, attempts = attempts + 1, fetched_at = ?,
+                       etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified),
+                       content_hash = COALESCE(?, content_hash)
+                   WHERE url = ?""",
+                (DONE, response.status_code, now, response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), content_hash, url))
+
+    def get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def counts(self):
+        """Jumlah URL per status."""
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
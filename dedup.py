@@ -0,0 +1,215 @@
+import argparse
+import os
+import re
+import zlib
+import numpy as np
+from records import ARTICLES_FILE, LEGACY_ARTICLES_FILE, content_hash, iter_records, resolve_input
+
+# Deteksi artikel hampir-duplikat (Kompas sering memuat ulang / menyunting ringan berita yang sama)
+# sebelum preprocessing, dengan MinHash + LSH:
+#   1. shingle = SHINGLE_WORDS kata berurutan dari judul + isi (lowercase, \w+)
+#   2. signature MinHash NUM_PERM nilai per artikel
+#   3. LSH: signature dibagi BANDS band; artikel yang sama persis di satu band menjadi kandidat,
+#      lalu diverifikasi dengan estimasi Jaccard (porsi nilai signature yang sama) >= threshold
+# Setiap artikel hanya dibandingkan dengan isi bucket-nya, sehingga waktunya ~linear terhadap jumlah artikel.
+# Satu artikel kanonik disimpan per cluster; URL anggota lain dicatat di field "aliases".
+# Signature disimpan per content_hash di SIGNATURES_FILE, sehingga run inkremental hanya
+# menghitung MinHash artikel baru/berubah (banding LSH + union-find tetap atas semua artikel, tapi murah).
+SHINGLE_WORDS = 5
+NUM_PERM = 256
+BANDS = 32          # 32 band x 8 baris: pasangan dengan Jaccard 0.75 jadi kandidat dengan peluang ~97%
+# Pada korpus 400 artikel, berita lanjutan yang berbeda mencapai Jaccard ~0.66,
+# sedangkan salinan yang disunting ringan (~3% kata diganti + satu kalimat) >= ~0.73.
+DEFAULT_THRESHOLD = 0.75
+SIGNATURES_FILE = "data/dedup_signatures.npz"
+
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+def shingle_hashes(text, k=SHINGLE_WORDS):
+    """Hash unik (uint64) dari semua shingle k kata; teks < k kata menjadi satu shingle."""
+    words = _WORD.findall(text.lower()) if text else []
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    tok = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    k = min(k, len(tok))
+    n = len(tok) - k + 1
+    h = tok[:n].copy()
+    for j in range(1, k):
+        h = h * np.uint64(1000003) + tok[j:j + n]  # overflow uint64 = modulo 2^64 (disengaja)
+    return np.unique(h)
+
+def permutations(num_perm=NUM_PERM, seed=1):
+    """Koefisien (a, b) untuk hash universal (a*x + b) mod p, p = 2^31 - 1."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+    return a, b
+
+def minhash(hashes, a, b):
+    """Signature MinHash (uint32, panjang len(a)); None untuk teks tanpa kata."""
+    if not len(hashes):
+        return None
+    x = (hashes % np.uint64(_PRIME)).astype(np.int64)
+    return ((np.outer(a, x) + b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+def load_signatures(path=SIGNATURES_FILE, num_perm=NUM_PERM):
+    """content_hash → signature dari run sebelumnya; kosong bila file tidak ada atau parameternya beda."""
+    if not os.path.exists(path):
+        return {}
+    with np.load(path, allow_pickle=False) as data:
+        if data["params"].tolist() != [num_perm, SHINGLE_WORDS]:
+            return {}
+        return dict(zip(data["hashes"].tolist(), data["signatures"]))
+
+def save_signatures(signatures, path=SIGNATURES_FILE, num_perm=NUM_PERM):
+    """Simpan content_hash → signature (tulis ke file sementara lalu ganti atomik)."""
+    hashes = list(signatures)
+    matrix = np.stack([signatures[h] for h in hashes]) if hashes else np.empty((0, num_perm), dtype=np.uint32)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, params=np.array([num_perm, SHINGLE_WORDS]), hashes=np.array(hashes, dtype=str), signatures=matrix)
+    os.replace(tmp, path)
+    return len(hashes)
+
+def similarity(sig_a, sig_b):
+    """Estimasi Jaccard dua signature."""
+    return float(np.mean(sig_a == sig_b))
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+class DedupPlan:
+    """
+    Hasil pass pertama: canonical[i] = indeks artikel kanonik untuk artikel ke-i (urutan file),
+    aliases[i] = URL duplikat untuk artikel kanonik i.
+    """
+
+    def __init__(self, canonical, aliases, signatures=None, n_computed=0):
+        self.canonical = canonical
+        self.aliases = aliases
+        self.signatures = signatures    # content_hash → signature (hanya bila plan_dedup diberi cache)
+        self.n_computed = n_computed    # jumlah signature yang benar-benar dihitung
+
+    @property
+    def n_articles(self):
+        return len(self.canonical)
+
+    @property
+    def n_duplicates(self):
+        return sum(len(urls) for urls in self.aliases.values())
+
+    def clusters(self):
+        """{indeks kanonik: [indeks anggota lain]} untuk cluster berukuran > 1."""
+        members = {}
+        for i, c in enumerate(self.canonical):
+            if c != i:
+                members.setdefault(c, []).append(i)
+        return members
+
+def plan_dedup(records, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, cache=None):
+    """
+    Pass pertama (streaming): signature + LSH + union-find.
+    Kanonik per cluster = tanggal terbaru (versi suntingan terakhir), lalu yang pertama di file.
+    cache (content_hash → signature, lihat load_signatures) dipakai ulang untuk artikel yang tidak berubah;
+    bila diberikan, plan.signatures berisi signature semua artikel input untuk disimpan kembali.
+    """
+    a, b = permutations(num_perm)
+    rows = num_perm // bands
+    buckets = [dict() for _ in range(bands)]  # band -> {isi band: [wakil bucket]}
+    signatures, urls, dates = [], [], []
+    by_hash = {} if cache is not None else None
+    n_computed = 0
+
+    for rec in records:
+        key = content_hash(rec) if cache is not None else None
+        sig = cache.get(key) if cache is not None else None
+        if sig is None:
+            text = f"{rec.get('title') or ''}\n{rec.get('content') or ''}"
+            sig = minhash(shingle_hashes(text), a, b)
+            n_computed += 1
+        if by_hash is not None and sig is not None:
+            by_hash[key] = sig
+        signatures.append(sig)
+        urls.append(rec.get("url"))
+        dates.append(rec.get("date") or "")
+    uf = _UnionFind(len(signatures))
+
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(bands):
+            key = sig[band * rows:(band + 1) * rows].tobytes()
+            reps = buckets[band].setdefault(key, [])
+            # Bandingkan hanya dengan wakil bucket; anggota yang cocok digabung lewat union-find
+            for j in reps:
+                if similarity(sig, signatures[j]) >= threshold:
+                    uf.union(i, j)
+                    break
+            else:
+                reps.append(i)
+
+    groups = {}
+    for i in range(len(signatures)):
+        groups.setdefault(uf.find(i), []).append(i)
+    canonical = list(range(len(signatures)))
+    aliases = {}
+    for members in groups.values():
+        if len(members) == 1:
+            continue
+        keep = max(members, key=lambda i: (dates[i], -i))
+        for i in members:
+            canonical[i] = keep
+        aliases[keep] = [urls[i] for i in members if i != keep]
+    return DedupPlan(canonical, aliases, by_hash, n_computed)
+
+def iter_deduplicated(records, plan):
+    """Pass kedua (streaming): hanya artikel kanonik, dengan field "aliases" bila punya duplikat."""
+    for i, rec in enumerate(records):
+        if plan.canonical[i] != i:
+            continue
+        if i in plan.aliases:
+            rec = dict(rec, aliases=plan.aliases[i])
+        else:
+            rec.pop("aliases", None)
+        yield rec
+
+def deduplicate(path, threshold=DEFAULT_THRESHOLD):
+    """(plan, generator artikel kanonik) untuk file artikel; file dibaca dua kali secara streaming."""
+    plan = plan_dedup(iter_records(path), threshold=threshold)
+    return plan, iter_deduplicated(iter_records(path), plan)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deteksi artikel hampir-duplikat (MinHash + LSH)")
+    parser.add_argument("--input", default=None, help=f"File artikel (default: {ARTICLES_FILE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimal estimasi Jaccard untuk dianggap duplikat (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--show", type=int, default=10, help="Jumlah cluster yang ditampilkan (default: 10)")
+    args = parser.parse_args()
+
+    from time import perf_counter
+    in_file = args.input or resolve_input(ARTICLES_FILE, LEGACY_ARTICLES_FILE)
+    t0 = perf_counter()
+    plan = plan_dedup(iter_records(in_file), threshold=args.threshold)
+    elapsed = perf_counter() - t0
+
+    clusters = plan.clusters()
+    print(f"🔍 {plan.n_articles} artikel, {len(clusters)} cluster duplikat, "
+          f"{plan.n_duplicates} artikel akan dibuang ({elapsed:.2f}s)")
+    titles = [(rec.get("url"), rec.get("title")) for rec in iter_records(in_file)]
+    for keep, members in list(clusters.items())[:args.show]:
+        print(f"\n✅ {titles[keep][1]}\n   {titles[keep][0]}")
+        for i in members:
+            print(f"   ↳ {titles[i][1]}\n     {titles[i][0]}")
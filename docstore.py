@@ -0,0 +1,169 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from records import iter_records, make_snippet
+
+# Docstore ringkas untuk metadata hasil pencarian, dibuka dengan mmap.
+#
+# Layout file (little-endian):
+#   header   : MAGIC | n_docs (u32) | n_fields (u32) | panjang nama field (u32) | nama field (JSON)
+#   records  : n_docs × n_fields × (offset u64, length u32), offset relatif terhadap awal heap
+#   keys     : n_docs × u32 indeks dokumen, terurut berdasarkan docid (untuk binary search)
+#   heap     : semua nilai field sebagai UTF-8, berurutan (list seperti `passages` disimpan sebagai JSON)
+#
+# Hanya field yang diminta yang di-decode; `content` tidak pernah dimuat kecuali diminta.
+DOCSTORE_NAME = "docstore.bin"
+MAGIC = b"IRDOCS01"
+FIELDS = ("docid", "url", "title", "date", "author", "content", "snippet", "passages")
+
+_HEADER = struct.Struct("<8sIII")
+_ENTRY = struct.Struct("<QI")
+_KEY = struct.Struct("<I")
+
+def build_docstore(records_file, path, fields=FIELDS):
+    """
+    Bangun docstore dari record hasil preprocessing (streaming).
+    Heap ditulis ke file sementara selama membaca; yang disimpan di memori hanya
+    tabel offset dan daftar docid untuk diurutkan. Return jumlah dokumen.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    heap_path = path.with_name(f"{path.name}.{os.getpid()}.heap")
+    entries = array("Q")
+    lengths = array("I")
+    docids = []
+    heap_size = 0
+
+    with open(heap_path, "wb") as heap:
+        for idx, art in enumerate(iter_records(records_file)):
+            docid = art.get("url", str(idx))
+            values = {"docid": docid}
+            for field in fields[1:]:
+                value = art.get(field)
+                if value is None and field == "snippet":
+                    # Record lama tanpa snippet hasil preprocessing
+                    value = make_snippet(art.get("content", ""))
+                if value is None:
+                    value = ""
+                elif isinstance(value, (list, dict)):
+                    value = json.dumps(value, ensure_ascii=False)
+                values[field] = str(value)
+            for field in fields:
+                data = values[field].encode("utf-8")
+                heap.write(data)
+                entries.append(heap_size)
+                lengths.append(len(data))
+                heap_size += len(data)
+            docids.append(docid.encode("utf-8"))
+
+    n_docs = len(docids)
+    n_fields = len(fields)
+    order = sorted(range(n_docs), key=docids.__getitem__)
+    field_names = json.dumps(list(fields)).encode("utf-8")
+
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, n_docs, n_fields, len(field_names)))
+        out.write(field_names)
+        for i in range(n_docs * n_fields):
+            out.write(_ENTRY.pack(entries[i], lengths[i]))
+        out.write(b"".join(_KEY.pack(i) for i in order))
+        with open(heap_path, "rb") as heap:
+            while True:
+                chunk = heap.read(1 << 20)
+                if not chunk:
+                    break
+                out.write(chunk)
+    os.remove(heap_path)
+    os.replace(tmp_path, path)
+    return n_docs
+
+class DocStore(Mapping):
+    """
+    Pembaca docstore berbasis mmap: docid → dict field.
+    Berperilaku seperti dict read-only (dipakai sebagai meta_lookup), tetapi
+    get(docid, fields=[...]) hanya meng-hydrate field yang diminta.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_docs, n_fields, names_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} bukan file docstore")
+        pos = _HEADER.size
+        self.fields = tuple(json.loads(self._mm[pos:pos + names_len].decode("utf-8")))
+        self._field_pos = {name: i for i, name in enumerate(self.fields)}
+        self._n_docs = n_docs
+        self._n_fields = n_fields
+        self._records_start = pos + names_len
+        self._keys_start = self._records_start + n_docs * n_fields * _ENTRY.size
+        self._heap_start = self._keys_start + n_docs * _KEY.size
+
+    def _value(self, doc_index, field_index):
+        offset, length = _ENTRY.unpack_from(
+            self._mm, self._records_start + (doc_index * self._n_fields + field_index) * _ENTRY.size)
+        start = self._heap_start + offset
+        return self._mm[start:start + length]
+
+    def _find(self, docid):
+        """Binary search indeks dokumen untuk docid; None jika tidak ada."""
+        target = docid.encode("utf-8")
+        lo, hi = 0, self._n_docs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            doc_index = _KEY.unpack_from(self._mm, self._keys_start + mid * _KEY.size)[0]
+            key = self._value(doc_index, 0)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return doc_index
+        return None
+
+    def doc(self, doc_index, fields=None):
+        """Field dari dokumen ke-doc_index (urutan build)."""
+        names = self.fields if fields is None else [f for f in fields if f in self._field_pos]
+        return {name: self._value(doc_index, self._field_pos[name]).decode("utf-8") for name in names}
+
+    def slice(self, docid, field, start, end):
+        """Potongan byte [start, end) dari satu field (mis. satu paragraf `content`), tanpa decode seluruh field."""
+        doc_index = self._find(docid)
+        if doc_index is None or field not in self._field_pos:
+            return ""
+        offset, length = _ENTRY.unpack_from(
+            self._mm, self._records_start + (doc_index * self._n_fields + self._field_pos[field]) * _ENTRY.size)
+        start, end = max(0, start), min(length, end)
+        begin = self._heap_start + offset
+        return self._mm[begin + start:begin + end].decode("utf-8", errors="ignore")
+
+    def get(self, docid, default=None, fields=None):
+        doc_index = self._find(docid)
+        if doc_index is None:
+            return default
+        return self.doc(doc_index, fields)
+
+    def __getitem__(self, docid):
+        doc = self.get(docid)
+        if doc is None:
+            raise KeyError(docid)
+        return doc
+
+    def __contains__(self, docid):
+        return isinstance(docid, str) and self._find(docid) is not None
+
+    def __iter__(self):
+        for i in range(self._n_docs):
+            yield self._value(i, 0).decode("utf-8")
+
+    def __len__(self):
+        return self._n_docs
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
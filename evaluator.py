@@ -1,6 +1,15 @@
-# Evaluasi Precision dan Recall untuk BM25 (Pyserini)
+# Evaluasi retrieval BM25: P@k, Recall, MAP, nDCG, MRR
+# Relevansi (qrels) dihitung sekali per korpus + set query lewat lookup kata → dokumen,
+# disimpan sebagai file qrels format TREC, lalu semua query dijalankan dalam satu batch
+# dan metrik dihitung tervektorisasi (numpy) untuk semua query sekaligus.
+import argparse
+import json
+import os
+import re
+import numpy as np
 import pandas as pd
-from retriever import InformationRetriever
+from collections import defaultdict
+from records import iter_records
 
 # Query yang digunakan
 queries = [
@@ -11,9 +20,11 @@ queries = [
     "pemilu presiden"
 ]
 
-# Fungsi bantu untuk cek relevansi sederhana
-import re
+QRELS_FILE = "data/qrels.txt"
+
+_WORD = re.compile(r'\w+')
 
+# Fungsi bantu untuk cek relevansi sederhana
 def is_relevant(query, content):
     if not content:
         return False
@@ -29,50 +40,161 @@ def is_relevant(query, content):
     # Cocokkan di konten (case-insensitive, multiline)
     return re.search(pattern, content, flags=re.IGNORECASE) is not None
 
+# ====== Qrels ======
+def as_query_dict(qs):
+    """dict {qid: teks}; list teks mendapat qid "0", "1", ... (sama seperti retriever.batch_search)."""
+    return dict(qs) if isinstance(qs, dict) else {str(i): q for i, q in enumerate(qs)}
+
+def compute_qrels(qs, records_file):
+    """
+    {qid: set docid relevan} dengan definisi yang sama seperti is_relevant:
+    dokumen relevan jika memuat salah satu kata query sebagai kata utuh.
+    Korpus dibaca sekali; hanya kata yang muncul di query yang dicatat (lookup kata → dokumen).
+    """
+    qs = as_query_dict(qs)
+    query_words = {qid: set(_WORD.findall(q.lower())) for qid, q in qs.items()}
+    vocab = set().union(*query_words.values()) if query_words else set()
+    postings = defaultdict(set)
+    for idx, art in enumerate(iter_records(records_file)):
+        content = art.get("content", "")
+        if not content:
+            continue
+        docid = art.get("url", str(idx))  # sama dengan id dokumen di indexer.pyserini_doc
+        for word in vocab.intersection(_WORD.findall(content.lower())):
+            postings[word].add(docid)
+    return {qid: set().union(*(postings[w] for w in words)) if words else set()
+            for qid, words in query_words.items()}
+
+def write_qrels(path, qrels):
+    """File qrels format TREC: `qid 0 docid 1` per dokumen relevan."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for qid, docids in qrels.items():
+            for docid in sorted(docids):
+                f.write(f"{qid} 0 {docid} 1\n")
+
+def read_qrels(path):
+    qrels = defaultdict(set)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 4 and int(parts[3]) > 0:
+                qrels[parts[0]].add(parts[2])
+    return qrels
+
+def load_qrels(qs, records_file, path=QRELS_FILE):
+    """
+    Qrels untuk query & korpus ini: dibaca dari `path` bila masih cocok (query sama, korpus tidak berubah),
+    jika tidak dihitung ulang lalu disimpan. Info pencocokan disimpan di `path`.json.
+    """
+    qs = as_query_dict(qs)
+    meta_path = f"{path}.json"
+    meta = {"records": os.path.abspath(records_file), "mtime": os.path.getmtime(records_file), "queries": qs}
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f) == meta:
+                qrels = read_qrels(path)
+                return {qid: qrels.get(qid, set()) for qid in qs}
+    qrels = compute_qrels(qs, records_file)
+    write_qrels(path, qrels)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return qrels
+
+# ====== Metrik (tervektorisasi untuk semua query) ======
+def evaluate_run(run, qrels, k=20):
+    """
+    run: {qid: [docid terurut]}, qrels: {qid: set docid relevan}.
+    DataFrame per query: precision (relevan / jumlah hasil), P@k, recall, AP, nDCG@k, RR.
+    """
+    qids = list(run)
+    n_results = np.array([min(len(run[qid]), k) for qid in qids])
+    rel = np.zeros((len(qids), k), dtype=np.float64)
+    for row, qid in enumerate(qids):
+        relevant = qrels.get(qid, set())
+        rel[row, :n_results[row]] = [docid in relevant for docid in run[qid][:k]]
+    n_rel = np.array([len(qrels.get(qid, ())) for qid in qids], dtype=np.float64)
+
+    ranks = np.arange(1, k + 1)
+    hits = rel.sum(axis=1)
+    cum_hits = np.cumsum(rel, axis=1)
+    discounts = 1.0 / np.log2(ranks + 1)
+    ideal = np.cumsum(discounts)[np.clip(np.minimum(n_rel, k).astype(int) - 1, 0, k - 1)] * (n_rel > 0)
+    first = np.where(rel.any(axis=1), rel.argmax(axis=1) + 1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame({
+            "qid": qids,
+            "precision": np.where(n_results > 0, hits / n_results, 0.0),
+            f"P@{k}": hits / k,
+            "recall": np.where(n_rel > 0, hits / n_rel, 0.0),
+            "AP": np.where(n_rel > 0, (cum_hits / ranks * rel).sum(axis=1) / n_rel, 0.0),
+            f"nDCG@{k}": np.where(ideal > 0, (rel * discounts).sum(axis=1) / ideal, 0.0),
+            "RR": np.where(first > 0, 1.0 / np.maximum(first, 1), 0.0),
+            "total_relevant_docs": n_rel.astype(int),
+            "retrieved_relevant_docs": hits.astype(int),
+        })
+
+def summarize(df_eval):
+    """Rata-rata metrik (MAP = rata-rata AP, MRR = rata-rata RR)."""
+    metrics = [c for c in df_eval.columns if c not in ("qid", "query", "total_relevant_docs", "retrieved_relevant_docs")]
+    summary = df_eval[metrics].mean()
+    return summary.rename({"AP": "MAP", "RR": "MRR"})
 
 # Fungsi utama evaluasi retrieval
-def evaluate_retrieval(queries, top_k=20):
-    retriever = InformationRetriever()
+def evaluate_retrieval(queries, top_k=20, retriever=None, qrels_file=QRELS_FILE, threads=None):
+    from retriever import InformationRetriever, clean_records_file
+    retriever = retriever or InformationRetriever()
     if not retriever.searcher:
         print("Retriever tidak siap. Pastikan index sudah dibuat.")
         return pd.DataFrame()
 
-    eval_results = []
+    qs = as_query_dict(queries)
+    qrels = load_qrels(qs, clean_records_file(), qrels_file)
 
-    for q in queries:
-        results = retriever.search(q, k=top_k)  # gunakan Pyserini BM25 via retriever
-        relevant = sum(1 for r in results if is_relevant(q, r.get("content", "")))
+    # Semua query dijalankan sekaligus (batch search, paralel per thread), tanpa metadata
+    rankings = retriever.batch_rank(qs, depth=top_k, threads=threads)
+    run = {qid: [hit.docid for hit in hits] for qid, hits in rankings.items()}
 
-        # Hitung jumlah dokumen relevan di seluruh dataset
-        total_relevant = sum(is_relevant(q, a.get("content", "")) for a in retriever.meta_lookup.values())
-        precision = relevant / len(results) if len(results) > 0 else 0
-        recall = relevant / total_relevant if total_relevant > 0 else 0
+    df_eval = evaluate_run(run, qrels, k=top_k)
+    df_eval.insert(1, "query", [qs[qid] for qid in df_eval["qid"]])
+    return df_eval
 
-        eval_results.append({
-            "query": q,
-            "precision": precision,
-            "recall": recall,
-            "total_relevant_docs": total_relevant,
-            "retrieved_relevant_docs": relevant
-        })
+def load_queries(path):
+    """Query dari file: satu query per baris, atau `qid<TAB>query`."""
+    qs = {}
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(line for line in f if line.strip()):
+            qid, sep, text = line.rstrip("\n").partition("\t")
+            if not sep:
+                qid, text = str(i), qid
+            qs[qid] = text
+    return qs
 
-        print(f"\nQuery: {q}")
-        print(f"Top {top_k} hasil ditemukan: {len(results)}")
-        print(f"Relevan di hasil: {relevant}")
-        print(f"Total relevan di dataset: {total_relevant}")
-        print(f"Precision: {precision:.2f}")  
-        print(f"Recall: {recall:.2f}")      
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluasi retrieval BM25 (P@k, recall, MAP, nDCG, MRR)")
+    parser.add_argument("--queries", help="File query (satu per baris, atau qid<TAB>query); default: 5 query bawaan")
+    parser.add_argument("--titles", type=int, default=0, help="Tambahkan judul N artikel pertama sebagai query")
+    parser.add_argument("-k", "--top-k", type=int, default=20)
+    parser.add_argument("--qrels", default=QRELS_FILE, help=f"File qrels TREC (default: {QRELS_FILE})")
+    args = parser.parse_args()
+
+    from time import perf_counter
+    from retriever import clean_records_file
+    qs = load_queries(args.queries) if args.queries else as_query_dict(queries)
+    if args.titles:
+        for i, art in zip(range(args.titles), iter_records(clean_records_file())):
+            if art.get("title"):
+                qs[f"title-{i}"] = art["title"]
+
+    t0 = perf_counter()
+    df_eval = evaluate_retrieval(qs, top_k=args.top_k, qrels_file=args.qrels)
+    elapsed = perf_counter() - t0
 
-    # Rangkuman dalam tabel
-    df_eval = pd.DataFrame(eval_results)
     if not df_eval.empty:
-        print("\n=== Rata-rata Evaluasi ===")
-        print(f"Average Precision: {df_eval['precision'].mean():.2f}")
-        print(f"Average Recall: {df_eval['recall'].mean():.2f}")
-
-    return df_eval
-
-if __name__ == "__main__":
-    df_eval = evaluate_retrieval(queries, top_k=20)
-    print("\nHasil evaluasi:")
-    print(df_eval)
\ No newline at end of file
+        pd.set_option("display.width", 160)
+        print("\nHasil evaluasi:")
+        print(df_eval.drop(columns=["qid"]).to_string(index=False, float_format="%.3f", max_rows=40))
+        print(f"\n=== Rata-rata Evaluasi ({len(df_eval)} query, {elapsed:.2f}s) ===")
+        for name, value in summarize(df_eval).items():
+            print(f"{name:>10}: {value:.3f}")
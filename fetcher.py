@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+import urllib.robotparser
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# Engine fetch paralel yang tetap sopan:
+#   - thread pool terbatas + satu requests.Session bersama (koneksi keep-alive di-pool per host)
+#   - batas request bersamaan per host (semaphore)
+#   - rate limit per host dengan token bucket (menggantikan time.sleep acak)
+#   - robots.txt dibaca sekali per host dan dihormati
+# Host tujuan tidak di-hardcode, sehingga engine bisa diarahkan ke server HTTP lokal.
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_RATE = 2.0   # request per detik per host
+DEFAULT_BURST = 4
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` token/detik, maksimal `burst` token tersimpan."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Ambil satu token; blok sampai tersedia."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class Fetcher:
+    """
+    GET paralel dan sopan untuk scraper.
+    get(url) aman dipanggil dari banyak thread; get_many(urls) mengambil beberapa URL
+    sekaligus lewat thread pool milik fetcher (urutan hasil = urutan input).
+    """
+
+    def __init__(self, headers=None, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST,
+                 rate=DEFAULT_RATE, burst=DEFAULT_BURST, respect_robots=True,
+                 timeout=15, retries=3, backoff=1.5):
+        self.headers = dict(headers or {})
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(workers, per_host) * 2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+        self._lock = threading.Lock()
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+        self._buckets = defaultdict(lambda: TokenBucket(self.rate, self.burst))
+        self._robots = {}
+        self._robots_locks = defaultdict(threading.Lock)
+        self.stats = defaultdict(int)
+
+    @staticmethod
+    def _host(url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def robots(self, url):
+        """RobotFileParser untuk host URL (dibaca sekali, lewat session yang sama)."""
+        host = self._host(url)
+        with self._lock:
+            host_lock = self._robots_locks[host]
+        # Satu thread membaca robots.txt per host; thread lain menunggu hasilnya
+        with host_lock:
+            rp = self._robots.get(host)
+            if rp is not None:
+                return rp
+            rp = urllib.robotparser.RobotFileParser(urljoin(host, "/robots.txt"))
+            try:
+                r = self._request(urljoin(host, "/robots.txt"))
+                if r.status_code in (401, 403):
+                    rp.disallow_all = True
+                elif r.status_code >= 400:
+                    rp.allow_all = True
+                else:
+                    rp.parse(r.text.splitlines())
+            except requests.RequestException as e:
+                print(f"Gagal baca robots.txt dari {host}: {e}")
+                rp.allow_all = True
+            self._robots[host] = rp
+            return rp
+
+    def allowed(self, url):
+        if not self.respect_robots:
+            return True
+        return self.robots(url).can_fetch(self.headers.get("User-Agent", "*"), url)
+
+    def _request(self, url, headers=None):
+        host = self._host(url)
+        with self._lock:
+            slots, bucket = self._host_slots[host], self._buckets[host]
+        with slots:
+            bucket.acquire()
+            self._count("requests")
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, url, etag=None, last_modified=None):
+        """
+        Response 200 untuk url, atau None (gagal setelah retry / dilarang robots.txt).
+        Dengan etag / last_modified dikirim conditional request; halaman yang tidak berubah
+        menghasilkan Response 304 (tanpa body).
+        """
+        if not self.allowed(url):
+            self._count("robots_disallowed")
+            print(f"robots disallow: {url}")
+            return None
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        for i in range(self.retries):
+            try:
+                r = self._request(url, headers or None)
+                if r.status_code == 304:
+                    self._count("not_modified")
+                    return r
+                if r.status_code == 200:
+                    return r
+                if r.status_code == 404:
+                    break
+            except requests.RequestException:
+                pass
+            self._count("retries")
+            time.sleep(self.backoff * (i + 1) + random.random())
+        self._count("failed")
+        return None
+
+    def get_many(self, urls):
+        """Ambil beberapa URL bersamaan; list Response/None sesuai urutan input."""
+        return list(self._pool.map(self.get, urls))
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,85 @@
+# Server HTTP lokal untuk fixture HTML (dipakai benchmarks/run_suite.py dan tests/test_fetcher.py).
+# Direktori fixture: read/<i>.html (artikel) dan list/<n>.html (halaman indeks), lihat run_suite.render_site.
+import datetime
+import threading
+from pathlib import Path
+from time import monotonic, sleep
+from urllib.parse import parse_qs, urlparse
+
+# Struktur URL indeks: PAGES_PER_DAY halaman per tanggal, mundur dari START_DATE
+PAGES_PER_DAY = 8
+START_DATE = datetime.date(2025, 1, 1)
+EMPTY_LISTPAGE = b"<!DOCTYPE html><html><body><div class='latest--indeks'></div></body></html>"
+
+class FixtureSite:
+    """
+    Server HTTP lokal (thread daemon) untuk direktori fixture, dengan URL seperti indeks Kompas:
+    /?site=...&date=YYYY-MM-DD&page=P → halaman indeks ke-((START_DATE - date) * PAGES_PER_DAY + P - 1),
+    /read/<i> (dan ?page=N lanjutan) → artikel, /robots.txt mengizinkan semua (atau isi `robots`).
+    delay = jeda (detik) sebelum setiap respons. Setiap request dicatat di `log` sebagai
+    (path, waktu mulai, waktu selesai) dengan time.monotonic(); `max_in_flight` = jumlah request
+    terbanyak yang dilayani bersamaan (untuk uji fetcher.py).
+    """
+
+    def __init__(self, directory, robots=b"User-agent: *\nAllow: /\n", delay=0.0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        root = Path(directory)
+        site = self
+        self.log = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Header & body ditulis terpisah; tanpa ini keep-alive tertahan delayed ACK (~40 ms/request)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                start = monotonic()
+                with site._lock:
+                    site.in_flight += 1
+                    site.max_in_flight = max(site.max_in_flight, site.in_flight)
+                try:
+                    if delay:
+                        sleep(delay)
+                    self._respond()
+                finally:
+                    with site._lock:
+                        site.in_flight -= 1
+                        site.log.append((self.path, start, monotonic()))
+
+            def _respond(self):
+                parsed = urlparse(self.path)
+                body = None
+                if parsed.path == "/robots.txt":
+                    body = robots
+                elif parsed.path == "/" and "date" in parsed.query:
+                    query = parse_qs(parsed.query)
+                    day = (START_DATE - datetime.date.fromisoformat(query["date"][0])).days
+                    path = root / "list" / f"{day * PAGES_PER_DAY + int(query['page'][0]) - 1}.html"
+                    body = path.read_bytes() if day >= 0 and path.exists() else EMPTY_LISTPAGE
+                elif parsed.path.startswith("/read/"):
+                    path = root / "read" / f"{parsed.path.rsplit('/', 1)[-1]}.html"
+                    body = path.read_bytes() if path.exists() else None
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
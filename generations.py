@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Root index: setiap build/update menulis ke generasi baru index_bm25/gen-NNNNNN,
+# lalu pointer CURRENT dipindah secara atomik. Tanpa CURRENT, index lama
+# yang langsung berada di index_bm25/ tetap dipakai (layout lama).
+INDEX_ROOT = Path("./index_bm25")
+CURRENT_FILE = "CURRENT"
+GEN_PREFIX = "gen-"
+
+# Manifest per generasi: layout dokumen + docid (URL) → content_hash untuk update inkremental
+MANIFEST_NAME = "index_manifest.json"
+# Layout field `contents`: token artikel dulu, lalu judul → posisi Lucene = indeks token artikel
+DOC_LAYOUT = "tokens-title"
+
+def _generation_dirs(root):
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p for p in root.iterdir() if p.is_dir() and p.name.startswith(GEN_PREFIX))
+
+def current_generation(root=INDEX_ROOT):
+    """Nama generasi aktif (isi file CURRENT), atau None untuk layout lama."""
+    pointer = Path(root) / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    name = pointer.read_text(encoding="utf-8").strip()
+    return name or None
+
+def current_index_dir(root=INDEX_ROOT):
+    """Direktori index Lucene yang sedang aktif."""
+    name = current_generation(root)
+    if name and (Path(root) / name).is_dir():
+        return Path(root) / name
+    return Path(root)
+
+def latest_commit(index_dir):
+    """Nama file commit Lucene terbaru (segments_N, N dalam basis 36), atau "" jika belum ada index."""
+    index_dir = Path(index_dir)
+    if not index_dir.exists():
+        return ""
+    commits = [p.name for p in index_dir.iterdir() if p.name.startswith("segments_")]
+    if not commits:
+        return ""
+    return max(commits, key=lambda name: int(name.split("_")[1], 36))
+
+def _read_manifest(index_dir):
+    path = Path(index_dir) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Manifest lama: langsung dict docid → hash, tanpa layout
+    if "layout" not in data or not isinstance(data.get("docs"), dict):
+        data = {"layout": None, "docs": data}
+    return data
+
+def load_manifest(index_dir):
+    """docid → content_hash dokumen di generasi ini, atau None jika belum ada manifest."""
+    data = _read_manifest(index_dir)
+    return None if data is None else data["docs"]
+
+def manifest_layout(index_dir):
+    """Layout dokumen generasi ini (DOC_LAYOUT), atau None untuk index lama."""
+    data = _read_manifest(index_dir)
+    return None if data is None else data["layout"]
+
+def save_manifest(index_dir, doc_hashes, layout=DOC_LAYOUT):
+    path = Path(index_dir) / MANIFEST_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"layout": layout, "docs": doc_hashes}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def new_generation_dir(root=INDEX_ROOT):
+    """Buat direktori generasi baru (nomor = generasi terbesar + 1)."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    existing = [int(p.name[len(GEN_PREFIX):]) for p in _generation_dirs(root) if p.name[len(GEN_PREFIX):].isdigit()]
+    gen_dir = root / f"{GEN_PREFIX}{max(existing, default=0) + 1:06d}"
+    gen_dir.mkdir()
+    return gen_dir
+
+def clone_generation(src_dir, dst_dir):
+    """
+    Salin index ke generasi baru untuk di-update.
+    File Lucene bersifat write-once, jadi cukup hard link (fallback: copy).
+    Sub-direktori (generasi lain) dan write.lock dilewati.
+    """
+    for src in Path(src_dir).iterdir():
+        if not src.is_file() or src.name in ("write.lock", CURRENT_FILE):
+            continue
+        dst = Path(dst_dir) / src.name
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+def publish_generation(gen_dir, root=INDEX_ROOT):
+    """Pindahkan pointer CURRENT ke gen_dir secara atomik (tulis file sementara lalu os.replace)."""
+    pointer = Path(root) / CURRENT_FILE
+    tmp_pointer = pointer.with_name(CURRENT_FILE + ".tmp")
+    tmp_pointer.write_text(Path(gen_dir).name + "\n", encoding="utf-8")
+    os.replace(tmp_pointer, pointer)
+
+def prune_generations(root=INDEX_ROOT, keep=2):
+    """
+    Hapus generasi lama, sisakan generasi aktif dan `keep` generasi terbaru.
+    Generasi sebelumnya tetap ada agar proses yang belum berpindah bisa menyelesaikan query.
+    """
+    current = current_generation(root)
+    gens = _generation_dirs(root)
+    for gen_dir in gens[:-keep] if keep > 0 else gens:
+        if gen_dir.name != current:
+            shutil.rmtree(gen_dir, ignore_errors=True)
@@ -0,0 +1,482 @@
+import os
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Backend parser HTML untuk scraper. Semua backend menghasilkan field mentah yang sama,
+# dan pengolahan lanjutan (urljoin, filter link, gabung paragraf) dilakukan di scraper.py:
+#   listpage_hrefs(html) -> href kandidat link artikel di halaman indeks
+#   article(html)        -> {"title", "date", "author", "paragraphs", "page_hrefs", "tags"}
+#   paragraphs(html)     -> paragraf isi artikel (untuk halaman lanjutan)
+# "bs4" adalah perilaku acuan (BeautifulSoup + html.parser); "stream" meniru pohon html.parser
+# milik bs4 tanpa membangun pohon, dan hanya memperhatikan meta tag, paragraf isi, paging, tag, dan link.
+DEFAULT_PARSER = os.environ.get("SCRAPER_PARSER", "bs4")
+
+LISTPAGE_SELECTORS = [
+    "div.article__list a.article__link",
+    "h3.article__title a",
+    "div.article__box a.article__link",
+]
+
+def _empty_article():
+    return {"title": None, "date": None, "author": None, "paragraphs": [], "page_hrefs": [], "tags": []}
+
+class Bs4Parser:
+    """Acuan: pohon BeautifulSoup penuh untuk setiap halaman."""
+
+    name = "bs4"
+
+    def _soup(self, html):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "html.parser")
+
+    def listpage_hrefs(self, html):
+        soup = self._soup(html)
+        # Selector fokus ke daftar artikel indeks (hindari header/sidebar/trending)
+        candidates = []
+        for sel in LISTPAGE_SELECTORS:
+            candidates.extend(soup.select(sel))
+        # Fallback
+        if not candidates:
+            candidates = soup.find_all("a", href=True)
+        return [a.get("href", "") for a in candidates]
+
+    @staticmethod
+    def _paragraphs(soup):
+        content = []
+        article_el = soup.find('article') or soup.find('div', class_='read__content')
+        if article_el:
+            for p in article_el.find_all("p"):
+                txt = p.get_text(strip=True)
+                if txt:
+                    content.append(txt)
+        else:
+            for p in soup.find_all("p"):
+                txt = p.get_text(strip=True)
+                if txt and len(txt) > 50:
+                    content.append(txt)
+        return content
+
+    def paragraphs(self, html):
+        return self._paragraphs(self._soup(html))
+
+    def article(self, html):
+        soup = self._soup(html)
+        fields = _empty_article()
+
+        if soup.find("meta", property="og:title"):
+            fields["title"] = soup.find("meta", property="og:title").get("content", None)
+        if not fields["title"] and soup.title:
+            fields["title"] = soup.title.get_text().strip()
+
+        meta_date = soup.find("meta", {"property":"article:published_time"}) \
+                    or soup.find("meta", {"name":"pubdate"}) \
+                    or soup.find("meta", {"name":"date"})
+        if meta_date:
+            fields["date"] = meta_date.get("content", None)
+        if not fields["date"]:
+            time_tag = soup.find("time")
+            if time_tag and time_tag.get("datetime"):
+                fields["date"] = time_tag.get("datetime")
+
+        meta_author = soup.find("meta", {"name":"author"}) \
+                      or soup.find("meta", {"property":"article:author"})
+        if meta_author:
+            fields["author"] = meta_author.get("content", None)
+
+        fields["paragraphs"] = self._paragraphs(soup)
+
+        pagination = soup.find("div", class_="paging__wrap")
+        if pagination:
+            fields["page_hrefs"] = [a["href"] for a in pagination.find_all("a", href=True)]
+
+        tag_container = soup.find('div', class_='tags') or \
+                        soup.find('ul', class_='tags') or \
+                        soup.find('div', class_='tag-cloud')
+        if tag_container:
+            fields["tags"] = [a.get_text(strip=True) for a in tag_container.find_all('a', href=True)]
+        return fields
+
+class LxmlParser:
+    """Pohon lxml.html (libxml2) + XPath. Catatan: libxml2 menutup tag secara implisit (mis. <p> di dalam <p>),
+    sehingga HTML yang tidak rapi bisa menghasilkan paragraf berbeda dari bs4."""
+
+    name = "lxml"
+
+    @staticmethod
+    def _cls(name):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    def _doc(self, html):
+        import lxml.html
+        if not html or not html.strip():
+            return None
+        return lxml.html.document_fromstring(html)
+
+    @staticmethod
+    def _text(el):
+        # = get_text(strip=True): setiap node teks di-strip lalu digabung (isi script/style/template diabaikan)
+        return "".join(t.strip() for t in el.xpath(
+            ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"))
+
+    def listpage_hrefs(self, html):
+        doc = self._doc(html)
+        if doc is None:
+            return []
+        candidates = []
+        for xpath in (f"//div[{self._cls('article__list')}]//a[{self._cls('article__link')}]",
+                      f"//h3[{self._cls('article__title')}]//a",
+                      f"//div[{self._cls('article__box')}]//a[{self._cls('article__link')}]"):
+            candidates.extend(doc.xpath(xpath))
+        if not candidates:
+            candidates = doc.xpath("//a[@href]")
+        return [a.get("href", "") for a in candidates]
+
+    def _paragraphs(self, doc):
+        found = doc.xpath(f"(//article)[1] | (//div[{self._cls('read__content')}])[1]")
+        article_el = next((el for el in found if el.tag == "article"), found[0] if found else None)
+        if article_el is not None:
+            texts = (self._text(p) for p in article_el.xpath(".//p"))
+            return [t for t in texts if t]
+        texts = (self._text(p) for p in doc.xpath("//p"))
+        return [t for t in texts if t and len(t) > 50]
+
+    def paragraphs(self, html):
+        doc = self._doc(html)
+        return self._paragraphs(doc) if doc is not None else []
+
+    @staticmethod
+    def _first(doc, xpath):
+        found = doc.xpath(xpath)
+        return found[0] if found else None
+
+    def article(self, html):
+        fields = _empty_article()
+        doc = self._doc(html)
+        if doc is None:
+            return fields
+
+        og_title = self._first(doc, "(//meta[@property='og:title'])[1]")
+        if og_title is not None:
+            fields["title"] = og_title.get("content")
+        if not fields["title"]:
+            title = self._first(doc, "(//title)[1]")
+            if title is not None:
+                fields["title"] = "".join(title.xpath(".//text()")).strip()
+
+        meta_date = self._first(doc, "(//meta[@property='article:published_time'])[1]")
+        if meta_date is None:
+            meta_date = self._first(doc, "(//meta[@name='pubdate'])[1]")
+        if meta_date is None:
+            meta_date = self._first(doc, "(//meta[@name='date'])[1]")
+        if meta_date is not None:
+            fields["date"] = meta_date.get("content")
+        if not fields["date"]:
+            time_tag = self._first(doc, "(//time)[1]")
+            if time_tag is not None and time_tag.get("datetime"):
+                fields["date"] = time_tag.get("datetime")
+
+        meta_author = self._first(doc, "(//meta[@name='author'])[1]")
+        if meta_author is None:
+            meta_author = self._first(doc, "(//meta[@property='article:author'])[1]")
+        if meta_author is not None:
+            fields["author"] = meta_author.get("content")
+
+        fields["paragraphs"] = self._paragraphs(doc)
+
+        pagination = self._first(doc, f"(//div[{self._cls('paging__wrap')}])[1]")
+        if pagination is not None:
+            fields["page_hrefs"] = [a.get("href") for a in pagination.xpath(".//a[@href]")]
+
+        for xpath in (f"(//div[{self._cls('tags')}])[1]", f"(//ul[{self._cls('tags')}])[1]",
+                      f"(//div[{self._cls('tag-cloud')}])[1]"):
+            tag_container = self._first(doc, xpath)
+            if tag_container is not None:
+                fields["tags"] = [self._text(a) for a in tag_container.xpath(".//a[@href]")]
+                break
+        return fields
+
+# Elemen yang ditutup langsung oleh builder html.parser milik bs4
+_VOID = frozenset(["area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+                   "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+                   "image", "isindex", "nextid", "spacer"])
+# Teks di dalam elemen ini tidak ikut get_text() pada bs4
+_SKIP = frozenset(["script", "style", "template"])
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# Referensi karakter diurai seperti builder html.parser milik bs4, tapi hanya dengan stdlib:
+# entity HTML5 (nama tanpa ";" juga dikenali) dan referensi numerik menurut spesifikasi HTML
+_ENTITIES = {}
+for _name, _char in sorted(html5.items()):
+    _ENTITIES.setdefault(_name[:-1] if _name.endswith(";") else _name, _char)
+_DECIMAL_REF = re.compile(r"^([0-9]+)(.*)")
+_HEX_REF = re.compile(r"^([0-9a-f]+)(.*)")
+
+def _charref(name):
+    """Teks untuk &#name; (termasuk sisa data setelah angka bila referensi tidak ditutup ";")."""
+    base, pattern = 10, _DECIMAL_REF
+    if name[:1] in ("x", "X"):
+        name, base, pattern = name[1:], 16, _HEX_REF
+    extra = ""
+    try:
+        code = int(name, base)
+    except ValueError:
+        match = pattern.search(name)
+        if match is None:
+            return name
+        code, extra = int(match.group(1), base), match.group(2)
+    if code == 0 or code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+        return "\ufffd" + extra
+    if 0x80 <= code <= 0x9F:
+        # Referensi yang sebenarnya ditulis dengan kode Windows-1252
+        try:
+            return bytes([code]).decode("cp1252") + extra
+        except UnicodeDecodeError:
+            pass
+    return chr(code) + extra
+
+class _Extractor(HTMLParser):
+    """
+    Satu lintasan html.parser dengan stack elemen seperti builder bs4 (tanpa penutupan implisit;
+    end tag menutup elemen terbuka terdekat bernama sama, atau diabaikan). Teks hanya dikumpulkan
+    untuk elemen yang dibutuhkan: <p>, <title> pertama, dan <a> di kontainer tag.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack = []          # (nama tag, peran, sink teks atau None)
+        self.closed_void = []    # elemen void (<br>, <img>, ...) yang sudah ditutup otomatis saat dibuka
+        self.open = {}           # peran -> jumlah elemen terbuka dengan peran itu
+        self.sinks = []          # sink teks yang sedang terbuka: (jenis, list)
+        self.text = []
+        self.seen = set()        # peran "pertama saja" yang sudah ditemukan
+        self.meta = {}
+        self.time_datetime = None
+        self.time_seen = False
+        self.title = None
+        self.ps = []             # (parts, di article pertama, di read__content pertama)
+        self.list_hrefs = ([], [], [])
+        self.all_hrefs = []
+        self.page_hrefs = []
+        self.tag_links = {"div.tags": [], "ul.tags": [], "div.tag-cloud": []}
+
+    # --- teks ---
+    def _flush(self):
+        if not self.text:
+            return
+        node = "".join(self.text)
+        self.text = []
+        if self.open.get("skip"):
+            return
+        for kind, parts in self.sinks:
+            if kind == "title":
+                # bs4 meringkas node yang isinya hanya whitespace ASCII
+                parts.append(node if node.strip(_ASCII_SPACES) else ("\n" if "\n" in node else " "))
+            else:
+                parts.append(node.strip())
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_charref(self, name):
+        self.text.append(_charref(name))
+
+    def handle_entityref(self, name):
+        character = _ENTITIES.get(name)
+        self.text.append(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith("CDATA["):
+            self.text.append(data[len("CDATA["):])
+            self._flush()
+
+    # --- tag ---
+    def _first(self, role):
+        if role in self.seen:
+            return False
+        self.seen.add(role)
+        return True
+
+    def handle_starttag(self, tag, attrs, void=None):
+        self._flush()
+        attrs = {k: ("" if v is None else v) for k, v in attrs}
+        classes = attrs.get("class", "").split()
+        roles = []
+        sink = None
+
+        if tag == "meta":
+            for key, value in (("property", "og:title"), ("property", "article:published_time"),
+                               ("name", "pubdate"), ("name", "date"), ("name", "author"),
+                               ("property", "article:author")):
+                if attrs.get(key) == value and value not in self.meta:
+                    self.meta[value] = attrs.get("content")
+        elif tag == "time":
+            if not self.time_seen:
+                self.time_seen = True
+                self.time_datetime = attrs.get("datetime")
+        elif tag == "title":
+            if self.title is None:
+                self.title = []
+                sink = ("title", self.title)
+        elif tag == "p":
+            parts = []
+            self.ps.append((parts, bool(self.open.get("article")), bool(self.open.get("read__content"))))
+            sink = ("p", parts)
+        elif tag == "article":
+            if self._first("article"):
+                roles.append("article")
+        elif tag == "div":
+            for cls, role in (("read__content", "read__content"), ("paging__wrap", "paging"),
+                              ("tags", "div.tags"), ("tag-cloud", "div.tag-cloud")):
+                if cls in classes and self._first(role):
+                    roles.append(role)
+            for cls in ("article__list", "article__box"):
+                if cls in classes:
+                    roles.append(cls)
+        elif tag == "ul":
+            if "tags" in classes and self._first("ul.tags"):
+                roles.append("ul.tags")
+        elif tag == "h3":
+            if "article__title" in classes:
+                roles.append("article__title")
+        elif tag == "a":
+            href = attrs.get("href", "")
+            is_link = "article__link" in classes
+            if is_link and self.open.get("article__list"):
+                self.list_hrefs[0].append(href)
+            if self.open.get("article__title"):
+                self.list_hrefs[1].append(href)
+            if is_link and self.open.get("article__box"):
+                self.list_hrefs[2].append(href)
+            if "href" in attrs:
+                self.all_hrefs.append(href)
+                if self.open.get("paging"):
+                    self.page_hrefs.append(href)
+                containers = [c for c in self.tag_links if self.open.get(c)]
+                if containers:
+                    parts = []
+                    for container in containers:
+                        self.tag_links[container].append(parts)
+                    sink = ("a", parts)
+        if tag in _SKIP:
+            roles.append("skip")
+
+        self.stack.append((tag, roles, sink))
+        for role in roles:
+            self.open[role] = self.open.get(role, 0) + 1
+        if sink is not None:
+            self.sinks.append(sink)
+        if (tag in _VOID) if void is None else void:
+            self._pop_to(tag)
+            if void is None:
+                self.closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, void=True)
+
+    def handle_endtag(self, tag):
+        # </br>, </img>, ... untuk elemen void yang sudah ditutup otomatis diabaikan seperti di bs4
+        # (satu end tag per start tag, tanpa memotong node teks); sisanya end tag biasa
+        if tag in self.closed_void:
+            self.closed_void.remove(tag)
+            return
+        self._flush()
+        self._pop_to(tag)
+
+    def _pop_to(self, tag):
+        if not any(name == tag for name, _, _ in self.stack):
+            return
+        while self.stack:
+            name, roles, sink = self.stack.pop()
+            for role in roles:
+                self.open[role] -= 1
+            if sink is not None:
+                self.sinks.pop()  # sink mengikuti urutan stack (LIFO)
+            if name == tag:
+                return
+
+    def close(self):
+        super().close()
+        self._flush()
+
+class StreamParser:
+    """Ekstraktor satu lintasan berbasis html.parser (stdlib), hasil identik dengan Bs4Parser."""
+
+    name = "stream"
+
+    @staticmethod
+    def _run(html):
+        extractor = _Extractor()
+        extractor.feed(html)
+        extractor.close()
+        return extractor
+
+    @staticmethod
+    def _paragraphs(ex):
+        if "article" in ex.seen:
+            return [t for t in ("".join(parts) for parts, in_article, _ in ex.ps if in_article) if t]
+        if "read__content" in ex.seen:
+            return [t for t in ("".join(parts) for parts, _, in_content in ex.ps if in_content) if t]
+        return [t for t in ("".join(parts) for parts, _, _ in ex.ps) if t and len(t) > 50]
+
+    def listpage_hrefs(self, html):
+        ex = self._run(html)
+        candidates = [href for hrefs in ex.list_hrefs for href in hrefs]
+        return candidates or ex.all_hrefs
+
+    def paragraphs(self, html):
+        return self._paragraphs(self._run(html))
+
+    def article(self, html):
+        ex = self._run(html)
+        fields = _empty_article()
+        fields["title"] = ex.meta.get("og:title")
+        if not fields["title"] and ex.title is not None:
+            fields["title"] = "".join(ex.title).strip()
+
+        for key in ("article:published_time", "pubdate", "date"):
+            if key in ex.meta:
+                fields["date"] = ex.meta[key]
+                break
+        if not fields["date"] and ex.time_datetime:
+            fields["date"] = ex.time_datetime
+
+        for key in ("author", "article:author"):
+            if key in ex.meta:
+                fields["author"] = ex.meta[key]
+                break
+
+        fields["paragraphs"] = self._paragraphs(ex)
+        fields["page_hrefs"] = ex.page_hrefs
+        for container in ("div.tags", "ul.tags", "div.tag-cloud"):
+            if container in ex.seen:
+                fields["tags"] = ["".join(parts) for parts in ex.tag_links[container]]
+                break
+        return fields
+
+PARSERS = {
+    "bs4": Bs4Parser,
+    "lxml": LxmlParser,
+    "stream": StreamParser,
+}
+
+_instances = {}
+
+def get_parser(name=None):
+    """Instance backend parser (dipakai bersama; backend tidak menyimpan state antar halaman)."""
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Parser tidak dikenal: {name} (pilihan: {', '.join(PARSERS)})")
+    if name not in _instances:
+        _instances[name] = PARSERS[name]()
+    return _instances[name]
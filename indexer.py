@@ -2,30 +2,67 @@ import os
 import json
 import sys
 import subprocess
+import argparse
+import shutil
+import threading
 from pathlib import Path
+from time import perf_counter
+from records import CLEAN_FILE, LEGACY_CLEAN_FILE, content_hash, index_contents, iter_records, resolve_input
+from docstore import DOCSTORE_NAME, build_docstore
+from bm25_engine import ENGINE_NAME, build_engine
+from generations import (DOC_LAYOUT, INDEX_ROOT, clone_generation, current_generation, current_index_dir,
+                         load_manifest, manifest_layout, new_generation_dir, prune_generations,
+                         publish_generation, save_manifest)
 
 # Define local paths for data and index
 DATA_DIR = Path("./data")
-INDEX_DIR = Path("./index_bm25")
+INDEX_DIR = INDEX_ROOT
 
 # Ensure data and index directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 INDEX_DIR.mkdir(parents=True, exist_ok=True)
 
 # Path sudah konsisten
-in_file = "data/kompas_nasional_clean.json"
-jsonl_path = DATA_DIR / "kompas_nasional_clean.jsonl"
+in_file = CLEAN_FILE
+# Direktori khusus koleksi Pyserini: hanya berisi shard JSONL {"id", "contents"}
+COLLECTION_DIR = DATA_DIR / "collection"
 
-def create_jsonl_for_pyserini(input_json_file, output_jsonl_file):
+# Default jumlah thread indexing (dan shard koleksi) = jumlah core
+DEFAULT_THREADS = os.cpu_count() or 1
+
+# Opsi penyimpanan yang sama dengan full rebuild, agar segmen baru konsisten
+STORE_ARGS = ["-storePositions", "-storeDocvectors", "-storeRaw"]
+
+def pyserini_doc(art, idx):
+    """
+    Satu artikel hasil preprocessing → dokumen JsonCollection Pyserini.
+    Token ditulis sebelum judul (DOC_LAYOUT) agar posisi term di index sama dengan
+    indeks token artikel (dipakai untuk cuplikan sesuai query); skor BM25 tidak berubah.
     """
-    Loads preprocessed JSON data and converts it to JSONL format for Pyserini.
+    return {
+        "id": art.get("url", str(idx)),
+        "contents": index_contents(art)
+    }
+
+def iter_doc_hashes(input_json_file):
+    """(docid, content_hash) untuk setiap artikel; hash dihitung ulang bila record lama belum punya."""
+    for idx, art in enumerate(iter_records(input_json_file)):
+        yield art.get("url", str(idx)), art.get("content_hash") or content_hash(art)
+
+def create_jsonl_for_pyserini(input_json_file, collection_dir, num_shards=1):
     """
+    Streams preprocessed records (JSONL, or legacy JSON array) into a dedicated Pyserini
+    collection directory, split round-robin into num_shards JSONL files
+    (Anserini indexes one shard per thread).
+    """
+    input_json_file = resolve_input(input_json_file, LEGACY_CLEAN_FILE)
     if not Path(input_json_file).exists():
         print(f"⚠️  Error: Input file '{input_json_file}' not found.")
         choice = input("Jalankan preprocessor.py dulu? (y/n): ").strip().lower()
         if choice == 'y':
             print("Menjalankan preprocessor.py...")
             subprocess.run([sys.executable, "preprocessor.py"])
+            input_json_file = resolve_input(CLEAN_FILE, LEGACY_CLEAN_FILE)
             if not Path(input_json_file).exists():
                 print(f"❌ Preprocessing gagal atau dibatalkan. File {input_json_file} tidak ditemukan.")
                 return 0
@@ -33,75 +70,280 @@ def create_jsonl_for_pyserini(input_json_file, output_jsonl_file):
             print("Program dihentikan. Silakan jalankan preprocessor.py terlebih dahulu.")
             return 0
 
-    with open(input_json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Koleksi lama dibersihkan agar shard dari run sebelumnya tidak ikut terindeks
+    collection_dir = Path(collection_dir)
+    collection_dir.mkdir(parents=True, exist_ok=True)
+    for old_shard in collection_dir.glob("*.jsonl"):
+        old_shard.unlink()
+
+    num_shards = max(1, int(num_shards))
+    shards = [open(collection_dir / f"docs{i:03d}.jsonl", "w", encoding="utf-8") for i in range(num_shards)]
+    num_docs = 0
+    try:
+        for idx, art in enumerate(iter_records(input_json_file)):
+            rec = pyserini_doc(art, idx)
+            shards[idx % num_shards].write(json.dumps(rec, ensure_ascii=False) + "\n")
+            num_docs += 1
+    finally:
+        for f in shards:
+            f.close()
 
-    with open(output_jsonl_file, "w", encoding="utf-8") as f:
-        for idx, art in enumerate(data):
-            title = art.get("title", "")
-            tokens = " ".join(art.get("tokens", []))
+    print(f"✅ JSONL for Pyserini created: {collection_dir} ({num_shards} shard)")
+    print(f"Number of documents: {num_docs}")
+    return num_docs
 
-            rec = {
-                "id": art.get("url", str(idx)),
-                "contents": f"{title} {tokens}".strip()
-            }
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+def index_size_bytes(index_dir):
+    return sum(p.stat().st_size for p in Path(index_dir).iterdir() if p.is_file())
 
-    print(f"✅ JSONL for Pyserini created: {output_jsonl_file}")
-    print(f"Number of documents: {len(data)}")
-    return len(data)
+def build_generation_artifacts(records_file, gen_dir, doc_hashes=None):
+    """
+    Manifest, docstore metadata, dan engine BM25 NumPy untuk generasi gen_dir yang belum dipublikasikan.
+    Satu-satunya tempat artefak ini dibangun: retriever tidak pernah menulis ke generasi yang sudah aktif.
+    Return doc_hashes (docid → content_hash).
+    """
+    if doc_hashes is None:
+        doc_hashes = dict(iter_doc_hashes(records_file))
+    save_manifest(gen_dir, doc_hashes)
+    build_docstore(records_file, gen_dir / DOCSTORE_NAME)
+    build_engine(records_file, gen_dir / ENGINE_NAME)
+    return doc_hashes
 
-def index_documents(jsonl_input_path, index_output_path):
+def build_numpy_generation(input_json_file, index_output_path):
+    """
+    Generasi tanpa index Lucene (tanpa JVM/Pyserini): hanya manifest, docstore, dan engine NumPy,
+    untuk dilayani dengan IR_BACKEND=numpy.
+    """
+    records_file = resolve_input(input_json_file, LEGACY_CLEAN_FILE)
+    t0 = perf_counter()
+    gen_dir = new_generation_dir(index_output_path)
+    try:
+        doc_hashes = build_generation_artifacts(records_file, gen_dir)
+        publish_generation(gen_dir, index_output_path)
+    except BaseException:
+        shutil.rmtree(gen_dir, ignore_errors=True)
+        raise
+    prune_generations(index_output_path)
+    print(f"✅ Generasi NumPy (tanpa Lucene) siap: CURRENT → {gen_dir.name} "
+          f"({len(doc_hashes)} dokumen, {perf_counter() - t0:.2f}s)")
+
+def index_documents(jsonl_input_path, index_output_path, input_json_file=in_file, threads=DEFAULT_THREADS):
     """
     Indexes documents using Pyserini's command-line interface.
+    The index is built into a new generation directory under index_output_path and
+    published by flipping the CURRENT pointer, so the live index is never touched mid-build.
     """
     # CEK APAKAH INDEX SUDAH ADA
-    if index_output_path.exists() and any(index_output_path.iterdir()):
-        print(f"\n✅ Index sudah ada di: {index_output_path}")
+    live_dir = current_index_dir(index_output_path)
+    if any(live_dir.glob("segments_*")):
+        print(f"\n✅ Index sudah ada di: {live_dir}")
         choice = input("Indexing ulang? (y/n): ").strip().lower()
         if choice != 'y':
             print("Menggunakan index yang sudah ada.")
             return
-    
-    print(f"Starting Pyserini indexing to {index_output_path}...")
-    
-    # Clear existing index if it exists
-    if index_output_path.exists():
-        import shutil
-        shutil.rmtree(index_output_path)
-        print(f"Removed existing index at {index_output_path}")
+
+    gen_dir = new_generation_dir(index_output_path)
+    print(f"Starting Pyserini indexing to {gen_dir}...")
 
     # Use Pyserini's command-line indexing (same as Colab but for Windows)
     cmd = [
         sys.executable, "-m", "pyserini.index.lucene",
         "--collection", "JsonCollection",
-        "--input", str(DATA_DIR.resolve()),  # directory containing JSONL file
-        "--index", str(index_output_path.resolve()),
+        "--input", str(Path(jsonl_input_path).resolve()),  # dedicated collection directory (JSONL shards)
+        "--index", str(gen_dir.resolve()),
         "--generator", "DefaultLuceneDocumentGenerator",
-        "--threads", "1",
+        "--threads", str(threads),
         "--storePositions", "--storeDocvectors", "--storeRaw"
     ]
     
     print(f"Running command: {' '.join(cmd)}")
+    t0 = perf_counter()
     result = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = perf_counter() - t0
     
     if result.returncode == 0:
-        print(f"✅ Pyserini indexing complete. Index saved to: {index_output_path}")
+        records_file = resolve_input(input_json_file, LEGACY_CLEAN_FILE)
+        try:
+            doc_hashes = build_generation_artifacts(records_file, gen_dir)
+            publish_generation(gen_dir, index_output_path)
+        except BaseException:
+            # Index Lucene yang sudah jadi tetap dibuang bila artefaknya gagal dibuat
+            shutil.rmtree(gen_dir, ignore_errors=True)
+            raise
+        prune_generations(index_output_path)
+        print(f"✅ Pyserini indexing complete. Index saved to: {gen_dir} (CURRENT → {gen_dir.name})")
         print(result.stdout)
+        rate = len(doc_hashes) / elapsed if elapsed > 0 else 0.0
+        print(f"📊 {len(doc_hashes)} dokumen dalam {elapsed:.2f}s ({rate:.1f} dok/detik, threads={threads}), "
+              f"ukuran index {index_size_bytes(gen_dir) / 1e6:.2f} MB")
     else:
+        shutil.rmtree(gen_dir, ignore_errors=True)
         print(f"❌ Indexing failed with error:")
         print(result.stderr)
         print(result.stdout)
 
+def _open_index_writer(index_dir):
+    """IndexWriter Lucene (mode CREATE_OR_APPEND) di atas index yang sudah ada, lewat pyjnius Pyserini."""
+    from pyserini.pyclass import autoclass
+    JFile = autoclass("java.io.File")
+    JFSDirectory = autoclass("org.apache.lucene.store.FSDirectory")
+    JIndexWriter = autoclass("org.apache.lucene.index.IndexWriter")
+    JIndexWriterConfig = autoclass("org.apache.lucene.index.IndexWriterConfig")
+    JOpenMode = autoclass("org.apache.lucene.index.IndexWriterConfig$OpenMode")
+    JWhitespaceAnalyzer = autoclass("org.apache.lucene.analysis.core.WhitespaceAnalyzer")
+
+    # Analyzer tidak dipakai untuk delete/merge; dokumen baru ditambahkan lewat LuceneIndexer
+    config = JIndexWriterConfig(JWhitespaceAnalyzer())
+    config.setOpenMode(JOpenMode.CREATE_OR_APPEND)
+    directory = JFSDirectory.open(JFile(str(Path(index_dir).resolve())).toPath())
+    return JIndexWriter(directory, config)
+
+def delete_documents(index_dir, docids, batch_size=1000):
+    """Hapus dokumen berdasarkan docid (field "id" Anserini = URL artikel)."""
+    from pyserini.pyclass import autoclass
+    JTerm = autoclass("org.apache.lucene.index.Term")
+    writer = _open_index_writer(index_dir)
+    try:
+        docids = list(docids)
+        for i in range(0, len(docids), batch_size):
+            writer.deleteDocuments([JTerm("id", docid) for docid in docids[i:i + batch_size]])
+        writer.commit()
+    finally:
+        writer.close()
+
+def merge_segments_async(index_root, max_segments=1):
+    """
+    Gabungkan segmen index di thread latar belakang, ke generasi baru.
+    Generasi aktif tetap melayani query selama merge; hasil merge dipublikasikan
+    hanya jika CURRENT belum dipindah oleh update lain sementara merge berjalan.
+    """
+    def _merge():
+        from jnius import detach
+        try:
+            base_generation = current_generation(index_root)
+            gen_dir = new_generation_dir(index_root)
+            try:
+                clone_generation(current_index_dir(index_root), gen_dir)
+                writer = _open_index_writer(gen_dir)
+                try:
+                    writer.forceMerge(int(max_segments))
+                    writer.commit()
+                finally:
+                    writer.close()
+                if current_generation(index_root) != base_generation:
+                    shutil.rmtree(gen_dir, ignore_errors=True)
+                    print("⚠️  Index berubah selama merge; hasil merge dibuang.")
+                    return
+                publish_generation(gen_dir, index_root)
+            except BaseException:
+                shutil.rmtree(gen_dir, ignore_errors=True)
+                raise
+            prune_generations(index_root)
+            print(f"✅ Merge selesai: CURRENT → {gen_dir.name} (maks {max_segments} segmen)")
+        finally:
+            detach()
+
+    thread = threading.Thread(target=_merge, name="index-merge")
+    thread.start()
+    return thread
+
+def update_index(input_json_file, index_output_path, threads=DEFAULT_THREADS, merge_segments=None):
+    """
+    Update inkremental index yang sudah ada (tanpa rmtree):
+    dokumen baru ditambahkan, dokumen berubah diganti berdasarkan docid (URL),
+    dan dokumen yang hilang dihapus. Generasi aktif di-clone (hard link) ke generasi baru,
+    perubahan ditulis di sana sebagai segmen baru, lalu CURRENT dipindah.
+    Return thread merge (jika merge_segments diisi) agar pemanggil bisa menunggu.
+    """
+    input_json_file = resolve_input(input_json_file, LEGACY_CLEAN_FILE)
+    live_dir = current_index_dir(index_output_path)
+    manifest = load_manifest(live_dir)
+    if manifest is None or not any(live_dir.glob("segments_*")) or manifest_layout(live_dir) != DOC_LAYOUT:
+        print("Index atau manifest belum ada (atau layout dokumen lama) → full rebuild.")
+        create_jsonl_for_pyserini(input_json_file, COLLECTION_DIR, num_shards=threads)
+        index_documents(COLLECTION_DIR, index_output_path, input_json_file, threads=threads)
+        return None
+
+    current = dict(iter_doc_hashes(input_json_file))
+    removed = manifest.keys() - current.keys()
+    changed = {docid for docid, h in current.items() if docid in manifest and manifest[docid] != h}
+    added = current.keys() - manifest.keys()
+    print(f"Update index: baru={len(added)} berubah={len(changed)} dihapus={len(removed)} tetap={len(current) - len(added) - len(changed)}")
+
+    t0 = perf_counter()
+    gen_dir = new_generation_dir(index_output_path)
+    try:
+        clone_generation(live_dir, gen_dir)
+
+        # Dokumen berubah dihapus dulu lalu ditambah ulang (Anserini SimpleIndexer hanya bisa addDocument);
+        # keduanya terjadi di generasi baru yang belum terlihat oleh searcher
+        if removed or changed:
+            delete_documents(gen_dir, removed | changed)
+
+        to_index = added | changed
+        if to_index:
+            from pyserini.index.lucene import LuceneIndexer
+            indexer = LuceneIndexer(args=["-index", str(gen_dir.resolve())] + STORE_ARGS,
+                                    append=True, threads=threads)
+            batch = []
+            for idx, art in enumerate(iter_records(input_json_file)):
+                doc = pyserini_doc(art, idx)
+                if doc["id"] in to_index:
+                    batch.append(doc)
+                if len(batch) >= 1000:
+                    indexer.add_batch_dict(batch)
+                    batch = []
+            if batch:
+                indexer.add_batch_dict(batch)
+            indexer.close()
+
+        build_generation_artifacts(input_json_file, gen_dir, current)
+        publish_generation(gen_dir, index_output_path)
+    except BaseException:
+        # Generasi setengah jadi tidak pernah dipublikasikan
+        shutil.rmtree(gen_dir, ignore_errors=True)
+        raise
+    prune_generations(index_output_path)
+    elapsed = perf_counter() - t0
+    n_changed = len(to_index) + len(removed)
+    rate = n_changed / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Index diperbarui: CURRENT → {gen_dir.name}")
+    print(f"📊 {n_changed} dokumen diubah dalam {elapsed:.2f}s ({rate:.1f} dok/detik, threads={threads}), "
+          f"ukuran index {index_size_bytes(gen_dir) / 1e6:.2f} MB")
+
+    if merge_segments:
+        return merge_segments_async(index_output_path, merge_segments)
+    return None
+
 
 if __name__ == "__main__":
-    input_json_file_path = "data/kompas_nasional_clean.json"
+    parser = argparse.ArgumentParser(description="Indexing BM25 (Pyserini) untuk artikel Kompas")
+    parser.add_argument("--update", action="store_true",
+                        help="Update inkremental index yang ada (tambah/ganti/hapus per URL) alih-alih rebuild penuh")
+    parser.add_argument("--merge-segments", type=int, default=None, metavar="N",
+                        help="Setelah --update, gabungkan segmen menjadi maks N di latar belakang")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS,
+                        help=f"Jumlah thread indexing (default: jumlah core = {DEFAULT_THREADS})")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Jumlah shard JSONL di data/collection (default: sama dengan --threads)")
+    parser.add_argument("--numpy-only", action="store_true",
+                        help="Generasi baru tanpa index Lucene (docstore + engine NumPy saja, untuk IR_BACKEND=numpy)")
+    args = parser.parse_args()
+
+    input_json_file_path = in_file
+
+    if args.numpy_only:
+        build_numpy_generation(input_json_file_path, INDEX_DIR)
+        sys.exit(0)
+
+    if args.update:
+        update_index(input_json_file_path, INDEX_DIR, threads=args.threads, merge_segments=args.merge_segments)
+        sys.exit(0)
 
-    # Create JSONL file
-    num_docs = create_jsonl_for_pyserini(input_json_file_path, jsonl_path)
+    # Create JSONL collection (sharded)
+    num_docs = create_jsonl_for_pyserini(input_json_file_path, COLLECTION_DIR, num_shards=args.shards or args.threads)
 
     if num_docs > 0:
         # Index the documents
-        index_documents(jsonl_path, INDEX_DIR)
+        index_documents(COLLECTION_DIR, INDEX_DIR, input_json_file_path, threads=args.threads)
     else:
         print("No documents to index. Please check preprocessing step.")
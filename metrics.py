@@ -0,0 +1,393 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter, time
+
+# Instrumentasi hot path pencarian (tanpa dependensi tambahan):
+#   - span per tahap (preprocess, search, hydrate, render) → histogram latensi per tahap
+#   - counter (request, cache hit/miss, query kosong, ...)
+#   - p50/p95/p99 dari WINDOW sampel terakhir per histogram
+#   - ekspor format teks Prometheus (exporter HTTP opsional) dan/atau satu baris JSON per request
+#   - sampling profiler opsional (stack semua thread, format folded untuk flamegraph/speedscope)
+# Semua opsional diaktifkan lewat environment variable (lihat start_from_env):
+#   IR_METRICS_PORT=9108           exporter HTTP: GET /metrics (Prometheus), /metrics.json
+#   IR_METRICS_LOG=stderr|<file>   satu baris JSON per request
+#   IR_PROFILE=1                   sampling profiler; IR_PROFILE_INTERVAL (ms, default 10),
+#                                  IR_PROFILE_FILE (default data/profile.folded)
+STAGE_METRIC = "ir_stage_duration_seconds"
+REQUEST_METRIC = "ir_request_duration_seconds"
+REQUESTS_TOTAL = "ir_requests_total"
+
+# Batas bucket histogram (detik)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Jumlah sampel terakhir untuk p50/p95/p99
+WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+PROFILE_FILE = "data/profile.folded"
+DEFAULT_PROFILE_INTERVAL_MS = 10
+
+log = logging.getLogger("ir.metrics")
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+class Histogram:
+    """Histogram kumulatif ala Prometheus + jendela sampel terakhir untuk kuantil."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=WINDOW):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+            self.recent.append(value)
+
+    def quantiles(self, qs=QUANTILES):
+        """{q: nilai} dari jendela sampel terakhir (nearest-rank), kosong bila belum ada sampel."""
+        with self._lock:
+            values = sorted(self.recent)
+        if not values:
+            return {}
+        return {q: values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))] for q in qs}
+
+class Registry:
+    """Kumpulan metrik per (nama, label); aman dipakai dari banyak thread."""
+
+    def __init__(self):
+        self._metrics = {}  # nama -> (tipe, help, {label tuple: instrumen})
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name, help_text, labels, factory):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._metrics.get(name)
+            if entry is None:
+                entry = self._metrics[name] = (kind, help_text or name, {})
+            elif entry[0] != kind:
+                raise ValueError(f"Metrik {name} sudah terdaftar sebagai {entry[0]}")
+            series = entry[2]
+            if key not in series:
+                series[key] = factory()
+            return series[key]
+
+    def counter(self, name, help_text=None, **labels):
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def histogram(self, name, help_text=None, **labels):
+        return self._get("histogram", name, help_text, labels, Histogram)
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def _items(self):
+        with self._lock:
+            return [(name, kind, help_text, dict(series)) for name, (kind, help_text, series) in self._metrics.items()]
+
+    def prometheus_text(self):
+        """Semua metrik dalam format eksposisi teks Prometheus (0.0.4)."""
+        lines = []
+        for name, kind, help_text, series in self._items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in series.items():
+                if kind == "counter":
+                    lines.append(f"{name}{_labels(key)} {_number(metric.value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), metric.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(key, le=_number(bound))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(key)} {_number(metric.sum)}")
+                lines.append(f"{name}_count{_labels(key)} {metric.count}")
+            if kind == "histogram":
+                # Kuantil jendela terakhir sebagai gauge terpisah (histogram Prometheus tidak memuat kuantil)
+                lines.append(f"# HELP {name}_quantile p50/p95/p99 dari {WINDOW} sampel terakhir")
+                lines.append(f"# TYPE {name}_quantile gauge")
+                for key, metric in series.items():
+                    for q, value in metric.quantiles().items():
+                        lines.append(f"{name}_quantile{_labels(key, quantile=_number(q))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """{nama: [{labels, ...nilai}]}: counter → value; histogram → count, mean, p50/p95/p99 (detik)."""
+        result = {}
+        for name, kind, _, series in self._items():
+            rows = []
+            for key, metric in series.items():
+                row = {"labels": dict(key)}
+                if kind == "counter":
+                    row["value"] = metric.value
+                else:
+                    row["count"] = metric.count
+                    row["mean"] = metric.sum / metric.count if metric.count else 0.0
+                    row.update({f"p{round(q * 100)}": v for q, v in metric.quantiles().items()})
+                rows.append(row)
+            result[name] = rows
+        return result
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def _labels(key, **extra):
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+REGISTRY = Registry()
+
+def incr(name, n=1, help_text=None, **labels):
+    REGISTRY.counter(name, help_text, **labels).inc(n)
+
+def observe(name, seconds, help_text=None, **labels):
+    REGISTRY.histogram(name, help_text, **labels).observe(seconds)
+
+# ====== Span & request ======
+class Trace:
+    """Satu request: durasi per tahap (ms, dijumlah bila tahap berulang) + atribut bebas."""
+
+    def __init__(self, kind, attrs):
+        self.kind = kind
+        self.attrs = dict(attrs)
+        self.stages = defaultdict(float)
+        self.start = perf_counter()
+
+    def as_record(self, total_seconds):
+        return {"ts": round(time(), 3), "kind": self.kind, "total_ms": round(total_seconds * 1000, 3),
+                "stages": {stage: round(ms, 3) for stage, ms in self.stages.items()}, **self.attrs}
+
+_current = ContextVar("ir_metrics_trace", default=None)
+
+@contextmanager
+def span(stage):
+    """Ukur satu tahap: histogram ir_stage_duration_seconds{stage} + durasi di request yang aktif."""
+    t0 = perf_counter()
+    try:
+        yield
+    finally:
+        seconds = perf_counter() - t0
+        observe(STAGE_METRIC, seconds, "Latensi per tahap pencarian", stage=stage)
+        trace = _current.get()
+        if trace is not None:
+            trace.stages[stage] += seconds * 1000
+
+@contextmanager
+def request(kind, **attrs):
+    """
+    Batas satu request (mis. satu pencarian di UI). Request bersarang memakai trace luar.
+    Saat selesai: counter + histogram total, dan satu baris JSON di logger "ir.metrics".
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
+        yield trace
+        return
+    trace = Trace(kind, attrs)
+    token = _current.set(trace)
+    status = "ok"
+    try:
+        yield trace
+    except Exception:  # BaseException (mis. rerun/stop Streamlit) bukan error
+        status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        seconds = perf_counter() - trace.start
+        incr(REQUESTS_TOTAL, help_text="Jumlah request", kind=kind, status=status)
+        observe(REQUEST_METRIC, seconds, "Latensi total per request", kind=kind)
+        if log.isEnabledFor(logging.INFO):
+            trace.attrs.setdefault("status", status)
+            log.info(json.dumps(trace.as_record(seconds), ensure_ascii=False, default=str))
+
+def annotate(**attrs):
+    """Tambahkan atribut ke request yang sedang berjalan (diabaikan bila tidak ada)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+def prometheus_text():
+    return REGISTRY.prometheus_text()
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+def stage_summary(metric=STAGE_METRIC):
+    """{stage: {count, mean, p50, p95, p99}} dalam milidetik, untuk ditampilkan di UI."""
+    summary = {}
+    for row in snapshot().get(metric, []):
+        label = row["labels"].get("stage") or row["labels"].get("kind")
+        summary[label] = {key: (value * 1000 if key != "count" else value)
+                          for key, value in row.items() if key != "labels"}
+    return summary
+
+# ====== Exporter HTTP ======
+def start_exporter(port, host="0.0.0.0"):
+    """Server HTTP (thread daemon): /metrics (Prometheus) dan /metrics.json."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] == "/metrics":
+                body, ctype = prometheus_text().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path.split("?")[0] == "/metrics.json":
+                body, ctype = json.dumps(snapshot()).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="ir-metrics-exporter", daemon=True).start()
+    return server
+
+# ====== Sampling profiler ======
+class SamplingProfiler:
+    """
+    Ambil stack semua thread (kecuali dirinya) setiap interval detik lewat sys._current_frames(),
+    hitung per stack, dan tulis dalam format folded (`fungsi;fungsi;... jumlah`) ke path
+    secara berkala dan saat stop(). Overhead ~ sebanding 1/interval, tanpa tracing per panggilan.
+    """
+
+    def __init__(self, path=PROFILE_FILE, interval=DEFAULT_PROFILE_INTERVAL_MS / 1000, flush_every=30.0):
+        self.path = path
+        self.interval = interval
+        self.flush_every = flush_every
+        self.samples = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ir-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        last_flush = perf_counter()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                with self._lock:
+                    self.samples[";".join(reversed(stack))] += 1
+            if perf_counter() - last_flush >= self.flush_every:
+                self.flush()
+                last_flush = perf_counter()
+
+    def flush(self):
+        with self._lock:
+            samples = sorted(self.samples.items(), key=lambda item: -item[1])
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for stack, count in samples:
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, self.path)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+# ====== Setup dari environment (sekali per proses) ======
+_started = False
+_start_lock = threading.Lock()
+exporter = None
+profiler = None
+
+def start_from_env(environ=None):
+    """Aktifkan exporter / log JSON / profiler sesuai environment; aman dipanggil berulang (mis. rerun Streamlit)."""
+    global _started, exporter, profiler
+    environ = os.environ if environ is None else environ
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+
+        target = environ.get("IR_METRICS_LOG")
+        if target:
+            handler = logging.StreamHandler(sys.stderr) if target in ("-", "stderr") else logging.FileHandler(target, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log.addHandler(handler)
+            log.setLevel(logging.INFO)
+            log.propagate = False
+
+        port = environ.get("IR_METRICS_PORT")
+        if port:
+            try:
+                exporter = start_exporter(int(port))
+                print(f"📈 Metrics exporter: http://localhost:{port}/metrics")
+            except OSError as e:
+                print(f"⚠️  Metrics exporter gagal di port {port}: {e}")
+
+        if environ.get("IR_PROFILE", "").lower() not in ("", "0", "false", "no"):
+            interval = float(environ.get("IR_PROFILE_INTERVAL", DEFAULT_PROFILE_INTERVAL_MS)) / 1000
+            profiler = SamplingProfiler(environ.get("IR_PROFILE_FILE", PROFILE_FILE), interval).start()
+            atexit.register(profiler.stop)
+            print(f"🔬 Sampling profiler aktif (setiap {interval * 1000:.0f} ms) → {profiler.path}")
+
+if __name__ == "__main__":
+    import argparse
+    # Modul ini sebagai __main__ ≠ modul `metrics` yang diimpor retriever: pakai registry yang sama
+    import metrics
+
+    parser = argparse.ArgumentParser(description="Jalankan query dengan instrumentasi dan tampilkan metrik per tahap")
+    parser.add_argument("queries", nargs="*", default=["politik", "korupsi anggaran", "ekonomi indonesia"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--format", choices=["table", "prometheus", "json"], default="table")
+    args = parser.parse_args()
+
+    metrics.start_from_env()
+    from retriever import get_retriever
+    retriever = get_retriever()
+    for _ in range(args.repeat):
+        for q in args.queries:
+            retriever.search_page(q)
+    if args.format == "prometheus":
+        print(metrics.prometheus_text(), end="")
+    elif args.format == "json":
+        print(json.dumps(metrics.snapshot(), indent=2))
+    else:
+        print(f"{'tahap':>12} {'n':>6} {'mean ms':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for stage, row in metrics.stage_summary().items():
+            print(f"{stage:>12} {row['count']:>6} {row['mean']:>9.3f} {row.get('p50', 0):>8.3f} "
+                  f"{row.get('p95', 0):>8.3f} {row.get('p99', 0):>8.3f}")
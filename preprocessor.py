@@ -1,53 +1,127 @@
-import re
 import json
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from nltk.corpus import stopwords
-import nltk
 import os
 import subprocess
 import sys
 import logging
+import argparse
 import shutil # Tambah import shutil untuk menghapus file
+from collections import Counter, deque
+from contextlib import nullcontext
+from itertools import tee
+from concurrent.futures import ProcessPoolExecutor
 try:
     from tqdm import tqdm
 except ImportError:
     tqdm = None
+from tokenizer import LEXICON_FILE, build_lexicon, get_tokenizer, reset_tokenizer
+from records import (ARTICLES_FILE, CLEAN_FILE, LEGACY_ARTICLES_FILE, LEGACY_CLEAN_FILE,
+                     content_hash, count_records, iter_records, make_snippet, resolve_input,
+                     split_passages, write_records)
 
-# Download the stopwords corpus if not already downloaded
-try:
-    stopwords.words("indonesian")
-except LookupError:
-    nltk.download('stopwords')
-
-# ====== Setup stopwords & stemmer ======
-factory = StemmerFactory()
-stemmer = factory.create_stemmer()
-stop_words = set(stopwords.words("indonesian"))
-custom_stop = {"baca", "juga", "halaman", "kompas"}
-stop_words = stop_words.union(custom_stop)
+# ====== Stopwords & stemmer ======
+# Dimuat saat pertama dipakai dari artefak lexicon (tokenizer.get_tokenizer), bukan saat import
 
 def preprocess_text(text):
-    if not text:
-        return []
-    # 1. lowercase
-    text = text.lower()
-    # 2. hapus html tags
-    text = re.sub(r"<.*?>", " ", text)
-    # 3. hapus pola "baca juga"
-    text = re.sub(r"baca juga.*", " ", text)
-    # 4. hapus .com
-    text = re.sub(r"\.com", " ", text)
-    # 5. hapus angka & simbol
-    text = re.sub(r"[^a-z\s]", " ", text)
-    # 6. tokenisasi
-    tokens = text.split()
-    # 7. stopword removal
-    tokens = [t for t in tokens if t not in stop_words]
-    # 8. stemming
-    tokens = [stemmer.stem(t) for t in tokens]
-    return tokens
+    """
+    lowercase → hapus tag HTML, "baca juga ...", ".com" → hapus angka & simbol → tokenisasi
+    → stopword removal → stemming (lihat tokenizer.py)
+    """
+    return get_tokenizer().tokens(text)
+
+def preprocess_document(text):
+    """
+    Token artikel + passages [[token awal, token akhir, byte awal, byte akhir], ...]
+    (offset byte pada `content` UTF-8).
+    Diproses per paragraf: semua pola pembersihan berhenti di akhir baris, jadi
+    gabungan token paragraf sama persis dengan preprocess_text(text).
+    Paragraf tanpa token (mis. baris "Baca juga") tidak disimpan sebagai passage.
+    """
+    tokens, passages = [], []
+    spans = split_passages(text)
+    for (byte_start, byte_end, _), paragraph_tokens in zip(spans, get_tokenizer().batch(p for _, _, p in spans)):
+        if paragraph_tokens:
+            passages.append([len(tokens), len(tokens) + len(paragraph_tokens), byte_start, byte_end])
+            tokens.extend(paragraph_tokens)
+    return tokens, passages
+
+# ====== Preprocessing paralel (multi-proses) ======
+def _init_worker():
+    """Setiap worker punya stemmer Sastrawi & set stopword sendiri."""
+    reset_tokenizer(record_learned=True)
+
+def _preprocess_chunk(texts):
+    # Kirim balik stem baru agar kamus stem di proses induk ikut bertambah
+    return [preprocess_document(t) for t in texts], get_tokenizer().stemmer.pop_learned()
+
+def _chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def preprocess_articles(texts, workers=1, chunksize=16):
+    """
+    Generator (token, passages) per teks, urut sesuai input.
+    workers > 1 membagi teks ke process pool; jumlah chunk yang sedang diproses
+    dibatasi (workers * 2) agar memori tidak ikut membesar dengan ukuran korpus.
+    """
+    if workers <= 1:
+        for text in texts:
+            yield preprocess_document(text)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in _chunked(texts, chunksize):
+            pending.append(pool.submit(_preprocess_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from _collect(pending.popleft())
+        while pending:
+            yield from _collect(pending.popleft())
+
+def _collect(future):
+    token_lists, learned = future.result()
+    get_tokenizer().stemmer.merge(learned)
+    return token_lists
+
+# ====== Preprocessing inkremental (berbasis hash konten) ======
+def index_previous_output(path):
+    """
+    url → (content_hash, byte offset) dari hasil preprocessing sebelumnya.
+    Record lama dibaca ulang lewat offset hanya jika dipakai kembali.
+    File JSON lama (tanpa hash) menghasilkan indeks kosong → semua diproses ulang.
+    """
+    index = {}
+    if not os.path.exists(path) or count_records(path) is None:
+        return index
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                rec = json.loads(line)
+                if rec.get("content_hash") and rec.get("url"):
+                    index[rec["url"]] = (rec["content_hash"], offset)
+            offset += len(line)
+    return index
 
 if __name__ == "__main__":
+    from dedup import DEFAULT_THRESHOLD, iter_deduplicated, load_signatures, plan_dedup, save_signatures
+
+    parser = argparse.ArgumentParser(description="Preprocessing artikel Kompas (lowercase, stopword, stemming)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Jumlah proses paralel (default: 1 = serial)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Hanya proses artikel baru/berubah (berdasarkan hash konten per URL); artikel yang hilang dibuang")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Jangan buang artikel hampir-duplikat (MinHash/LSH, lihat dedup.py)")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimal estimasi Jaccard untuk dianggap duplikat (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s | %(levelname)s | %(message)s",
@@ -55,8 +129,8 @@ if __name__ == "__main__":
     )
     logging.info("Preprocessing dimulai")
 
-    in_file = "data/kompas_nasional_articles.json"   # ✅ Dari folder data
-    out_file = "data/kompas_nasional_clean.json"     # ✅ Simpan di folder data
+    in_file = resolve_input(ARTICLES_FILE, LEGACY_ARTICLES_FILE)   # ✅ JSONL, atau JSON lama
+    out_file = CLEAN_FILE                                          # ✅ JSONL di folder data
 
     # CEK FILE INPUT
     if not os.path.exists(in_file):
@@ -65,6 +139,7 @@ if __name__ == "__main__":
         if choice == 'y':
             logging.info("Menjalankan scraper.py...")
             subprocess.run([sys.executable, "scraper.py"])
+            in_file = resolve_input(ARTICLES_FILE, LEGACY_ARTICLES_FILE)
             if not os.path.exists(in_file):
                 logging.error(f"Scraping gagal atau dibatalkan. File {in_file} tidak ditemukan.")
                 exit(1)
@@ -73,8 +148,9 @@ if __name__ == "__main__":
             exit(1)
 
     # CEK FILE OUTPUT - hindari preprocessing ulang
-    if os.path.exists(out_file):
-        logging.info(f"File hasil preprocessing sudah ada: {out_file}")
+    existing_out = resolve_input(out_file, LEGACY_CLEAN_FILE)
+    if os.path.exists(existing_out) and not args.incremental:
+        logging.info(f"File hasil preprocessing sudah ada: {existing_out}")
         choice = input("Preprocessing ulang? (y/n): ").strip().lower()
         if choice != 'y':
             logging.info("Menggunakan data yang sudah ada.")
@@ -84,65 +160,145 @@ if __name__ == "__main__":
             if os.path.exists(out_file):
                 os.remove(out_file)
                 logging.info(f"Menghapus file '{out_file}' untuk memulai ulang.")
-            # Juga hapus jsonl jika ada, karena akan dibuat ulang oleh indexer
-            jsonl_path = "data/kompas_nasional_clean.jsonl"
-            if os.path.exists(jsonl_path):
-                os.remove(jsonl_path)
-                logging.info(f"Menghapus file '{jsonl_path}' untuk memulai ulang.")
+            # Juga hapus koleksi Pyserini jika ada, karena akan dibuat ulang oleh indexer
+            collection_dir = "data/collection"
+            if os.path.exists(collection_dir):
+                shutil.rmtree(collection_dir)
+                logging.info(f"Menghapus folder '{collection_dir}' untuk memulai ulang.")
+
+    # Stopword NLTK diunduh (sekali) hanya di sini, saat membangun artefak lexicon pertama kali
+    if not os.path.exists(LEXICON_FILE):
+        logging.info(f"Membuat artefak lexicon {LEXICON_FILE} (stopword + kamus stem)")
+        build_lexicon(download=True)
 
     from time import perf_counter
     t0 = perf_counter()
 
-    # PROSES PREPROCESSING
-    with open(in_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    logging.info(f"Memproses {len(data)} artikel dari {in_file} → {out_file}")
+    # PROSES PREPROCESSING (streaming: baca → proses → tulis per artikel)
+    total = count_records(in_file)
+    logging.info(f"Memproses {total if total is not None else '?'} artikel dari {in_file} → {out_file} (workers={args.workers})")
     if tqdm is None:
         logging.warning("tqdm tidak terpasang. Jalankan: pip install tqdm (progress bar nonaktif sementara)")
 
-    cleaned = []
-    total = len(data)
-    iterator = enumerate(data)
-    if tqdm is not None:
-        iterator = tqdm(enumerate(data), total=total, desc="Preprocessing", unit="artikel")
-
-    for idx, art in iterator:
-        raw_text = art.get("content", "")
-        tokens = preprocess_text(raw_text)
-        art["tokens"] = tokens
-        cleaned.append(art)
-
-        if idx == 0:
-            block_lines = []
-            block_lines.append("="*50)
-            block_lines.append("SEBELUM :")
-            block_lines.append((raw_text[:200] + "...\n") if raw_text else "(kosong)\n")
-            block_lines.append("SESUDAH :")
-            n_per_line = 10
-            pretty_tokens = []
-            pretty_tokens.append("[")
-            for i in range(0, len(tokens), n_per_line):
-                line = ", ".join(tokens[i:i+n_per_line])
-                if i + n_per_line < len(tokens):
-                    pretty_tokens.append(line + ",")
-                else:
-                    pretty_tokens.append(line)
-            pretty_tokens.append("]")
-            block_lines.extend(pretty_tokens)
-            block_lines.append("="*50)
-            text_block = "\n".join(block_lines)
-            if tqdm is not None:
-                tqdm.write(text_block)
+    previous = index_previous_output(existing_out) if args.incremental else {}
+    if args.incremental:
+        logging.info(f"Mode inkremental: {len(previous)} artikel dengan hash di {existing_out}")
+    delta = Counter()
+    seen_urls = set()
+
+    # Artikel hampir-duplikat dibuang sebelum preprocessing; URL-nya disimpan sebagai "aliases" artikel kanonik
+    if args.no_dedup:
+        articles = iter_records(in_file)
+    else:
+        # Inkremental: signature MinHash artikel yang tidak berubah diambil dari run sebelumnya
+        signature_cache = load_signatures() if args.incremental else {}
+        dedup_plan = plan_dedup(iter_records(in_file), threshold=args.dedup_threshold, cache=signature_cache)
+        save_signatures(dedup_plan.signatures)
+        articles = iter_deduplicated(iter_records(in_file), dedup_plan)
+        logging.info(f"Dedup: {dedup_plan.n_duplicates} artikel hampir-duplikat dalam "
+                     f"{len(dedup_plan.aliases)} cluster dibuang (threshold={args.dedup_threshold}, "
+                     f"signature dihitung={dedup_plan.n_computed}/{dedup_plan.n_articles})")
+        if total is not None:
+            total -= dedup_plan.n_duplicates
+
+    def plan():
+        # (artikel, hash, offset record lama yang bisa dipakai ulang atau None)
+        for art in articles:
+            h = content_hash(art)
+            seen_urls.add(art.get("url"))
+            prev = previous.get(art.get("url"))
+            if prev and prev[0] == h:
+                delta["unchanged"] += 1
+                yield art, h, prev[1]
+            else:
+                delta["changed" if prev else "new"] += 1
+                yield art, h, None
+
+    def cleaned_records(old_file):
+        planned, for_tokens = tee(plan())
+        token_stream = preprocess_articles(
+            (art.get("content", "") for art, _, reuse in for_tokens if reuse is None),
+            workers=args.workers,
+        )
+        iterator = enumerate(planned)
+        if tqdm is not None:
+            iterator = tqdm(iterator, total=total, desc="Preprocessing", unit="artikel")
+
+        for idx, (art, h, reuse) in iterator:
+            raw_text = art.get("content", "")
+            if reuse is not None:
+                old_file.seek(reuse)
+                aliases = art.get("aliases")
+                art = json.loads(old_file.readline())
+                art.pop("aliases", None)
+                if aliases:
+                    art["aliases"] = aliases
+                tokens = art.get("tokens", [])
+                if "passages" not in art:
+                    # Record dari versi sebelum ada snippet/passages
+                    tokens, art["passages"] = preprocess_document(raw_text)
+                    art["tokens"] = tokens
+                    art["snippet"] = make_snippet(raw_text)
             else:
-                print(text_block)
+                tokens, passages = next(token_stream)
+                art["tokens"] = tokens
+                art["content_hash"] = h
+                art["snippet"] = make_snippet(raw_text)
+                art["passages"] = passages
+            yield art
+
+            if idx == 0:
+                block_lines = []
+                block_lines.append("="*50)
+                block_lines.append("SEBELUM :")
+                block_lines.append((raw_text[:200] + "...\n") if raw_text else "(kosong)\n")
+                block_lines.append("SESUDAH :")
+                n_per_line = 10
+                pretty_tokens = []
+                pretty_tokens.append("[")
+                for i in range(0, len(tokens), n_per_line):
+                    line = ", ".join(tokens[i:i+n_per_line])
+                    if i + n_per_line < len(tokens):
+                        pretty_tokens.append(line + ",")
+                    else:
+                        pretty_tokens.append(line)
+                pretty_tokens.append("]")
+                block_lines.extend(pretty_tokens)
+                block_lines.append("="*50)
+                text_block = "\n".join(block_lines)
+                if tqdm is not None:
+                    tqdm.write(text_block)
+                else:
+                    print(text_block)
 
-        # Fallback progress jika tqdm tidak ada
-        if tqdm is None and ((idx + 1) % 50 == 0 or (idx + 1) == total):
-            print(f"Progress: {idx+1}/{total} artikel")
+            # Fallback progress jika tqdm tidak ada
+            if tqdm is None and ((idx + 1) % 50 == 0 or (idx + 1) == total):
+                print(f"Progress: {idx+1}/{total} artikel")
 
-    with open(out_file, "w", encoding="utf-8") as f:
-        json.dump(cleaned, f, ensure_ascii=False, indent=2)
+    # Mode inkremental membaca hasil lama sambil menulis → tulis ke file sementara lalu ganti atomik
+    target = out_file + ".tmp" if previous else out_file
+    with (open(existing_out, "rb") if previous else nullcontext()) as old_file:
+        n_cleaned = write_records(target, cleaned_records(old_file))
+    if target != out_file:
+        os.replace(target, out_file)
+    if args.incremental:
+        # URL lama yang tidak muncul lagi di input (tahan terhadap URL duplikat di input)
+        delta["deleted"] = len(previous.keys() - seen_urls)
+        logging.info(
+            f"Delta: baru={delta['new']} berubah={delta['changed']} "
+            f"tetap={delta['unchanged']} dihapus={delta['deleted']}"
+        )
 
     elapsed = perf_counter() - t0
-    logging.info(f"Selesai. Preprocessed {len(cleaned)} artikel → {out_file} (durasi: {elapsed:.2f}s)")
+    rate = n_cleaned / elapsed if elapsed > 0 else 0.0
+    logging.info(f"Selesai. Preprocessed {n_cleaned} artikel → {out_file} (durasi: {elapsed:.2f}s, {rate:.1f} artikel/detik, workers={args.workers})")
+
+    # Simpan kamus stem (+ artefak lexicon) agar query & preprocessing berikutnya cukup lookup
+    tokenizer = get_tokenizer()
+    dict_size = tokenizer.stemmer.save()
+    build_lexicon(stop_words=tokenizer.stop_words)
+    stats = tokenizer.stemmer.stats()
+    logging.info(
+        f"Stem cache: hits={stats['hits']} misses={stats['misses']} "
+        f"hit_rate={stats['hit_rate']:.1%} → {dict_size} kata tersimpan di kamus stem"
+    )
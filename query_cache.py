@@ -0,0 +1,80 @@
+import sys
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+# Cache hasil query: key = (generasi index, token query hasil preprocessing, k, k1, b).
+# Query mentah yang berbeda tetapi menghasilkan token yang sama berbagi satu entri.
+# Nilai yang disimpan hanya ranking (docid, score); metadata tetap diambil dari docstore.
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 300.0
+
+def _ranking_bytes(ranking):
+    """Perkiraan memori satu ranking (list tuple (docid, score))."""
+    size = sys.getsizeof(ranking)
+    for docid, score in ranking:
+        size += sys.getsizeof((docid, score)) + sys.getsizeof(docid) + sys.getsizeof(score)
+    return size
+
+class QueryCache:
+    """
+    LRU + TTL untuk ranking hasil pencarian.
+    Entri paling lama dipakai dibuang saat penuh; entri yang lebih tua dari ttl detik dianggap miss.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (waktu simpan, ranking, bytes)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Ranking untuk key, atau None jika tidak ada / kedaluwarsa."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and monotonic() - entry[0] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, ranking):
+        ranking = [(docid, float(score)) for docid, score in ranking]
+        size = _ranking_bytes(ranking)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (monotonic(), ranking, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+        return ranking
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        """Kosongkan cache (dipanggil saat generasi index berganti)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,155 @@
+import hashlib
+import json
+from pathlib import Path
+
+# File antar-tahap pipeline (JSON Lines: satu artikel per baris)
+ARTICLES_FILE = "data/kompas_nasional_articles.jsonl"
+CLEAN_FILE = "data/kompas_nasional_clean_records.jsonl"
+
+# File format lama (satu JSON array utuh), tetap diterima sebagai input
+LEGACY_ARTICLES_FILE = "data/kompas_nasional_articles.json"
+LEGACY_CLEAN_FILE = "data/kompas_nasional_clean.json"
+
+_READ_CHUNK = 1 << 16
+
+# Field hasil preprocessing / dedup, tidak ikut di-hash
+DERIVED_FIELDS = ("tokens", "content_hash", "snippet", "passages", "aliases")
+
+# Panjang cuplikan (jumlah kata) yang disimpan per artikel
+SNIPPET_WORDS = 40
+
+def make_snippet(text, max_words=SNIPPET_WORDS):
+    """Cuplikan max_words kata pertama dari teks."""
+    if not text:
+        return ""
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return " ".join(words[:max_words]) + "..."
+
+def index_contents(art):
+    """
+    Teks yang diindeks untuk satu artikel: token artikel dulu, lalu judul
+    (generations.DOC_LAYOUT), sehingga posisi term di index = indeks token artikel.
+    """
+    tokens = " ".join(art.get("tokens", []))
+    return f"{tokens} {art.get('title', '')}".strip()
+
+def split_passages(text):
+    """
+    Paragraf artikel (baris yang tidak kosong) sebagai (byte awal, byte akhir, teks),
+    offset dihitung pada `content` dalam UTF-8 agar paragraf bisa dibaca langsung dari docstore.
+    """
+    passages = []
+    if not text:
+        return passages
+    offset = 0
+    for line in text.split("\n"):
+        raw = line.encode("utf-8")
+        paragraph = line.strip()
+        if paragraph:
+            start = offset + len(raw) - len(line.lstrip().encode("utf-8"))
+            passages.append((start, start + len(paragraph.encode("utf-8")), paragraph))
+        offset += len(raw) + 1
+    return passages
+
+def content_hash(article):
+    """Hash artikel mentah (semua field selain hasil preprocessing)."""
+    raw = {k: v for k, v in article.items() if k not in DERIVED_FIELDS}
+    payload = json.dumps(raw, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def resolve_input(path, legacy_path):
+    """Pakai file JSONL bila ada; jika tidak, jatuh ke file JSON lama (bisa saja keduanya tidak ada)."""
+    if Path(path).exists() or not Path(legacy_path).exists():
+        return str(path)
+    return str(legacy_path)
+
+def iter_records(path):
+    """
+    Generator record dari file JSONL.
+    File JSON array lama juga diterima dan dibaca elemen demi elemen,
+    sehingga memori tetap datar untuk kedua format.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(_READ_CHUNK)
+        if head.lstrip().startswith("["):
+            yield from _iter_json_array(f, head)
+            return
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def _iter_json_array(f, buf):
+    decoder = json.JSONDecoder()
+    pos = buf.index("[") + 1
+    eof = False
+    while True:
+        # Lewati spasi & koma di antara elemen
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("JSON array tidak ditutup dengan ']'")
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Elemen terpotong di batas chunk: baca lagi lalu ulangi
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield obj
+        pos = end
+
+def count_records(path):
+    """Jumlah record di file JSONL (hitung baris tanpa parsing); None untuk file JSON lama."""
+    with open(path, "r", encoding="utf-8") as f:
+        if f.read(_READ_CHUNK).lstrip().startswith("["):
+            return None
+        f.seek(0)
+        return sum(1 for line in f if line.strip())
+
+def write_records(path, records, append=False):
+    """
+    Tulis record (iterable/generator) ke file JSONL, satu per baris.
+    Setiap baris langsung di-flush agar tahap berikutnya bisa mulai membaca.
+    append=True menambahkan ke file yang sudah ada (mis. crawl yang dilanjutkan).
+    Return jumlah record yang ditulis.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with open(path, "a" if append else "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            f.flush()
+            n += 1
+    return n
+
+def compact_records(path, key="url"):
+    """
+    Buang record lama yang key-nya muncul lagi di baris berikutnya (versi terakhir yang dipakai).
+    Dua kali baca secara streaming; file hanya ditulis ulang bila ada duplikat.
+    Return jumlah record yang dibuang.
+    """
+    last = {}
+    n = 0
+    for i, rec in enumerate(iter_records(path)):
+        last[rec.get(key)] = i
+        n += 1
+    if len(last) == n:
+        return 0
+    tmp = f"{path}.tmp"
+    write_records(tmp, (rec for i, rec in enumerate(iter_records(path)) if last[rec.get(key)] == i))
+    Path(tmp).replace(path)
+    return n - len(last)
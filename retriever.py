@@ -1,78 +1,364 @@
-from pyserini.search.lucene import LuceneSearcher
 import json
-import pandas as pd
+import os
 from pathlib import Path
-import re
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from nltk.corpus import stopwords
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from time import monotonic, perf_counter
+from tokenizer import get_tokenizer
+from records import CLEAN_FILE, LEGACY_CLEAN_FILE, make_snippet, resolve_input
+from docstore import DOCSTORE_NAME, FIELDS as DOCSTORE_FIELDS, DocStore
+from generations import DOC_LAYOUT, INDEX_ROOT, current_generation, current_index_dir, latest_commit, manifest_layout
+from query_cache import QueryCache
+import metrics
 
 # Define local paths for data and index, consistent with indexer.py
 DATA_DIR = Path("./data")
-INDEX_DIR = Path("./index_bm25")
+INDEX_DIR = INDEX_ROOT
 
-# Path to preprocessed file for metadata lookup
-clean_json_file = "data/kompas_nasional_clean.json"
+# Parameter BM25 (juga bagian dari key cache hasil query)
+BM25_K1 = 0.9
+BM25_B = 0.4
+
+# Backend pencarian: "lucene" (Pyserini, butuh JVM) atau "numpy" (engine BM25 in-process)
+DEFAULT_BACKEND = os.environ.get("IR_BACKEND", "lucene")
+
+# Path to preprocessed file for metadata lookup (JSONL, or the legacy JSON array)
+def clean_records_file():
+    return resolve_input(CLEAN_FILE, LEGACY_CLEAN_FILE)
 
 # ====== Setup preprocessing (sama seperti di preprocessor.py) ======
-factory = StemmerFactory()
-stemmer = factory.create_stemmer()
-stop_words = set(stopwords.words("indonesian"))
-custom_stop = {"baca", "juga", "halaman", "kompas"}
-stop_words = stop_words.union(custom_stop)
+# Stopword & kamus stem dimuat dari artefak lexicon saat query pertama (tokenizer.get_tokenizer);
+# pandas, NumPy (bm25_engine) dan Pyserini/JVM juga baru diimpor saat benar-benar dipakai
 
 def preprocess_query(text):
     """
-    Preprocess query dengan cara yang sama seperti dokumen
+    Preprocess query dengan cara yang sama seperti dokumen (tokenizer.py, mode query):
+    lowercase → hapus angka & simbol → tokenisasi → stopword removal → stemming → gabung spasi
     """
     if not text:
         return ""
-    # 1. lowercase
-    text = text.lower()
-    # 2. hapus angka & simbol
-    text = re.sub(r"[^a-z\s]", " ", text)
-    # 3. tokenisasi
-    tokens = text.split()
-    # 4. stopword removal
-    tokens = [t for t in tokens if t not in stop_words]
-    # 5. stemming
-    tokens = [stemmer.stem(t) for t in tokens]
-    # 6. gabung kembali jadi string
-    return " ".join(tokens)
+    with metrics.span("preprocess"):
+        return get_tokenizer().query(text)
 
-class InformationRetriever:
-    def __init__(self):
+def index_generation(index_dir=INDEX_DIR):
+    """
+    Token generasi indeks: generasi aktif (CURRENT) atau, untuk layout lama, commit Lucene terbaru
+    (segments_N). Hanya berubah saat indexer.py mempublikasikan generasi baru; menjalankan
+    preprocessor.py saja tidak memicu hot-swap.
+    """
+    return current_generation(index_dir) or latest_commit(index_dir)
+
+# Field metadata yang di-hydrate untuk setiap hit
+RESULT_FIELDS = ("title", "date", "author", "url", "content")
+# Field untuk satu halaman hasil di UI: cuplikan saja, tanpa konten penuh
+PAGE_FIELDS = ("title", "date", "author", "url", "snippet")
+# Kedalaman ranking yang disimpan untuk paginasi
+MAX_DEPTH = 1000
+
+# Handle ringan satu hasil: posisi, docid, skor (metadata diambil saat halaman dirender)
+Hit = namedtuple("Hit", ["rank", "docid", "score"])
+
+def _warn_if_stale(path, source):
+    """
+    Artefak generasi (engine, docstore) dibangun indexer.py dan tidak pernah ditulis ulang saat
+    serving; bila hasil preprocessing lebih baru, cukup beri peringatan (index belum diperbarui).
+    """
+    path, source = Path(path), Path(source)
+    if source.exists() and path.stat().st_mtime < source.stat().st_mtime:
+        print(f"⚠️  {path} lebih lama dari {source}; jalankan `python indexer.py --update` untuk generasi baru.")
+
+class SearchBackend:
+    """
+    Antarmuka backend BM25 untuk satu generasi index.
+    search() → list (docid, skor) terurut; batch_search() → {qid: list (docid, skor)}.
+    """
+    name = None
+    # Pseudo-relevance feedback RM3 (butuh docvector di index)
+    supports_rm3 = False
+    # Parameter ranking yang sedang aktif, ikut kunci cache query: (k1, b, parameter RM3 atau None)
+    params = (BM25_K1, BM25_B, None)
+
+    def search(self, query, k):
+        raise NotImplementedError
+
+    def batch_search(self, queries, qids, k, threads):
+        return {qid: self.search(q, k) for q, qid in zip(queries, qids)}
+
+    def set_bm25(self, k1, b):
+        raise NotImplementedError
+
+    def set_rm3(self, enabled, fb_terms=10, fb_docs=10, original_query_weight=0.5):
+        if enabled:
+            raise NotImplementedError(f"Backend {self.name} tidak mendukung RM3")
+
+    def close(self):
+        pass
+
+class LuceneBackend(SearchBackend):
+    """LuceneSearcher Pyserini atas index Lucene generasi ini."""
+    name = "lucene"
+    supports_rm3 = True
+
+    def __init__(self, index_dir, k1=BM25_K1, b=BM25_B):
+        if not any(Path(index_dir).glob("segments_*")):
+            raise FileNotFoundError(f"Index directory '{index_dir}' not found. Please run indexer.py first.")
+        from pyserini.search.lucene import LuceneSearcher
+        self.searcher = LuceneSearcher(str(index_dir))
+        self.searcher.set_bm25(k1=k1, b=b)
+        self.params = (k1, b, None)
+
+    def search(self, query, k):
+        return [(hit.docid, hit.score) for hit in self.searcher.search(query, k=k)]
+
+    def batch_search(self, queries, qids, k, threads):
+        hits = self.searcher.batch_search(queries, qids, k=k, threads=threads)
+        return {qid: [(hit.docid, hit.score) for hit in hits.get(qid, [])] for qid in qids}
+
+    def set_bm25(self, k1, b):
+        self.searcher.set_bm25(k1=k1, b=b)
+        self.params = (k1, b, self.params[2])
+
+    def set_rm3(self, enabled, fb_terms=10, fb_docs=10, original_query_weight=0.5):
+        if enabled:
+            self.searcher.set_rm3(fb_terms=fb_terms, fb_docs=fb_docs, original_query_weight=original_query_weight)
+            self.params = self.params[:2] + ((fb_terms, fb_docs, original_query_weight),)
+        else:
+            self.searcher.unset_rm3()
+            self.params = self.params[:2] + (None,)
+
+    def close(self):
+        self.searcher.close()
+
+class NumpyBackend(SearchBackend):
+    """
+    Engine BM25 in-process (bm25_engine.py), tanpa JVM.
+    File engine dibangun oleh indexer.py di setiap generasi (bersama index Lucene & docstore).
+    """
+    name = "numpy"
+
+    def __init__(self, index_dir, k1=BM25_K1, b=BM25_B):
+        from bm25_engine import ENGINE_NAME, BM25Engine
+        path = Path(index_dir) / ENGINE_NAME
+        if not path.exists():
+            raise FileNotFoundError(f"Engine BM25 '{path}' not found. Please run indexer.py (or indexer.py --update) first.")
+        _warn_if_stale(path, clean_records_file())
+        self.engine = BM25Engine(path, k1=k1, b=b)
+        self.params = (k1, b, None)
+
+    def search(self, query, k):
+        return self.engine.search(query, k)
+
+    def batch_search(self, queries, qids, k, threads):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            rankings = pool.map(lambda q: self.engine.search(q, k), queries)
+            return dict(zip(qids, rankings))
+
+    def set_bm25(self, k1, b):
+        self.engine.set_bm25(k1, b)
+        self.params = (k1, b, None)
+
+BACKENDS = {backend.name: backend for backend in (LuceneBackend, NumpyBackend)}
+
+class IndexGeneration:
+    """
+    Satu generasi index yang sedang terbuka (searcher + docstore metadata).
+    Menghitung query yang sedang berjalan agar generasi lama baru ditutup
+    setelah semua query-nya selesai.
+    """
+
+    def __init__(self, generation, index_dir, backend=DEFAULT_BACKEND):
+        self.generation = generation
+        self.index_dir = Path(index_dir)
+        self.backend = backend
         self.searcher = None
         self.meta_lookup = {}
-        self._initialize_retriever()
-
-    def _initialize_retriever(self):
-        if not INDEX_DIR.exists():
-            print(f"Error: Index directory '{INDEX_DIR}' not found. Please run indexer.py first.")
-            return
+        self.layout = None
+        self._index_reader = None
+        self._active = 0
+        self._retired = False
+        self._lock = threading.Lock()
 
+    def open(self):
         try:
-            self.searcher = LuceneSearcher(str(INDEX_DIR))
-            self.searcher.set_bm25(k1=0.9, b=0.4)
-            print(f"✅ Pyserini searcher initialized with index: {INDEX_DIR}")
+            self.searcher = BACKENDS[self.backend](self.index_dir)
+            print(f"✅ Backend {self.backend} initialized with index: {self.index_dir}")
         except Exception as e:
-            print(f"Error initializing Pyserini searcher: {e}")
+            print(f"Error initializing {self.backend} backend: {e}")
             self.searcher = None
-            return
+            return self
 
-        # Load original data for metadata (title, date, url)
-        clean_json_path = clean_json_file
-        if not Path(clean_json_path).exists():
-            print(f"Warning: Metadata file '{clean_json_path}' not found. Search results will have limited metadata.")
-            return
+        # Metadata (title, date, url, ...) dari docstore mmap milik generasi ini. Generasi yang sudah
+        # dipublikasikan tidak diubah: docstore yang hilang/lama hanya diberi peringatan, dan
+        # `python indexer.py --update` membangun generasi baru lengkap dengan docstore terbaru.
+        docstore_path = self.index_dir / DOCSTORE_NAME
+        if not docstore_path.exists():
+            print(f"Warning: Docstore '{docstore_path}' not found (run indexer.py --update). "
+                  "Search results will have limited metadata.")
+            return self
+        _warn_if_stale(docstore_path, clean_records_file())
 
-        with open(clean_json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        self.meta_lookup = {art.get("url", str(idx)): art for idx, art in enumerate(data)}
+        self.meta_lookup = DocStore(docstore_path)
+        if self.meta_lookup.fields != DOCSTORE_FIELDS:
+            missing = [f for f in DOCSTORE_FIELDS if f not in self.meta_lookup.fields]
+            print(f"⚠️  Docstore versi lama di {docstore_path} (tanpa {', '.join(missing) or '-'}); "
+                  "jalankan `python indexer.py --update`.")
         print(f"✅ Metadata loaded for {len(self.meta_lookup)} articles.")
+        self.layout = manifest_layout(self.index_dir)
+        return self
+
+    def index_reader(self):
+        """
+        IndexReader Pyserini (dibuka saat pertama dipakai) untuk membaca posisi term.
+        None jika layout dokumen index ini tidak menyimpan token di awal `contents`.
+        """
+        if self.layout != DOC_LAYOUT or not isinstance(self.searcher, LuceneBackend):
+            return None
+        with self._lock:
+            if self._index_reader is None:
+                from pyserini.index.lucene import IndexReader
+                self._index_reader = IndexReader(str(self.index_dir))
+            return self._index_reader
+
+    def acquire(self):
+        with self._lock:
+            self._active += 1
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            drained = self._retired and self._active == 0
+        if drained:
+            self.close()
+
+    def retire(self):
+        """Tandai generasi ini digantikan; ditutup segera setelah query terakhirnya selesai."""
+        with self._lock:
+            self._retired = True
+            drained = self._active == 0
+        if drained:
+            self.close()
+
+    def close(self):
+        if self.searcher is not None:
+            self.searcher.close()
+            self.searcher = None
+        if isinstance(self.meta_lookup, DocStore):
+            self.meta_lookup.close()
+            self.meta_lookup = {}
+        if self._index_reader is not None:
+            self._index_reader.reader.close()
+            self._index_reader = None
+
+class InformationRetriever:
+    # Seberapa sering (detik) search() memeriksa apakah ada generasi index baru
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, backend=None):
+        self.backend = backend or DEFAULT_BACKEND
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._current = None
+        self._last_check = monotonic()
+        self.load_seconds = 0.0
+        self.cache = QueryCache()
+        self.refresh(force=True)
+
+    @property
+    def generation(self):
+        return self._current.generation
+
+    @property
+    def searcher(self):
+        return self._current.searcher
+
+    @property
+    def meta_lookup(self):
+        return self._current.meta_lookup
+
+    def refresh(self, force=False):
+        """
+        Hot-swap ke generasi index terbaru jika berubah (atau force=True).
+        Generasi lama tetap hidup sampai query yang sedang berjalan selesai.
+        Return True jika terjadi swap.
+        """
+        with self._refresh_lock:
+            generation = index_generation()
+            if not force and self._current is not None and generation == self._current.generation:
+                return False
+
+            t0 = perf_counter()
+            fresh = IndexGeneration(generation, current_index_dir(INDEX_DIR), self.backend).open()
+            if fresh.searcher is None and self._current is not None and self._current.searcher is not None:
+                print(f"⚠️  Generasi {generation} gagal dibuka; tetap memakai {self._current.generation}.")
+                return False
+            self.load_seconds = perf_counter() - t0
+
+            with self._lock:
+                previous, self._current = self._current, fresh
+                # Ranking lama tidak berlaku lagi untuk generasi baru
+                self.cache.clear()
+            if previous is not None:
+                previous.retire()
+            return True
+
+    def _maybe_refresh(self):
+        now = monotonic()
+        if now - self._last_check >= self.REFRESH_INTERVAL:
+            self._last_check = now
+            self.refresh()
+
+    @contextmanager
+    def _use_generation(self):
+        """Pinjam generasi aktif selama satu query (tidak akan ditutup di tengah jalan)."""
+        self._maybe_refresh()
+        with self._lock:
+            gen = self._current
+            gen.acquire()
+        try:
+            yield gen
+        finally:
+            gen.release()
 
     def search(self, query, k=20, preprocess=True):
-        if not self.searcher:
+        with metrics.request("search"), self._use_generation() as gen:
+            return self._hydrate(gen, self._ranking(gen, query, k, preprocess))
+
+    def rank(self, query, depth=MAX_DEPTH, preprocess=True):
+        """Ranking sampai `depth` sebagai list Hit (tanpa metadata)."""
+        with self._use_generation() as gen:
+            ranking = self._ranking(gen, query, depth, preprocess)
+        return [Hit(i, docid, score) for i, (docid, score) in enumerate(ranking)]
+
+    def search_page(self, query, offset=0, limit=10, depth=MAX_DEPTH, fields=PAGE_FIELDS,
+                    preprocess=True, query_biased=False):
+        """
+        Satu halaman hasil: (total, hasil[offset:offset+limit]).
+        Ranking sampai `depth` dihitung sekali lalu diambil dari cache untuk halaman berikutnya;
+        hanya dokumen di halaman ini yang di-hydrate dari docstore.
+        query_biased=True memilih cuplikan dari paragraf dengan term query terbanyak
+        (berdasarkan posisi term di index), bukan 40 kata pertama.
+        """
+        with metrics.request("search", offset=offset, limit=limit):
+            if preprocess:
+                query = preprocess_query(query)
+            with self._use_generation() as gen:
+                ranking = self._ranking(gen, query, depth, preprocess=False)
+                page = ranking[offset:offset + limit]
+                query_terms = None
+                if query_biased and page and gen.index_reader() is not None:
+                    query_terms = set(gen.index_reader().analyze(query))
+                results = self._hydrate(gen, page, fields, query_terms)
+            for i, result in enumerate(results):
+                result["rank"] = offset + i
+            metrics.annotate(total=len(ranking), results=len(results))
+            return len(ranking), results
+
+    def _ranking(self, gen, query, k, preprocess):
+        """List (docid, score) untuk query, dari cache bila ada."""
+        if not gen.searcher:
             print("Retriever not initialized. Cannot perform search.")
             return []
 
@@ -82,26 +368,164 @@ class InformationRetriever:
         
         if not query.strip():
             print("⚠️  Query kosong setelah preprocessing!")
+            metrics.incr("ir_empty_queries_total", help_text="Query kosong setelah preprocessing")
             return []
 
-        hits = self.searcher.search(query, k=k)
-        results = []
-        for hit in hits:
-            docid = hit.docid
-            score = hit.score
-            meta = self.meta_lookup.get(docid, {})
-            content = meta.get("content", "")
-            results.append({
-                "score": score,
-                "title": meta.get("title", "[NO TITLE]"),
-                "date": meta.get("date", ""),
-                "author": meta.get("author", ""),
-                "url": meta.get("url", docid),
-                "content": content
-            })
+        key = self._cache_key(gen, query, k)
+        ranking = self.cache.get(key)
+        cache_result = "hit" if ranking is not None else "miss"
+        metrics.incr("ir_query_cache_total", help_text="Lookup cache ranking", result=cache_result)
+        metrics.annotate(cache=cache_result)
+        if ranking is None:
+            with metrics.span("search"):
+                ranking = self.cache.put(key, gen.searcher.search(query, k))
+        return ranking
+
+    @staticmethod
+    def _cache_key(gen, query, k):
+        # Token dinormalisasi (spasi) agar query yang stem-nya sama berbagi entri; parameter diambil
+        # dari backend (bukan konstanta modul) agar set_bm25()/set_rm3() tidak memakai ranking lama
+        return (gen.generation, " ".join(query.split()), k, gen.searcher.params)
+
+    def hydrate(self, hits, fields=PAGE_FIELDS):
+        """Metadata untuk sejumlah Hit (mis. satu halaman dari rank())."""
+        with self._use_generation() as gen:
+            results = self._hydrate(gen, [(hit.docid, hit.score) for hit in hits], fields)
+        for hit, result in zip(hits, results):
+            result["rank"] = hit.rank
         return results
 
+    def _hydrate(self, gen, ranking, fields=RESULT_FIELDS, query_terms=None):
+        # `snippet` diambil dari docstore (hasil preprocessing); konten penuh hanya ikut bila diminta
+        store_fields = getattr(gen.meta_lookup, "fields", ())
+        wanted = [f for f in fields if f != "snippet"]
+        if "snippet" in fields:
+            if "snippet" in store_fields:
+                wanted.append("snippet")
+            elif "content" not in wanted:
+                wanted.append("content")
+            if query_terms:
+                wanted.append("passages")
+        with metrics.span("hydrate"):
+            return [self._hydrate_one(gen, docid, score, fields, wanted, query_terms) for docid, score in ranking]
+
+    def _hydrate_one(self, gen, docid, score, fields, wanted, query_terms):
+        meta = gen.meta_lookup.get(docid, {}, fields=wanted) if gen.meta_lookup else {}
+        result = {"score": score}
+        for field in fields:
+            if field == "snippet":
+                snippet = None
+                if query_terms:
+                    snippet = self._passage_snippet(gen, docid, query_terms, meta.get("passages"))
+                result["snippet"] = snippet or meta.get("snippet") or make_snippet(meta.get("content", ""))
+            elif field == "title":
+                result["title"] = meta.get("title", "[NO TITLE]")
+            elif field == "url":
+                result["url"] = meta.get("url", docid)
+            else:
+                result[field] = meta.get(field, "")
+        return result
+
+    @staticmethod
+    def _passage_snippet(gen, docid, query_terms, passages):
+        """
+        Cuplikan dari paragraf dengan term query terbanyak (term berbeda, lalu total kemunculan).
+        Posisi term dibaca dari index (-storePositions), dipetakan ke paragraf lewat
+        posisi token awal/akhir yang disimpan saat preprocessing; hanya paragraf terpilih
+        yang dibaca dari docstore. None jika tidak bisa.
+        """
+        if not passages:
+            return None
+        passages = json.loads(passages)
+        positions = gen.index_reader().get_term_positions(docid)
+        if not passages or not positions:
+            return None
+        starts = [passage[0] for passage in passages]
+        matched = [set() for _ in passages]
+        counts = [0] * len(passages)
+        for term in query_terms:
+            for pos in positions.get(term, ()):
+                i = bisect_right(starts, pos) - 1
+                # Posisi setelah token artikel adalah judul → diabaikan
+                if i >= 0 and pos < passages[i][1]:
+                    matched[i].add(term)
+                    counts[i] += 1
+        best = max(range(len(passages)), key=lambda i: (len(matched[i]), counts[i], -i))
+        if counts[best] == 0:
+            return None
+        _, _, byte_start, byte_end = passages[best]
+        return make_snippet(gen.meta_lookup.slice(docid, "content", byte_start, byte_end))
+
+    def batch_search(self, queries, k=20, threads=None, preprocess=True):
+        """
+        Jalankan banyak query sekaligus lewat batch search Pyserini (paralel per thread).
+        queries: dict {qid: teks} atau list teks (qid = indeks sebagai string).
+        Return dict {qid: hasil} dengan urutan qid sama seperti input;
+        query yang kosong setelah preprocessing mendapat list kosong.
+        """
+        with self._use_generation() as gen:
+            rankings = self._batch_rankings(gen, queries, k, threads, preprocess)
+            return {qid: self._hydrate(gen, ranking) for qid, ranking in rankings.items()}
+
+    def batch_rank(self, queries, depth=MAX_DEPTH, threads=None, preprocess=True):
+        """Seperti batch_search, tetapi hanya ranking (list Hit per qid) tanpa metadata."""
+        with self._use_generation() as gen:
+            rankings = self._batch_rankings(gen, queries, depth, threads, preprocess)
+        return {qid: [Hit(i, docid, score) for i, (docid, score) in enumerate(ranking)]
+                for qid, ranking in rankings.items()}
+
+    def _batch_rankings(self, gen, queries, k, threads, preprocess):
+        """{qid: list (docid, score)}; ranking yang sudah ada di cache tidak dihitung ulang."""
+        if not isinstance(queries, dict):
+            queries = {str(i): q for i, q in enumerate(queries)}
+        threads = threads or os.cpu_count() or 1
+
+        if not gen.searcher:
+            print("Retriever not initialized. Cannot perform search.")
+            return {qid: [] for qid in queries}
+
+        # Preprocessing semua query dalam satu kali jalan
+        texts = {qid: preprocess_query(q) if preprocess else q for qid, q in queries.items()}
+        qids = [qid for qid, text in texts.items() if text.strip()]
+        if len(qids) < len(texts):
+            print(f"⚠️  {len(texts) - len(qids)} query kosong setelah preprocessing!")
+
+        rankings = {}
+        for qid in qids:
+            cached = self.cache.get(self._cache_key(gen, texts[qid], k))
+            if cached is not None:
+                rankings[qid] = cached
+        misses = [qid for qid in qids if qid not in rankings]
+        if misses:
+            with metrics.span("batch_search"):
+                hits = gen.searcher.batch_search([texts[qid] for qid in misses], misses, k=k, threads=threads)
+            for qid in misses:
+                rankings[qid] = self.cache.put(self._cache_key(gen, texts[qid], k), hits.get(qid, []))
+        return {qid: rankings.get(qid, []) for qid in queries}
+
+# ====== Retriever bersama (satu per proses) ======
+_shared_retriever = None
+_shared_lock = threading.Lock()
+
+def get_retriever(reload=False):
+    """
+    Kembalikan InformationRetriever bersama untuk seluruh proses.
+    Dibuat saat pertama dipakai, lalu dipakai ulang oleh semua sesi/rerun.
+    Generasi index baru di-hot-swap otomatis; reload=True memaksa membuka ulang sekarang.
+    """
+    global _shared_retriever
+    with _shared_lock:
+        if _shared_retriever is None:
+            _shared_retriever = InformationRetriever()
+        elif reload:
+            _shared_retriever.refresh(force=True)
+        else:
+            _shared_retriever._maybe_refresh()
+        return _shared_retriever
+
 if __name__ == "__main__":
+    import pandas as pd
+
     # Example usage:
     retriever = InformationRetriever()
 
@@ -113,11 +537,12 @@ if __name__ == "__main__":
         "pemilu presiden"
     ]
 
-    for q in queries:
+    batch_results = retriever.batch_search(queries)
+
+    for q, results in zip(queries, batch_results.values()):
         print("="*80)
         print(f"Query: {q}")
         print("="*80)
-        results = retriever.search(q, preprocess=True)  # Aktifkan preprocessing
 
         print(f"Jumlah artikel relevan: {len(results)}\n")
 
@@ -127,3 +552,6 @@ if __name__ == "__main__":
         else:
             print("Tidak ada artikel yang ditemukan untuk kueri ini.")
         print("\n")
+
+    print(f"Stem cache: {get_tokenizer().stemmer.stats()}")
+    print(f"Query cache: {retriever.cache.stats()}")
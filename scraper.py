@@ -1,17 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import argparse
 import csv
+import hashlib
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 from urllib.parse import urljoin, urlparse
-import urllib.robotparser
 from tqdm.auto import tqdm 
-import random
 import os
 import datetime  
-import shutil 
-
-BASE = "https://indeks.kompas.com"
+from crawl_state import CRAWL_STATE_FILE, CrawlState
+from records import (ARTICLES_FILE, LEGACY_ARTICLES_FILE, compact_records, content_hash, count_records, iter_records,
+                     resolve_input, write_records)
+from fetcher import DEFAULT_PER_HOST, DEFAULT_RATE, DEFAULT_WORKERS, Fetcher
+from html_parsers import DEFAULT_PARSER, PARSERS, get_parser
+
+# Bisa diarahkan ke server lokal (mis. KOMPAS_BASE_URL=http://127.0.0.1:8000) untuk uji coba
+BASE = os.environ.get("KOMPAS_BASE_URL", "https://indeks.kompas.com")
 CATEGORY = "nasional"
 
 HEADERS = {
@@ -21,254 +26,290 @@ HEADERS = {
     "Referer": "https://indeks.kompas.com/",
 }
 
-session = requests.Session()
-session.headers.update(HEADERS)
+CSV_FIELDS = ["url","title","date","author","content","tags"]
 
-def get_robot_parser(base_url):
-    robots_url = urljoin(base_url, "/robots.txt")
-    rp = urllib.robotparser.RobotFileParser()
-    rp.set_url(robots_url)
-    try:
-        rp.read()
-    except Exception as e:
-        print(f"Gagal baca robots.txt dari {robots_url}: {e}")
-    can_fetch = rp.can_fetch(HEADERS["User-Agent"], urljoin(BASE, f"?site={CATEGORY}"))
-    print("Robots allow fetch category?", can_fetch)
-    return rp
-
-def safe_get(url, retries=3, backoff=1.5):
-    for i in range(retries):
-        try:
-            r = session.get(url, timeout=15)
-            if r.status_code == 200:
-                return r
-            else:
-                time.sleep(backoff * (i+1) + random.random())
-        except requests.RequestException:
-            time.sleep(backoff * (i+1) + random.random())
-    return None
-
-def extract_article_links_from_listpage(html, base=BASE):
-    soup = BeautifulSoup(html, "html.parser")
-    links = set()
+_fetcher = None
 
-    # Selector fokus ke daftar artikel indeks (hindari header/sidebar/trending)
-    candidates = []
-    selectors = [
-        "div.article__list a.article__link",
-        "h3.article__title a",
-        "div.article__box a.article__link",
-    ]
-    for sel in selectors:
-        candidates.extend(soup.select(sel))
-
-    # Fallback
-    if not candidates:
-        candidates = soup.find_all("a", href=True)
-
-    for a in candidates:
-        href = a.get("href", "")
+def get_fetcher():
+    """Fetcher bersama (dibuat saat pertama dipakai) untuk pemanggil yang tidak membawa fetcher sendiri."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = Fetcher(headers=HEADERS)
+    return _fetcher
+
+def save_html(directory, kind, url, html):
+    """Simpan HTML mentah sebagai fixture (<kind>-<sha1 url>.html) untuk benchmark parser."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{kind}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write(html)
+
+def extract_article_links_from_listpage(html, base=BASE, parser=None):
+    links = set()
+    # Kandidat dari daftar artikel indeks (hindari header/sidebar/trending), lihat html_parsers.LISTPAGE_SELECTORS
+    for href in get_parser(parser).listpage_hrefs(html):
         if not href:
             continue
         full = urljoin(base, href) if href.startswith("/") else href
         parsed = urlparse(full)
 
-        # Ambil hanya artikel kompas (semua subdomain) dengan pola /read/
-        if parsed.netloc.endswith("kompas.com") and "/read/" in parsed.path:
+        # Ambil hanya artikel kompas (semua subdomain, atau host base itu sendiri) dengan pola /read/
+        same_host = parsed.netloc == urlparse(base).netloc
+        if (parsed.netloc.endswith("kompas.com") or same_host) and "/read/" in parsed.path:
             if any(bad in full for bad in ["komentar", "copy", "/tag/"]):
                 continue
             links.add(full.split("?")[0])
 
     return list(links)
 
-def parse_article(html, url):
-    soup = BeautifulSoup(html, "html.parser")
-
-    title = None
-    if soup.find("meta", property="og:title"):
-        title = soup.find("meta", property="og:title").get("content", None)
-    if not title and soup.title:
-        title = soup.title.get_text().strip()
-
-    date = None
-    meta_date = soup.find("meta", {"property":"article:published_time"}) \
-                or soup.find("meta", {"name":"pubdate"}) \
-                or soup.find("meta", {"name":"date"})
-    if meta_date:
-        date = meta_date.get("content", None)
-    if not date:
-        time_tag = soup.find("time")
-        if time_tag and time_tag.get("datetime"):
-            date = time_tag.get("datetime")
-
-    author = None
-    meta_author = soup.find("meta", {"name":"author"}) \
-                  or soup.find("meta", {"property":"article:author"})
-    if meta_author:
-        author = meta_author.get("content", None)
-
-    def extract_content(soup_obj):
-        content = []
-        article_el = soup_obj.find('article') or soup_obj.find('div', class_='read__content')
-        if article_el:
-            for p in article_el.find_all("p"):
-                txt = p.get_text(strip=True)
-                if txt:
-                    content.append(txt)
-        else:
-            for p in soup_obj.find_all("p"):
-                txt = p.get_text(strip=True)
-                if txt and len(txt) > 50:
-                    content.append(txt)
-        return content
-
-    content = extract_content(soup)
-
-    pagination = soup.find("div", class_="paging__wrap")
-    if pagination:
-        page_links = []
-        for a in pagination.find_all("a", href=True):
-            if "page" in a["href"]:
-                page_links.append(urljoin(url, a["href"]))
-        page_links = sorted(set(page_links))
-        for link in page_links:
-            r = safe_get(link)
+def parse_article(html, url, fetcher=None, parser=None):
+    backend = get_parser(parser)
+    fields = backend.article(html)
+    content = fields["paragraphs"]
+
+    if fields["page_hrefs"]:
+        page_links = sorted(set(urljoin(url, href) for href in fields["page_hrefs"] if "page" in href))
+        # Halaman lanjutan diambil bersamaan; isinya tetap digabung sesuai urutan halaman
+        for r in (fetcher or get_fetcher()).get_many(page_links):
             if r:
-                soup_page = BeautifulSoup(r.text, "html.parser")
-                content.extend(extract_content(soup_page))
-                time.sleep(1 + random.random()*0.8)
-
-    tags = []
-    tag_container = soup.find('div', class_='tags') or \
-                    soup.find('ul', class_='tags') or \
-                    soup.find('div', class_='tag-cloud')
-    if tag_container:
-        for a in tag_container.find_all('a', href=True):
-            tags.append(a.get_text(strip=True))
+                content.extend(backend.paragraphs(r.text))
 
     return {
         "url": url,
-        "title": title,
-        "date": date,
-        "author": author,
+        "title": fields["title"],
+        "date": fields["date"],
+        "author": fields["author"],
         "content": "\n\n".join(content).strip(),
-        "tags": tags
+        "tags": fields["tags"]
     }
 
 def scrape_articles(base_url, category, max_articles=400, max_pages_per_day=8, max_days=60, start_date=None):
-    rp = get_robot_parser(base_url)
-
-    collected_links = []
-    seen_links = set()
-
-    # tanggal mulai: hari ini atau dari argumen
-    cur_date = start_date or datetime.date.today()
-    days_scanned = 0
-
-    # Progress bar: hari dan link unik
-    days_pbar = tqdm(total=max_days, desc="Days scanned", dynamic_ncols=True, position=0, leave=True)
-    links_pbar = tqdm(total=max_articles, desc="Unique links", dynamic_ncols=True, position=1, leave=True)
-
-    while len(collected_links) < max_articles and days_scanned < max_days:
-        page = 1
-        no_new_on_day = 0
-        # loop halaman untuk tanggal cur_date
-        while len(collected_links) < max_articles and page <= max_pages_per_day:
-            list_url = f"{base_url}/?site={category}&date={cur_date.strftime('%Y-%m-%d')}&page={page}"
-            res = safe_get(list_url)
-            if not res:
-                tqdm.write(f"Gagal ambil list page: {list_url}")
-                break
-
-            links = extract_article_links_from_listpage(res.text, base=base_url)
-            new_links = [l for l in links if l not in seen_links]
-
-            if new_links:
-                for l in new_links:
-                    seen_links.add(l)
-                    collected_links.append(l)
-                links_pbar.update(len(new_links))
-                links_pbar.set_postfix(date=str(cur_date), page=page, new=len(new_links), total=len(collected_links))
-                no_new_on_day = 0
-            else:
-                no_new_on_day += 1
+    return list(iter_scrape_articles(base_url, category, max_articles, max_pages_per_day, max_days, start_date))
+
+def fetch_article(fetcher, url, etag=None, last_modified=None, parser=None, html_dir=None):
+    """
+    Ambil & parse satu artikel (dipanggil dari thread pool).
+    Return (artikel atau None, Response atau None); Response 304 = tidak berubah sejak fetch terakhir.
+    """
+    r = fetcher.get(url, etag=etag, last_modified=last_modified)
+    if not r:
+        tqdm.write(f"Gagal ambil artikel: {url}")
+        return None, None
+    if r.status_code == 304:
+        return None, r
+    if html_dir:
+        save_html(html_dir, "article", url, r.text)
+    return parse_article(r.text, url, fetcher, parser), r
+
+def iter_scrape_articles(base_url, category, max_articles=400, max_pages_per_day=8, max_days=60, start_date=None,
+                         fetcher=None, workers=DEFAULT_WORKERS, state=None, refresh=False, parser=None, html_dir=None):
+    """
+    Seperti scrape_articles, tetapi menghasilkan artikel satu per satu begitu selesai di-parse.
+    Penemuan link (halaman indeks) dan pengambilan artikel berjalan tumpang-tindih:
+    setiap link baru langsung dikirim ke thread pool, sementara halaman indeks berikutnya diambil.
+    Artikel dihasilkan sesuai urutan link ditemukan.
+
+    state (CrawlState) menyimpan frontier, URL yang sudah diambil, dan posisi penemuan link:
+    crawl yang terputus dilanjutkan dari posisi terakhir, URL yang sudah diambil dilewati.
+    refresh=True mengambil ulang artikel lama dengan conditional request (ETag / Last-Modified)
+    dan hanya menghasilkan artikel yang isinya berubah.
+    parser memilih backend html_parsers; html_dir menyimpan HTML mentah sebagai fixture benchmark.
+    """
+    fetcher = fetcher or get_fetcher()
+    state = state or CrawlState(":memory:")
+    print("Robots allow fetch category?", fetcher.allowed(urljoin(base_url, f"?site={category}")))
+
+    cursor = state.get_meta("cursor")
+    if cursor is None or cursor["complete"]:
+        # crawl baru (tanggal mulai: hari ini atau dari argumen); URL yang pernah diambil tetap dilewati
+        cursor = {"date": (start_date or datetime.date.today()).isoformat(), "page": 1, "days": 0,
+                  "found": 0, "complete": False}
+        state.set_meta("cursor", cursor)
+    else:
+        tqdm.write(f"Melanjutkan crawl: tanggal {cursor['date']} halaman {cursor['page']}, "
+                   f"{cursor['found']} link sudah ditemukan")
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="article")
+    pending = deque()  # (url, future) sesuai urutan penemuan
+
+    def submit(url, etag=None, last_modified=None):
+        pending.append((url, pool.submit(fetch_article, fetcher, url, etag, last_modified, parser, html_dir)))
+
+    if refresh:
+        for url, etag, last_modified in state.fetched():
+            submit(url, etag, last_modified)
+    # Frontier dari run sebelumnya (pending / gagal) diambil lebih dulu
+    for url in state.frontier():
+        submit(url)
+
+    # Progress bar: hari, link unik, artikel selesai
+    days_pbar = tqdm(total=max_days, initial=cursor["days"], desc="Days scanned", dynamic_ncols=True, position=0, leave=True)
+    links_pbar = tqdm(total=max_articles, initial=cursor["found"], desc="Unique links", dynamic_ncols=True, position=1, leave=True)
+    articles_pbar = tqdm(total=len(pending) + max_articles - cursor["found"], desc="Fetching Articles",
+                         dynamic_ncols=True, position=2, leave=True)
+
+    def drain(block):
+        """Teruskan artikel yang sudah selesai (atau semuanya bila block); state dicatat setelah artikel ditulis."""
+        while pending and (block or pending[0][1].done()):
+            url, future = pending.popleft()
+            article, response = future.result()
+            articles_pbar.update(1)
+            digest = None
+            if article:
+                digest = content_hash(article)
+                if digest != state.content_hash(url):
+                    yield article
+            state.record_fetch(url, response, digest)
+
+    try:
+        cur_date = datetime.date.fromisoformat(cursor["date"])
+        while cursor["found"] < max_articles and cursor["days"] < max_days:
+            no_new_on_day = 0
+            # loop halaman untuk tanggal cur_date
+            while cursor["found"] < max_articles and cursor["page"] <= max_pages_per_day:
+                page = cursor["page"]
+                list_url = f"{base_url}/?site={category}&date={cur_date.strftime('%Y-%m-%d')}&page={page}"
+                res = fetcher.get(list_url)
+                if not res:
+                    tqdm.write(f"Gagal ambil list page: {list_url}")
+                    break
+
+                if html_dir:
+                    save_html(html_dir, "list", list_url, res.text)
+                links = extract_article_links_from_listpage(res.text, base=base_url, parser=parser)
+                candidates = [l for l in links if not state.is_seen(l)][:max_articles - cursor["found"]]
+                new_links = state.add_links(candidates)
+
+                if new_links:
+                    for l in new_links:
+                        submit(l)
+                    cursor["found"] += len(new_links)
+                    links_pbar.update(len(new_links))
+                    links_pbar.set_postfix(date=str(cur_date), page=page, new=len(new_links), total=cursor["found"])
+                    no_new_on_day = 0
+                else:
+                    no_new_on_day += 1
+                cursor["page"] = page + 1
+                state.set_meta("cursor", cursor)
+
+                # Artikel yang sudah selesai langsung diteruskan sambil penemuan link berlanjut
+                yield from drain(block=False)
                 # jika 2 halaman berturut-turut tidak ada link baru, pindah hari
                 if no_new_on_day >= 2:
                     break
 
-            page += 1
-            time.sleep(0.6 + random.random()*0.8)
-
-        days_scanned += 1
-        days_pbar.update(1)
-        # mundur 1 hari
-        cur_date = cur_date - datetime.timedelta(days=1)
-
-    days_pbar.close()
-    links_pbar.close()
-    print(f"Total links collected: {len(collected_links)}")
-
-    # Fetch artikel
-    articles = []
-    total_to_fetch = min(len(collected_links), max_articles)
-    for url in tqdm(collected_links[:total_to_fetch], desc="Fetching Articles", dynamic_ncols=True, leave=True):
-        # periksa robots (opsional; robots dari host indeks mungkin tidak merefleksikan subdomain lain)
-        try:
-            if not rp.can_fetch(HEADERS["User-Agent"], url):
-                tqdm.write(f"robots disallow: {url}")
-                continue
-        except Exception:
-            pass
-
-        r = safe_get(url)
-        if not r:
-            tqdm.write(f"Gagal ambil artikel: {url}")
-            continue
-        parsed = parse_article(r.text, url)
-        articles.append(parsed)
-        time.sleep(0.8 + random.random()*1.2)
-
-    return articles
+            days_pbar.update(1)
+            # mundur 1 hari
+            cur_date = cur_date - datetime.timedelta(days=1)
+            cursor.update(date=cur_date.isoformat(), page=1, days=cursor["days"] + 1)
+            state.set_meta("cursor", cursor)
+
+        days_pbar.close()
+        links_pbar.close()
+        tqdm.write(f"Total links collected: {cursor['found']}")
+
+        yield from drain(block=True)
+        articles_pbar.close()
+        cursor["complete"] = True
+        state.set_meta("cursor", cursor)
+    finally:
+        # Ctrl-C / generator ditutup: artikel yang belum mulai dibatalkan, sisanya tetap di frontier
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def write_csv(path, articles, append=False):
+    """Ekspor CSV (tags digabung dengan ';'); header hanya ditulis untuk file baru."""
+    new_file = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a" if append else "w", encoding="utf-8", newline='') as f_csv:
+        writer = csv.DictWriter(f_csv, fieldnames=CSV_FIELDS)
+        if new_file:
+            writer.writeheader()
+        for a in articles:
+            row = {k: a.get(k, "") for k in CSV_FIELDS}
+            row["tags"] = ";".join(row.get("tags",[]))
+            writer.writerow(row)
+            f_csv.flush()
+            yield a
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraper artikel Kompas (fetch paralel dengan rate limit per host)")
+    parser.add_argument("--base-url", default=BASE, help=f"URL indeks (default: {BASE}; env KOMPAS_BASE_URL)")
+    parser.add_argument("--max-articles", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Jumlah artikel yang diambil bersamaan (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Maks request bersamaan per host (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"Maks request per detik per host (default: {DEFAULT_RATE})")
+    parser.add_argument("--state", default=CRAWL_STATE_FILE, help=f"File state crawl (default: {CRAWL_STATE_FILE})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ambil ulang artikel lama dengan conditional request; hanya yang berubah ditulis ulang")
+    parser.add_argument("--reset", action="store_true", help="Hapus state crawl & hasil scraping, mulai dari nol")
+    parser.add_argument("--parser", choices=sorted(PARSERS), default=DEFAULT_PARSER,
+                        help=f"Backend parser HTML (default: {DEFAULT_PARSER}; env SCRAPER_PARSER)")
+    parser.add_argument("--save-html", metavar="DIR",
+                        help="Simpan HTML halaman indeks & artikel ke DIR (fixture untuk python -m benchmarks.parsers)")
+    args = parser.parse_args()
+
     print("Starting scraping process...")
     
     # Buat folder data jika belum ada
     os.makedirs("data", exist_ok=True)
     
-    out_json = "data/kompas_nasional_articles.json"  # ✅ Pindah ke folder data
+    out_jsonl = ARTICLES_FILE  # ✅ JSON Lines, artikel ditambahkan begitu selesai di-parse
     out_csv = "data/kompas_nasional_articles.csv"
-    
-    # CEK APAKAH FILE SUDAH ADA
-    if os.path.exists(out_json) and os.path.exists(out_csv):
-        print(f"\n✅ File hasil scraping sudah ada:")
-        print(f"   - {out_json}")
-        print(f"   - {out_csv}")
-        
-        choice = input("\nScraping ulang? (y/n): ").strip().lower()
-        if choice != 'y':
-            print("Menggunakan data yang sudah ada.")
-            exit(0)
-        else:
-            # Hapus folder data jika user memilih scraping ulang
-            if os.path.exists("data"):
-                print("Menghapus folder 'data' untuk memulai ulang...")
-                shutil.rmtree("data")
-                os.makedirs("data", exist_ok=True) # Buat ulang folder data yang kosong
-    
-    # BARU SCRAPING JIKA DIPERLUKAN
-    articles_data = scrape_articles(BASE, CATEGORY, max_articles=400)
-
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump(articles_data, f, ensure_ascii=False, indent=2)
-
-    keys = ["url","title","date","author","content","tags"]
-    with open(out_csv, "w", encoding="utf-8", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        for a in articles_data:
-            row = {k: a.get(k, "") for k in keys}
-            row["tags"] = ";".join(row.get("tags",[]))
-            writer.writerow(row)
 
-    print(f"Done. saved: {out_json}, {out_csv}")
+    if args.reset:
+        for path in (args.state, f"{args.state}-wal", f"{args.state}-shm", out_jsonl, out_csv):
+            if os.path.exists(path):
+                os.remove(path)
+        print("State crawl & hasil scraping dihapus.")
+
+    state = CrawlState(args.state)
+    cursor = state.get_meta("cursor")
+    resuming = cursor is not None and not cursor["complete"]
+
+    # CEK APAKAH FILE SUDAH ADA (JSONL baru atau JSON lama)
+    existing = resolve_input(out_jsonl, LEGACY_ARTICLES_FILE)
+    if os.path.exists(existing):
+        if existing != out_jsonl:
+            write_records(out_jsonl, iter_records(existing))  # format lama -> JSONL agar bisa ditambah
+        if not state.counts():
+            # Hasil scraping lama tanpa state: URL-nya dianggap sudah diambil
+            state.mark_fetched(rec["url"] for rec in iter_records(out_jsonl))
+
+        if resuming:
+            print(f"\n⏯️  Crawl sebelumnya belum selesai, melanjutkan ({state.counts()})")
+        elif not args.refresh:
+            print(f"\n✅ File hasil scraping sudah ada:")
+            print(f"   - {out_jsonl}")
+            print(f"   - {out_csv}")
+            choice = input("\nScraping lagi? Artikel yang sudah diambil akan dilewati (y/n): ").strip().lower()
+            if choice != 'y':
+                print("Menggunakan data yang sudah ada.")
+                exit(0)
+
+    # Artikel ditambahkan ke JSONL & CSV begitu selesai di-parse; state dicatat setelah artikel tertulis
+    t0 = perf_counter()
+    n_before = count_records(out_jsonl) if os.path.exists(out_jsonl) else 0
+    with Fetcher(headers=HEADERS, workers=args.workers, per_host=args.per_host, rate=args.rate) as fetcher:
+        articles = iter_scrape_articles(args.base_url, CATEGORY, max_articles=args.max_articles,
+                                        fetcher=fetcher, workers=args.workers, state=state, refresh=args.refresh,
+                                        parser=args.parser, html_dir=args.save_html)
+        try:
+            write_records(out_jsonl, write_csv(out_csv, articles, append=True), append=True)
+        except KeyboardInterrupt:
+            print("\n⏸️  Dihentikan. Jalankan lagi untuk melanjutkan dari posisi terakhir.")
+    n_articles = count_records(out_jsonl) - n_before
+    elapsed = perf_counter() - t0
+
+    # Artikel yang diambil ulang (refresh / crash sebelum state tercatat) menggantikan versi lamanya
+    if compact_records(out_jsonl):
+        for _ in write_csv(out_csv, iter_records(out_jsonl)):
+            pass
+
+    print(f"Done. saved {n_articles} new/changed articles: {out_jsonl}, {out_csv}")
+    print(f"⏱️  {elapsed:.1f}s ({n_articles / elapsed if elapsed > 0 else 0:.2f} artikel/detik), "
+          f"request={fetcher.stats['requests']} retry={fetcher.stats['retries']} gagal={fetcher.stats['failed']} "
+          f"304={fetcher.stats['not_modified']}")
+    print(f"State crawl: {state.counts()}")
+    state.close()
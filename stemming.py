@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Kamus stem persisten (kata → stem), dipakai bersama preprocessor.py dan retriever.py
+STEM_DICT_FILE = "data/stem_dict.json"
+DEFAULT_CACHE_SIZE = 100_000
+
+class SharedStemmer:
+    """
+    Stemmer Sastrawi dengan dua lapis memo:
+    1. kamus persisten (kata → stem) yang dimuat dari disk saat startup,
+    2. cache LRU terbatas untuk kata yang belum ada di kamus.
+    Setiap bentuk kata hanya di-stem sekali oleh Sastrawi selama masih ada di salah satu lapis.
+    entries = kamus kata → stem yang sudah dimuat (mis. dari artefak lexicon), dipakai
+    menggantikan pembacaan dict_path. Stemmer Sastrawi baru dibangun saat kata pertama
+    yang tidak ada di kamus.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, dict_path=None, record_learned=False, entries=None):
+        self._stemmer = None
+        self.max_size = max_size
+        self.dict_path = dict_path
+        self._persistent = {}
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Stem baru sejak pop_learned() terakhir (dipakai worker proses untuk dikirim ke induk)
+        self._learned = {} if record_learned else None
+        if entries is not None:
+            self._persistent = entries
+        elif dict_path and Path(dict_path).exists():
+            self.load(dict_path)
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            self._persistent.update(json.load(f))
+
+    def stem(self, word):
+        stem = self._persistent.get(word)
+        if stem is not None:
+            self.hits += 1
+            return stem
+        return self._stem_uncached(word)
+
+    def stem_words(self, words):
+        """
+        stem() untuk list kata sekaligus: satu lookup kamus persisten per kata (tanpa panggilan
+        method), kata yang tidak ada lewat LRU/Sastrawi seperti stem(). Hitungan hits/misses sama.
+        """
+        stems = list(map(self._persistent.get, words))
+        missing = 0
+        if None in stems:
+            for i, stem in enumerate(stems):
+                if stem is None:
+                    missing += 1
+                    stems[i] = self._stem_uncached(words[i])
+        self.hits += len(stems) - missing
+        return stems
+
+    def _stem_uncached(self, word):
+        with self._lock:
+            stem = self._lru.get(word)
+            if stem is not None:
+                self._lru.move_to_end(word)
+                self.hits += 1
+                return stem
+        stem = self._sastrawi().stem(word)
+        with self._lock:
+            self.misses += 1
+            self._lru[word] = stem
+            if self._learned is not None:
+                self._learned[word] = stem
+            if len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+        return stem
+
+    def _sastrawi(self):
+        # Pakai Stemmer inti (tanpa CachedStemmer bawaan yang tidak terbatas); kamus Sastrawi
+        # dimuat sekali, saat pertama dibutuhkan
+        if self._stemmer is None:
+            with self._lock:
+                if self._stemmer is None:
+                    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+                    self._stemmer = StemmerFactory().create_stemmer().delegatedStemmer
+        return self._stemmer
+
+    def pop_learned(self):
+        """Ambil lalu kosongkan stem yang baru dipelajari (butuh record_learned=True)."""
+        with self._lock:
+            if self._learned is None:
+                return {}
+            learned, self._learned = self._learned, {}
+        return learned
+
+    def merge(self, entries):
+        """Tambahkan pasangan kata → stem dari luar (mis. dari worker) ke kamus persisten."""
+        if entries:
+            self._persistent.update(entries)
+
+    def save(self, path=None):
+        """Gabungkan isi LRU ke kamus persisten lalu tulis ke disk (atomik)."""
+        path = Path(path or self.dict_path or STEM_DICT_FILE)
+        with self._lock:
+            self._persistent.update(self._lru)
+            snapshot = dict(self._persistent)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, path)
+        return len(snapshot)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "lru_size": len(self._lru),
+            "lru_max_size": self.max_size,
+            "dict_size": len(self._persistent),
+        }
+
+def get_stemmer():
+    """Stemmer bersama satu-per-proses (milik tokenizer.get_tokenizer(), kamus dari artefak lexicon bila ada)."""
+    from tokenizer import get_tokenizer
+    return get_tokenizer().stemmer
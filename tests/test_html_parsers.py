@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from html_parsers import get_parser
+
+PAGE = ('<html><head><title>T</title></head><body><div class="read__content">{}</div>'
+        '<div class="paging__wrap"><a href="/p2">2</a></div><div class="tags">{}</div></body></html>')
+
+def assert_same(html):
+    bs4, stream = get_parser("bs4"), get_parser("stream")
+    assert stream.article(html) == bs4.article(html)
+    assert stream.paragraphs(html) == bs4.paragraphs(html)
+    assert stream.listpage_hrefs(html) == bs4.listpage_hrefs(html)
+
+def test_redundant_void_end_tag_keeps_text_node():
+    html = '<div class="read__content"><p>a<br>\n b</br> c</p></div>'
+    assert get_parser("bs4").article(html)["paragraphs"] == ["ab c"]
+    assert get_parser("stream").article(html)["paragraphs"] == ["ab c"]
+
+def test_stray_void_end_tag_still_splits_text():
+    # </wbr> tanpa <wbr> sebelumnya adalah end tag biasa di bs4: node teks dipotong (lalu di-strip)
+    assert_same('<div class="read__content"><p>A&nbsp;</wbr>B</p></div>')
+    assert_same('<div class="read__content"><p>a<br/>b</br> c<img src=x></img>d</img>e</p></div>')
+
+@pytest.mark.parametrize("html", [
+    "<p>&#65;&#x41;&#X41;&#150;&#0;&#x110000;&#xD800;&#12ab;&#xzz;</p>",
+    "<p>&amp;&nbsp;&foo;&notin;&copy</p>",
+])
+def test_character_references(html):
+    assert_same(PAGE.format(html, ""))
+
+def test_fuzzed_malformed_pages():
+    atoms = ["<p>", "</p>", "<br>", "</br>", "<br/>", "<img src=x>", "</img>", "<hr>", "</hr>", "<b>", "</b>",
+             "<div>", "</div>", "<span>", "</span>", " ", "\n", "a", "teks", "&amp;", "&nbsp;", "&#65;", "&#150;",
+             "&foo", "&#12ab", "<script>x</script>", "<!-- c -->", "<a href='/tag/x'>", "</a>", "<title>",
+             "</title>", "<wbr>", "</wbr>", "<![CDATA[z]]>", "<meta name='author' content='X'>", "</meta>"]
+    rnd = random.Random(0)
+    for _ in range(500):
+        body = "".join(rnd.choice(atoms) for _ in range(rnd.randint(0, 40)))
+        tags = "".join(rnd.choice(atoms) for _ in range(rnd.randint(0, 10)))
+        assert_same(PAGE.format(body, tags))
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("Sastrawi")
+
+from stemming import SharedStemmer
+from tokenizer import Tokenizer
+
+STEMS = {"menteri": "menteri", "membaca": "baca", "berita": "berita", "politik": "politik"}
+
+def make_tokenizer():
+    return Tokenizer({"yang", "dan", "baca", "juga"}, SharedStemmer(entries=dict(STEMS)))
+
+def test_tokens_match_pipeline_order():
+    tok = make_tokenizer()
+    text = "Menteri <b>membaca</b> berita, yang politik.com 2024!\nBaca juga: berita lain\nDan politik"
+    assert tok.tokens(text) == ["menteri", "baca", "berita", "politik", "politik"]
+    assert list(tok.iter_tokens(text)) == tok.tokens(text)
+    assert tok.batch([text, ""]) == [tok.tokens(text), []]
+    assert tok.query("Membaca BERITA yang politik-2024") == "baca berita politik"
+
+def test_stemmer_stats_count_every_word():
+    # Satu lapis cache: setiap kata non-stopword tercatat di statistik SharedStemmer
+    tok = make_tokenizer()
+    tok.tokens("berita politik berita yang berita")
+    stats = tok.stemmer.stats()
+    assert (stats["hits"], stats["misses"], stats["lru_size"]) == (4, 0, 0)
@@ -0,0 +1,175 @@
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+
+# Tokenizer bersama untuk dokumen (preprocessor.py) dan query (retriever.py).
+# Sama persis dengan urutan lama: lowercase → hapus tag HTML → hapus "baca juga ..." sampai akhir baris
+# → hapus ".com" → hapus angka & simbol → split → stopword removal → stemming, tetapi:
+#   - teks diproses sebagai bytes ASCII (karakter non-ASCII → "?", toh nanti jadi spasi juga)
+#   - tag, "baca juga", dan ".com" dihapus dalam SATU pass regex (pola digabung, dikompilasi sekali);
+#     "baca<tag>juga" ikut dicocokkan karena dulu tag diganti spasi sebelum "baca juga" dicari
+#   - angka/simbol diganti spasi lewat bytes.translate (tabel 256 byte), bukan regex
+#   - stopword dibuang dengan satu comprehension, lalu semua kata di-stem sekaligus lewat
+#     SharedStemmer.stem_words (kamus stem/LRU yang sama, tanpa cache tambahan di tokenizer)
+# Mode query (preprocess_query) melewati pass penghapusan, seperti versi lamanya.
+CUSTOM_STOPWORDS = {"baca", "juga", "halaman", "kompas"}
+
+# Tag = dari "<" sampai ">" pertama di baris yang sama (sama dengan <.*?> lama)
+_NOISE = re.compile(rb"<[^>\n]*>|baca(?: |<[^>\n]*>)juga.*|\.com")
+# a-z tetap, byte lain → spasi
+_LETTERS = bytes(c if 97 <= c <= 122 else 32 for c in range(256))
+_WORD = re.compile(rb"[a-z]+")
+
+# Artefak siap pakai: stopword + kamus stem (kata → stem) dalam satu pickle, dimuat dalam milidetik.
+# Dibuat dengan `python tokenizer.py` dan diperbarui otomatis setiap kali preprocessor.py selesai.
+# Dengan artefak ini startup tidak mengimpor NLTK, tidak membangun StemmerFactory Sastrawi
+# (baru dibuat saat ada kata yang belum dikenal), dan tidak pernah mengunduh apa pun.
+LEXICON_FILE = "data/lexicon.pickle"
+LEXICON_VERSION = 1
+
+def default_stopwords(download=False):
+    """Stopword NLTK bahasa Indonesia + stopword khusus Kompas (corpus diunduh hanya jika download=True)."""
+    import nltk
+    from nltk.corpus import stopwords
+    try:
+        words = stopwords.words("indonesian")
+    except LookupError:
+        if not download:
+            raise LookupError(f"Stopword NLTK belum terpasang. Jalankan `python tokenizer.py` untuk membuat {LEXICON_FILE}.")
+        nltk.download("stopwords")
+        words = stopwords.words("indonesian")
+    return set(words) | CUSTOM_STOPWORDS
+
+class Tokenizer:
+    """
+    tokens(text) → list token; iter_tokens(text) → generator; batch(texts) → list token per teks;
+    query(text) → string token query. stemmer = stemming.SharedStemmer (atau objek lain dengan
+    .stem(kata) → stem dan .stem_words(list kata) → list stem).
+    """
+
+    def __init__(self, stop_words, stemmer):
+        self.stop_words = frozenset(stop_words)
+        self.stemmer = stemmer
+
+    @staticmethod
+    def _letters(text, query=False):
+        """text sebagai bytes ASCII a-z dan spasi (setelah pass penghapusan bila bukan query)."""
+        data = text.lower().encode("ascii", "replace")
+        if not query:
+            data = _NOISE.sub(b" ", data)
+        return data.translate(_LETTERS)
+
+    def words(self, text, query=False):
+        """Kata (sebelum stopword & stemming) dari text."""
+        if not text:
+            return []
+        return self._letters(text, query).decode("ascii").split()
+
+    def tokens(self, text, query=False):
+        stop_words = self.stop_words
+        return self.stemmer.stem_words([word for word in self.words(text, query) if word not in stop_words])
+
+    def iter_tokens(self, text, query=False):
+        """Generator token: setiap kata di-stem saat ditemukan (tanpa membangun list kata/token)."""
+        if not text:
+            return
+        stop_words, stem = self.stop_words, self.stemmer.stem
+        for match in _WORD.finditer(self._letters(text, query)):
+            word = match.group().decode("ascii")
+            if word not in stop_words:
+                yield stem(word)
+
+    def batch(self, texts, query=False):
+        """List token untuk setiap teks (kamus stem yang sama dipakai di seluruh batch)."""
+        return [self.tokens(text, query) for text in texts]
+
+    def query(self, text):
+        """Token query digabung spasi (format yang dipakai searcher & cache query)."""
+        return " ".join(self.tokens(text, query=True))
+
+# ====== Artefak lexicon & tokenizer bersama ======
+def build_lexicon(path=LEXICON_FILE, stop_words=None, stem_dict=None, download=False):
+    """
+    Tulis artefak lexicon (atomik). stop_words default: default_stopwords(download);
+    kamus stem diambil dari stem_dict (default: stemming.STEM_DICT_FILE, kosong bila belum ada).
+    Return (jumlah stopword, jumlah stem).
+    """
+    import json
+    from stemming import STEM_DICT_FILE
+    if stop_words is None:
+        stop_words = default_stopwords(download=download)
+    stem_dict = Path(stem_dict or STEM_DICT_FILE)
+    stems = {}
+    if stem_dict.exists():
+        with open(stem_dict, "r", encoding="utf-8") as f:
+            stems = json.load(f)
+    lexicon = {"version": LEXICON_VERSION, "stop_words": sorted(stop_words), "stems": stems}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return len(lexicon["stop_words"]), len(stems)
+
+def load_lexicon(path=LEXICON_FILE):
+    """Isi artefak lexicon, atau None bila belum dibuat / dari versi lain."""
+    try:
+        with open(path, "rb") as f:
+            lexicon = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if not isinstance(lexicon, dict) or lexicon.get("version") != LEXICON_VERSION:
+        return None
+    return lexicon
+
+def load_tokenizer(lexicon_path=LEXICON_FILE, **stemmer_options):
+    """
+    Tokenizer baru dari artefak lexicon; tanpa artefak: stopword NLTK + kamus stem JSON.
+    Kamus stem yang lebih baru dari artefak tetap dibaca dari JSON-nya.
+    stemmer_options diteruskan ke stemming.SharedStemmer (mis. record_learned=True).
+    """
+    from stemming import STEM_DICT_FILE, SharedStemmer
+    lexicon = load_lexicon(lexicon_path)
+    if lexicon is None:
+        return Tokenizer(default_stopwords(), SharedStemmer(dict_path=STEM_DICT_FILE, **stemmer_options))
+    stems = lexicon["stems"]
+    if os.path.exists(STEM_DICT_FILE) and os.path.getmtime(STEM_DICT_FILE) > os.path.getmtime(lexicon_path):
+        stems = None
+    return Tokenizer(lexicon["stop_words"], SharedStemmer(dict_path=STEM_DICT_FILE, entries=stems, **stemmer_options))
+
+_shared_tokenizer = None
+_shared_lock = threading.Lock()
+
+def get_tokenizer():
+    """Tokenizer bersama satu-per-proses, baru dimuat saat pertama dipakai."""
+    global _shared_tokenizer
+    with _shared_lock:
+        if _shared_tokenizer is None:
+            _shared_tokenizer = load_tokenizer()
+        return _shared_tokenizer
+
+def reset_tokenizer(**stemmer_options):
+    """Muat ulang tokenizer bersama proses ini (mis. di worker preprocessing dengan record_learned=True)."""
+    global _shared_tokenizer
+    with _shared_lock:
+        _shared_tokenizer = load_tokenizer(**stemmer_options)
+        return _shared_tokenizer
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Bangun artefak lexicon (stopword + kamus stem) untuk startup cepat")
+    parser.add_argument("--output", default=LEXICON_FILE, help=f"File artefak (default: {LEXICON_FILE})")
+    parser.add_argument("--stem-dict", default=None, help="Kamus stem JSON (default: stemming.STEM_DICT_FILE)")
+    args = parser.parse_args()
+
+    n_stop, n_stems = build_lexicon(args.output, stem_dict=args.stem_dict, download=True)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"✅ Lexicon ditulis ke {args.output}: {n_stop} stopword, {n_stems} stem ({size_kb:.0f} KB)")
+    t0 = perf_counter()
+    load_lexicon(args.output)
+    print(f"⏱️  Dimuat dalam {(perf_counter() - t0) * 1000:.1f} ms")
@@ -0,0 +1,136 @@
+# Tuning parameter BM25: sweep grid k1 × b (± RM3) atas satu set query.
+# Index + metadata dibuka sekali (satu IndexGeneration), query di-preprocess sekali,
+# lalu untuk setiap konfigurasi parameter searcher diganti di tempat dan semua query
+# dijalankan sebagai satu batch paralel. Qrels & metrik sama dengan evaluator.py.
+import argparse
+import itertools
+import os
+from time import perf_counter
+
+import pandas as pd
+
+from evaluator import as_query_dict, evaluate_run, load_qrels, load_queries, queries as default_queries, summarize, QRELS_FILE
+from records import iter_records
+
+TUNE_FILE = "data/tune_bm25.csv"
+
+# Grid bawaan (default Pyserini k1=0.9, b=0.4 ikut di dalamnya)
+DEFAULT_K1 = (0.6, 0.9, 1.2, 1.5, 2.0)
+DEFAULT_B = (0.2, 0.4, 0.6, 0.75, 0.9)
+
+def grid(k1s=DEFAULT_K1, bs=DEFAULT_B, rm3=(False,)):
+    """Semua konfigurasi (k1, b, rm3) sebagai list dict."""
+    return [{"k1": k1, "b": b, "rm3": r} for r, k1, b in itertools.product(rm3, k1s, bs)]
+
+def open_generation(backend=None):
+    """Generasi index aktif (searcher + docstore), dibuka sekali untuk seluruh sweep."""
+    from generations import current_index_dir
+    from retriever import DEFAULT_BACKEND, INDEX_DIR, IndexGeneration, index_generation
+    return IndexGeneration(index_generation(), current_index_dir(INDEX_DIR), backend or DEFAULT_BACKEND).open()
+
+def sweep(searcher, qs, qrels, configs, k=20, threads=None, rm3_params=None, per_query=None):
+    """
+    Jalankan semua konfigurasi atas query qs ({qid: teks mentah}).
+    Return DataFrame satu baris per konfigurasi (rata-rata metrik + waktu batch);
+    bila per_query berupa list, DataFrame per query tiap konfigurasi ditambahkan ke sana.
+    """
+    from retriever import BM25_B, BM25_K1, preprocess_query
+    threads = threads or os.cpu_count() or 1
+    t0 = perf_counter()
+    texts = {qid: preprocess_query(q) for qid, q in qs.items()}
+    print(f"🔤 {len(texts)} query di-preprocess sekali ({perf_counter() - t0:.2f}s)")
+    qids = [qid for qid, text in texts.items() if text.strip()]
+    if len(qids) < len(texts):
+        print(f"⚠️  {len(texts) - len(qids)} query kosong setelah preprocessing!")
+
+    rows = []
+    try:
+        for config in configs:
+            if config["rm3"] and not searcher.supports_rm3:
+                print(f"⏭️  Lewati {config}: backend {searcher.name} tidak mendukung RM3")
+                continue
+            searcher.set_bm25(config["k1"], config["b"])
+            searcher.set_rm3(config["rm3"], **(rm3_params or {}))
+
+            t0 = perf_counter()
+            rankings = searcher.batch_search([texts[qid] for qid in qids], qids, k=k, threads=threads)
+            seconds = perf_counter() - t0
+
+            run = {qid: [docid for docid, _ in rankings.get(qid, [])] for qid in qs}
+            df_eval = evaluate_run(run, qrels, k=k)
+            if per_query is not None:
+                per_query.append(df_eval.assign(**config))
+            row = dict(config, **summarize(df_eval).to_dict(), seconds=seconds)
+            rows.append(row)
+            print(f"   k1={config['k1']:<4} b={config['b']:<4} rm3={'on' if config['rm3'] else 'off':<3} "
+                  f"MAP={row['MAP']:.4f} nDCG@{k}={row[f'nDCG@{k}']:.4f} ({seconds:.2f}s)")
+    finally:
+        # Kembalikan searcher ke parameter bawaan
+        searcher.set_bm25(BM25_K1, BM25_B)
+        searcher.set_rm3(False)
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    from retriever import BACKENDS, clean_records_file
+
+    parser = argparse.ArgumentParser(description="Sweep parameter BM25 (k1, b, RM3) dengan satu index & satu batch query")
+    parser.add_argument("--k1", type=float, nargs="+", default=list(DEFAULT_K1))
+    parser.add_argument("--b", type=float, nargs="+", default=list(DEFAULT_B))
+    parser.add_argument("--rm3", choices=["off", "on", "both"], default="both",
+                        help="RM3 pseudo-relevance feedback (default: both, hanya backend lucene)")
+    parser.add_argument("--fb-terms", type=int, default=10)
+    parser.add_argument("--fb-docs", type=int, default=10)
+    parser.add_argument("--rm3-weight", type=float, default=0.5, help="Bobot query asli pada RM3 (default: 0.5)")
+    parser.add_argument("--queries", help="File query (satu per baris, atau qid<TAB>query); default: query bawaan evaluator")
+    parser.add_argument("--titles", type=int, default=0, help="Tambahkan judul N artikel pertama sebagai query")
+    parser.add_argument("-k", "--top-k", type=int, default=20)
+    parser.add_argument("--metric", default="MAP", help="Metrik untuk mengurutkan hasil (default: MAP)")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=None, help="Default: IR_BACKEND")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--qrels", default=QRELS_FILE, help=f"File qrels TREC (default: {QRELS_FILE})")
+    parser.add_argument("--output", default=TUNE_FILE, help=f"CSV ringkasan per konfigurasi (default: {TUNE_FILE})")
+    parser.add_argument("--per-query", metavar="CSV", help="Simpan juga metrik per query untuk setiap konfigurasi")
+    args = parser.parse_args()
+
+    qs = load_queries(args.queries) if args.queries else as_query_dict(default_queries)
+    if args.titles:
+        for i, art in zip(range(args.titles), iter_records(clean_records_file())):
+            if art.get("title"):
+                qs[f"title-{i}"] = art["title"]
+
+    t0 = perf_counter()
+    gen = open_generation(args.backend)
+    if gen.searcher is None:
+        raise SystemExit("Retriever tidak siap. Pastikan index sudah dibuat.")
+    qrels = load_qrels(qs, clean_records_file(), args.qrels)
+    print(f"📂 Index & qrels dimuat sekali ({perf_counter() - t0:.2f}s), {len(qs)} query")
+
+    rm3 = {"off": (False,), "on": (True,), "both": (False, True)}[args.rm3]
+    configs = grid(args.k1, args.b, rm3)
+    per_query = [] if args.per_query else None
+    t0 = perf_counter()
+    try:
+        results = sweep(gen.searcher, qs, qrels, configs, k=args.top_k, threads=args.threads,
+                        rm3_params={"fb_terms": args.fb_terms, "fb_docs": args.fb_docs,
+                                    "original_query_weight": args.rm3_weight},
+                        per_query=per_query)
+    finally:
+        gen.close()
+    elapsed = perf_counter() - t0
+
+    if results.empty:
+        raise SystemExit("Tidak ada konfigurasi yang dijalankan.")
+    metric = args.metric if args.metric in results.columns else "MAP"
+    results = results.sort_values(metric, ascending=False, kind="stable")
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    results.to_csv(args.output, index=False)
+    if per_query:
+        pd.concat(per_query, ignore_index=True).to_csv(args.per_query, index=False)
+
+    pd.set_option("display.width", 160)
+    print(f"\n=== {len(results)} konfigurasi dalam {elapsed:.2f}s (urut {metric}) ===")
+    print(results.to_string(index=False, float_format="%.4f", max_rows=20))
+    best = results.iloc[0]
+    print(f"\n🏆 Terbaik: k1={best['k1']}, b={best['b']}, rm3={'on' if best['rm3'] else 'off'} "
+          f"→ {metric}={best[metric]:.4f}")
+    print(f"💾 Disimpan ke {args.output}")